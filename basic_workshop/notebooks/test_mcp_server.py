@@ -7,6 +7,9 @@ import asyncio
 import subprocess
 import json
 
+import workshop_paths  # noqa: F401 (puts the repository root on sys.path)
+from mcp_transport import drain_stderr
+
 async def test_mcp_server():
     """Test the MCP server functionality"""
     
@@ -23,6 +26,8 @@ async def test_mcp_server():
             stderr=subprocess.PIPE,
             text=True
         )
+        # Drain server logs in the background so the stderr pipe never fills
+        stderr_drain = drain_stderr(process)
         
         print("✅ MCP server started!")
         
@@ -149,6 +154,8 @@ async def test_mcp_server():
         # Clean up
         process.terminate()
         process.wait()
+        stderr_drain.join(timeout=1)
+        print(f"📜 Server log lines captured: {stderr_drain.stats()['lines_total']}")
         
     except Exception as e:
         print(f"❌ Error testing MCP server: {e}")
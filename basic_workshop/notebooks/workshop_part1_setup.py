@@ -8,10 +8,9 @@ IMPORTANT: Make sure your virtual environment is activated!
 If you haven't set up the environment yet, run: python3 workshop_setup.py
 """
 
-import requests
 import json
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 # ============================================================================
 # 🔧 SECTION 1: SETUP AND CONFIGURATION
@@ -27,11 +26,13 @@ load_dotenv()
 BASE_URL = os.getenv("BASE_URL", "https://yylh5vmmm0.execute-api.eu-central-1.amazonaws.com/prod/v1")
 API_KEY = os.getenv("API_KEY", "ALI-CLASS-2025")
 
-# Headers for authentication
-headers = {
-    "Authorization": f"Bearer {API_KEY}",
-    "Content-Type": "application/json"
-}
+# One shared, connection-pooled client for every call below. It sends the
+# "Authorization: Bearer <API_KEY>" header, reuses connections between calls,
+# raises LLMError for non-200 responses and answers identical payloads from
+# the response cache when LLM_CACHE is enabled
+import workshop_paths  # noqa: F401 (puts the repository root on sys.path)
+from llm_client import ConversationTrimmer, LLMClient, LLMError
+llm_client = LLMClient.from_env(base_url=BASE_URL, api_key=API_KEY)
 
 print("✅ Configuration loaded!")
 print(f"🌐 Base URL: {BASE_URL}")
@@ -45,21 +46,25 @@ print("\n" + "=" * 60)
 print("🧪 TEST 1: Check Available Models")
 print("=" * 60)
 
-def check_models():
-    """Check what models are available on your endpoint"""
+def check_models(probe: bool = False):
+    """Check what models are available on your endpoint (probe=True revalidates it over the network)"""
     try:
-        response = requests.get(f"{BASE_URL}/v1/models", headers=headers)
-        if response.status_code == 200:
-            models = response.json()
-            print("✅ Successfully connected to your endpoint!")
-            print("📋 Available models:")
-            for model in models.get('data', []):
-                print(f"   - {model.get('id', 'Unknown')}")
-            return models
+        # Served from the catalog cache within LLM_MODELS_TTL; a probe revalidates with the endpoint
+        models = llm_client.list_models(refresh=probe)
+        if llm_client.catalog.last_source == "stale":
+            print("⚠️ Endpoint unreachable: showing the cached model list from an earlier run")
+        elif llm_client.catalog.last_source in ("memory", "disk"):
+            print("✅ Model list loaded from the cache (call check_models(probe=True) to test the connection)")
         else:
-            print(f"❌ Error: {response.status_code}")
-            print(f"Response: {response.text}")
-            return None
+            print("✅ Successfully connected to your endpoint!")
+        print("📋 Available models:")
+        for model in models.get('data', []):
+            print(f"   - {model.get('id', 'Unknown')}")
+        return models
+    except LLMError as e:
+        print(f"❌ Error: {e.status_code}")
+        print(f"Response: {e.body}")
+        return None
     except Exception as e:
         print(f"❌ Connection error: {e}")
         return None
@@ -75,8 +80,8 @@ print("\n" + "=" * 60)
 print("🌟 LLM HELLO WORLD: Basic Text Generation")
 print("=" * 60)
 
-def generate_text(prompt: str, model: str = "gpt-3.5-turbo") -> str:
-    """Generate text using your LLM endpoint"""
+def generate_text(prompt: str, model: Optional[str] = None) -> str:
+    """Generate text using your LLM endpoint (without a model, llm_client.router picks one)"""
     payload = {
         "model": model,
         "messages": [
@@ -87,15 +92,11 @@ def generate_text(prompt: str, model: str = "gpt-3.5-turbo") -> str:
     }
     
     try:
-        response = requests.post(f"{BASE_URL}/v1/chat/completions", 
-                               headers=headers, 
-                               json=payload)
-        
-        if response.status_code == 200:
-            result = response.json()
-            return result['choices'][0]['message']['content']
-        else:
-            return f"Error: {response.status_code} - {response.text}"
+        result = llm_client.complete(payload)
+        print(f"🧭 Answered by {result.get('model')}")
+        return result['choices'][0]['message']['content']
+    except LLMError as e:
+        return str(e)
     except Exception as e:
         return f"Exception: {e}"
 
@@ -128,25 +129,28 @@ print("\n" + "=" * 60)
 print("🔄 LLM HELLO WORLD: Chat Completion")
 print("=" * 60)
 
-def chat_completion(messages: list, model: str = "gpt-3.5-turbo") -> str:
-    """Have a conversation with your LLM"""
+# Long conversations are trimmed to a prompt token budget before sending:
+# system prompts and the latest turns are kept, the oldest turns go first
+conversation_trimmer = ConversationTrimmer(
+    max_tokens=int(os.getenv("LLM_CONTEXT_BUDGET", "3000")),
+    policy=os.getenv("LLM_TRIM_POLICY", "drop_oldest")
+)
+
+def chat_completion(messages: list, model: Optional[str] = None) -> str:
+    """Have a conversation with your LLM (without a model, llm_client.router picks one)"""
     payload = {
         "model": model,
-        "messages": messages,
+        "messages": conversation_trimmer.trim(messages),
         "max_tokens": 100,
         "temperature": 0.7
     }
     
     try:
-        response = requests.post(f"{BASE_URL}/v1/chat/completions", 
-                               headers=headers, 
-                               json=payload)
-        
-        if response.status_code == 200:
-            result = response.json()
-            return result['choices'][0]['message']['content']
-        else:
-            return f"Error: {response.status_code} - {response.text}"
+        result = llm_client.complete(payload)
+        print(f"🧭 Answered by {result.get('model')}")
+        return result['choices'][0]['message']['content']
+    except LLMError as e:
+        return str(e)
     except Exception as e:
         return f"Exception: {e}"
 
@@ -168,6 +172,47 @@ conversation.append({"role": "user", "content": "What's the most exciting thing
 response2 = chat_completion(conversation)
 print(f"🤖 Assistant: {response2}")
 
+# The full history stays in `conversation`; only the trimmed view is sent
+print(f"✂️ Trimming: {conversation_trimmer.stats()}")
+
+# ============================================================================
+# 🌊 LLM HELLO WORLD: Streaming Responses
+# ============================================================================
+
+print("\n" + "=" * 60)
+print("🌊 LLM HELLO WORLD: Streaming Responses")
+print("=" * 60)
+
+def stream_text(prompt: str, model: Optional[str] = None) -> str:
+    """Print the reply token by token as it arrives, then report the model and timing"""
+    try:
+        stream = llm_client.stream_generate(prompt, model=model, max_tokens=150, temperature=0.7)
+        print("🤖 ", end="", flush=True)
+        for delta in stream:
+            print(delta, end="", flush=True)
+        print()
+        
+        stats = stream.stats
+        print(f"🧭 Answered by {stats.model}")
+        if stats.time_to_first_token is not None:
+            print(f"⏱️ First token after {stats.time_to_first_token:.2f}s, "
+                  f"total {stats.total_time:.2f}s, "
+                  f"{stats.tokens_per_second or 0:.1f} tokens/s")
+        return stream.text
+    except Exception as e:
+        return f"Exception: {e}"
+
+# The first words show up long before the full answer is ready
+stream_text("In 3 sentences, why do chat apps stream their answers?")
+
+# Every call above was timed (connect, first byte, total) and its token usage
+# recorded, attributed to the function that made it
+print("\n📊 Latency and spend per call site:")
+for site, row in llm_client.metrics.summary(by="call_site").items():
+    print(f"   {site}: {row['calls']} calls, "
+          f"p50 {row['total'].get('p50_ms')} ms (first byte {row['ttfb'].get('p50_ms')} ms), "
+          f"{row['prompt_tokens']}+{row['completion_tokens']} tokens, ${row['cost_usd']:.5f}")
+
 # ============================================================================
 # 🎯 HANDS-ON EXERCISE
 # ============================================================================
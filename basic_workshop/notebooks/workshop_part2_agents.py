@@ -21,6 +21,11 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Model choice per call site comes from the shared router (LLM_ROUTES)
+import workshop_paths  # noqa: F401 (puts the repository root on sys.path)
+from llm_client import CascadeRouter
+model_router = CascadeRouter.from_env()
+
 # ============================================================================
 # 🔧 SECTION 2: LLM AGENTS WITH LANGCHAIN
 # ============================================================================
@@ -103,11 +108,15 @@ print("\n" + "=" * 60)
 print("🤖 AGENT 1: Tool-Calling Agent")
 print("=" * 60)
 
+# The agent runs on the cheapest model routed for "agent" (LLM_ROUTES);
+# set {"agent": ["<model>"]} there to move it to another model
+agent_models = model_router.models_for("agent", default=["anthropic.claude-3-haiku-20240307-v1:0"])
+
 # Configure the LLM (using your endpoint)
 llm = ChatOpenAI(
     base_url=os.getenv("BASE_URL", "https://yylh5vmmm0.execute-api.eu-central-1.amazonaws.com/prod/v1"),
     api_key=os.getenv("API_KEY", "ALI-CLASS-2025"),
-    model="anthropic.claude-3-haiku-20240307-v1:0",
+    model=agent_models[0],
     temperature=0.1
 )
 
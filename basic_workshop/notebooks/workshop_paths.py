@@ -0,0 +1,14 @@
+"""
+📂 Workshop Paths
+Importing this module makes the packages at the repository root
+(``llm_client``, ``mcp_transport``) importable from the workshop scripts
+and notebooks in this folder, which run from here rather than from the root
+"""
+
+import os
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
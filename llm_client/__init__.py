@@ -0,0 +1,73 @@
+"""
+🤖 LLM Client
+Shared client for the workshop's OpenAI-compatible LLM endpoint
+"""
+
+from .async_client import AsyncLLMClient, GenerationResult, generate_many
+from .cache import ResponseCache
+from .catalog import ModelCatalog
+from .client import DEFAULT_BASE_URL, LLMClient, get_default_client
+from .embeddings import EmbeddingClient
+from .endpoints import Endpoint, EndpointPool
+from .errors import (CircuitOpenError, CoalescedWaitTimeout, FixtureMissError, LLMError, RateLimitTimeout,
+                     RequestPreempted, UnknownModelError)
+from .fixtures import HTTPFixtures
+from .metrics import Histogram, MetricsRegistry
+from .rate_limit import AIMDConcurrency, ModelLimits, RateLimiter, TokenBucket
+from .hedging import Hedger
+from .json_stream import StreamingJSONParser, iter_json
+from .resilience import CircuitBreaker, Retrier, RetryPolicy
+from .router import CascadeRouter, ConfidenceCheck, Route
+from .scheduler import PriorityClass, PriorityScheduler
+from .semantic_cache import HashingEmbedder, SemanticCache
+from .singleflight import SingleFlight
+from .streaming import ChatStream, SSEParser, StreamStats
+from .trimming import ConversationTrimmer
+from .warmup import DNSCache
+
+__all__ = [
+    "AIMDConcurrency",
+    "AsyncLLMClient",
+    "CascadeRouter",
+    "ChatStream",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "CoalescedWaitTimeout",
+    "ConfidenceCheck",
+    "ConversationTrimmer",
+    "DEFAULT_BASE_URL",
+    "DNSCache",
+    "EmbeddingClient",
+    "Endpoint",
+    "EndpointPool",
+    "FixtureMissError",
+    "GenerationResult",
+    "HTTPFixtures",
+    "HashingEmbedder",
+    "Hedger",
+    "Histogram",
+    "LLMClient",
+    "LLMError",
+    "MetricsRegistry",
+    "ModelCatalog",
+    "ModelLimits",
+    "PriorityClass",
+    "PriorityScheduler",
+    "RateLimitTimeout",
+    "RateLimiter",
+    "RequestPreempted",
+    "ResponseCache",
+    "Retrier",
+    "RetryPolicy",
+    "Route",
+    "SSEParser",
+    "SemanticCache",
+    "SingleFlight",
+    "StreamStats",
+    "StreamingJSONParser",
+    "TokenBucket",
+    "UnknownModelError",
+    "generate_many",
+    "get_default_client",
+    "iter_json",
+]
@@ -0,0 +1,187 @@
+"""
+💾 Response Cache
+Persistent, content-addressed cache for chat completion responses, keyed by a
+hash of the canonical request payload
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+CACHE_MODES = ("off", "deterministic", "always")
+
+
+def canonical_json(value: Any) -> str:
+    """Stable serialization: sorted keys, no insignificant whitespace"""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def payload_key(payload: Dict[str, Any], namespace: str = "") -> str:
+    """SHA-256 of the endpoint namespace plus the canonical payload"""
+    digest = hashlib.sha256()
+    digest.update(namespace.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(canonical_json(payload).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def is_deterministic(payload: Dict[str, Any]) -> bool:
+    """True when the same payload should produce the same completion
+
+    Greedy decoding (``temperature`` 0) or a fixed ``seed``, and a single
+    non-streamed choice.
+    """
+    if payload.get("stream") or payload.get("n", 1) != 1:
+        return False
+    return payload.get("temperature", 1.0) == 0 or payload.get("seed") is not None
+
+
+class ResponseCache:
+    """SQLite-backed LRU cache with TTLs and hit-rate counters
+
+    Args:
+        directory: Where ``responses.sqlite3`` is kept
+        mode: ``"deterministic"`` caches only deterministic payloads,
+            ``"always"`` caches every payload, ``"off"`` disables lookups;
+            a per-call ``cache=True`` overrides ``"deterministic"``
+        ttl: Seconds an entry stays valid (``None`` keeps entries until evicted)
+        max_bytes: Total stored response size before least-recently-used
+            entries are evicted
+        max_entries: Entry count limit, applied the same way
+    """
+
+    def __init__(self, directory: str = ".llm_cache", mode: str = "deterministic",
+                 ttl: Optional[float] = 24 * 3600, max_bytes: int = 100 * 2 ** 20,
+                 max_entries: int = 100000):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"mode must be one of {CACHE_MODES}")
+        self.directory = directory
+        self.mode = mode
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "responses.sqlite3")
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, response TEXT NOT NULL, size INTEGER NOT NULL,"
+            " created REAL NOT NULL, accessed REAL NOT NULL, expires REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires)")
+        # Running totals, so writes never scan the table
+        self._count, self._bytes = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.expired = 0
+        self.evictions = 0
+        self.bypassed = 0
+
+    def should_cache(self, payload: Dict[str, Any], opt_in: Optional[bool] = None) -> bool:
+        """Apply the mode and the per-call override to one payload"""
+        if opt_in is False or self.mode == "off" or payload.get("stream"):
+            return False
+        if opt_in or self.mode == "always":
+            return True
+        return is_deterministic(payload)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response, size, expires FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            response, size, expires = row
+            if expires is not None and expires < now:
+                self._delete(key, size)
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(response)
+
+    def put(self, key: str, response: Dict[str, Any]):
+        text = canonical_json(response)
+        now = time.time()
+        expires = now + self.ttl if self.ttl else None
+        with self._lock:
+            row = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._count -= 1
+                self._bytes -= row[0]
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, created, accessed, expires)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, text, len(text), now, now, expires))
+            self._count += 1
+            self._bytes += len(text)
+            self.stores += 1
+            self._evict()
+
+    def _delete(self, key: str, size: int):
+        self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+        self._count -= 1
+        self._bytes -= size
+
+    def _evict(self):
+        """Drop expired entries, then least-recently-used ones until within limits"""
+        now = time.time()
+        count, size = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            " WHERE expires IS NOT NULL AND expires < ?", (now,)).fetchone()
+        if count:
+            self._db.execute("DELETE FROM responses WHERE expires IS NOT NULL AND expires < ?", (now,))
+            self._count -= count
+            self._bytes -= size
+            self.expired += count
+        while self._count > self.max_entries or self._bytes > self.max_bytes:
+            row = self._db.execute(
+                "SELECT key, size FROM responses ORDER BY accessed LIMIT 1").fetchone()
+            if row is None:
+                break
+            self._delete(*row)
+            self.evictions += 1
+
+    def record_bypass(self):
+        """Count a lookup skipped because the payload is not cacheable"""
+        with self._lock:
+            self.bypassed += 1
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._count = self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "mode": self.mode,
+            "entries": self._count,
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "stores": self.stores,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "bypassed": self.bypassed
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
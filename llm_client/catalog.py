@@ -0,0 +1,212 @@
+"""
+📚 Model Catalog
+The endpoint's ``/v1/models`` list, cached in memory and on disk with a TTL
+and revalidated with ``ETag``/``If-None-Match``, plus lookups that validate
+model ids without a network call
+"""
+
+import copy
+import difflib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .errors import LLMError, UnknownModelError
+
+
+class ModelCatalog:
+    """Cached ``/v1/models`` for one client
+
+    ``models()`` answers from memory while the entry is younger than
+    ``ttl``, then from the disk file (shared by every process on the
+    machine), and only then asks the endpoint, sending the stored ``ETag``
+    so an unchanged list comes back as a bodyless 304. If the endpoint
+    fails, a stale list is served rather than nothing.
+
+    ``last_source`` tells where the latest list came from: ``"memory"``,
+    ``"disk"``, ``"network"`` (a 200), ``"not_modified"`` (a 304) or
+    ``"stale"`` (the endpoint failed and an old list was served).
+
+    Lookups (``in``, ``get``, ``validate``) use whatever list is cached,
+    however old, and only go to the network when nothing is cached yet or
+    ``validate`` meets an unknown id in a stale list.
+
+    Args:
+        client: ``LLMClient`` used for the request
+        ttl: Seconds a list is used without revalidation
+        directory: Where the catalog file is kept (``None`` = memory only)
+    """
+
+    def __init__(self, client, ttl: float = 3600.0, directory: Optional[str] = ".llm_cache"):
+        self.client = client
+        self.ttl = ttl
+        self.directory = directory
+        key = hashlib.sha256(client.base_url.encode("utf-8")).hexdigest()[:16]
+        self.path = os.path.join(directory, f"models-{key}.json") if directory else None
+        self._entry = None
+        self._index = {}
+        self.last_source = None
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "fetches": 0, "not_modified": 0,
+                       "stale_served": 0, "errors": 0}
+
+    def _fresh(self, entry: Optional[Dict[str, Any]]) -> bool:
+        return entry is not None and time.time() - entry["fetched_at"] < self.ttl
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        if self.path is None:
+            return None
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("base_url") != self.client.base_url or "response" not in entry:
+            return None
+        return entry
+
+    def _save(self, entry: Dict[str, Any]):
+        if self.path is None:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write then rename, so readers in other processes never see half a file
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".models-", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass
+
+    def _count(self, name: str):
+        self._stats[name] += 1
+
+    def _set_entry(self, entry: Optional[Dict[str, Any]]):
+        self._entry = entry
+        data = entry["response"].get("data", []) if entry else []
+        self._index = {model["id"]: model for model in data if model.get("id")}
+
+    def response(self, refresh: bool = False) -> Dict[str, Any]:
+        """The ``/v1/models`` response; ``refresh=True`` revalidates now"""
+        with self._lock:
+            entry = self._entry
+            if not refresh and self._fresh(entry):
+                self._count("memory_hits")
+                self.last_source = "memory"
+                return copy.deepcopy(entry["response"])
+            disk = self._load()
+            if disk is not None and (entry is None or disk["fetched_at"] > entry["fetched_at"]):
+                self._set_entry(disk)
+                entry = disk
+                if not refresh and self._fresh(entry):
+                    self._count("disk_hits")
+                    self.last_source = "disk"
+                    return copy.deepcopy(entry["response"])
+            entry = self._revalidate(entry)
+            return copy.deepcopy(entry["response"])
+
+    def _revalidate(self, entry: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        headers = {}
+        if entry is not None and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        try:
+            response = self.client.get("/v1/models", headers=headers)
+        except Exception:
+            self._count("errors")
+            if entry is None:
+                raise
+            self._count("stale_served")
+            self.last_source = "stale"
+            return entry
+
+        if response.status_code == 304 and entry is not None:
+            self._count("not_modified")
+            self.last_source = "not_modified"
+            entry = dict(entry, fetched_at=time.time())
+        elif response.status_code == 200:
+            self._count("fetches")
+            self.last_source = "network"
+            entry = {
+                "base_url": self.client.base_url,
+                "etag": response.headers.get("ETag"),
+                "fetched_at": time.time(),
+                "response": response.json()
+            }
+        else:
+            self._count("errors")
+            if entry is None:
+                raise LLMError(f"Error: {response.status_code}", response.status_code, response.text)
+            self._count("stale_served")
+            self.last_source = "stale"
+            return entry
+        self._set_entry(entry)
+        self._save(entry)
+        return entry
+
+    def models(self, refresh: bool = False) -> List[Dict[str, Any]]:
+        """The ``data`` list of model objects"""
+        return self.response(refresh).get("data", [])
+
+    def _lookup_index(self) -> Dict[str, Dict[str, Any]]:
+        """Model objects by id from any cached list; fetches only if nothing is cached"""
+        with self._lock:
+            if self._entry is None:
+                self._set_entry(self._load())
+            if self._entry is not None:
+                return self._index
+        self.response()
+        with self._lock:
+            return self._index
+
+    def ids(self) -> List[str]:
+        return list(self._lookup_index())
+
+    def __contains__(self, model_id: str) -> bool:
+        return model_id in self._lookup_index()
+
+    def get(self, model_id: str) -> Optional[Dict[str, Any]]:
+        """The model object for ``model_id``, or None"""
+        model = self._lookup_index().get(model_id)
+        return copy.deepcopy(model) if model is not None else None
+
+    def validate(self, model_id: str) -> str:
+        """Return ``model_id`` if the endpoint serves it, else raise ``UnknownModelError``
+
+        An id missing from a list older than ``ttl`` triggers one
+        revalidation first, in case the model was added since.
+        """
+        index = self._lookup_index()
+        if model_id in index:
+            return model_id
+        with self._lock:
+            stale = not self._fresh(self._entry)
+        if stale:
+            self.response(refresh=True)
+            index = self._lookup_index()
+            if model_id in index:
+                return model_id
+        suggestions = difflib.get_close_matches(model_id, list(index), n=3)
+        hint = f"; did you mean {', '.join(suggestions)}?" if suggestions else ""
+        raise UnknownModelError(f"Unknown model: {model_id}{hint}")
+
+    def invalidate(self):
+        """Forget the cached list, in memory and on disk"""
+        with self._lock:
+            self._set_entry(None)
+            if self.path is not None:
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats, last_source=self.last_source)
+            entry = self._entry
+        stats["age_seconds"] = round(time.time() - entry["fetched_at"], 1) if entry else None
+        stats["models"] = len(entry["response"].get("data", [])) if entry else 0
+        return stats
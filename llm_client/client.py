@@ -0,0 +1,554 @@
+"""
+🔌 Pooled LLM Client
+One keep-alive HTTP session per endpoint instead of a new TCP/TLS connection
+for every request
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import requests
+
+from .cache import ResponseCache, payload_key
+from .catalog import ModelCatalog
+from .endpoints import EndpointPool
+from .errors import CircuitOpenError, LLMError
+from .fixtures import HTTPFixtures
+from .hedging import Hedger
+from .json_stream import Event
+from .metrics import MetricsRegistry, TimingAdapter, caller_site
+from .rate_limit import ModelLimits, RateLimiter
+from .resilience import THROTTLE_STATUSES, CircuitBreaker, Retrier, RetryPolicy, is_endpoint_error
+from .router import CascadeRouter
+from .semantic_cache import SemanticCache
+from .singleflight import SingleFlight
+from .tokens import estimate_messages_tokens, estimate_payload_tokens
+from .warmup import warm_up
+
+DEFAULT_BASE_URL = "https://yylh5vmmm0.execute-api.eu-central-1.amazonaws.com/prod/v1"
+
+
+def response_text(result: Dict[str, Any]) -> str:
+    """The assistant's reply in a chat completion response"""
+    return result["choices"][0]["message"]["content"]
+
+
+class LLMClient:
+    """Connection-pooled client for an OpenAI-compatible endpoint
+
+    All requests share one ``requests.Session``, so connections to
+    ``base_url`` are reused across calls instead of paying the TCP and TLS
+    handshake every time. Every completion's connect time, time to first
+    byte, total latency and token usage go to ``metrics``.
+
+    Args:
+        base_url: Endpoint root; paths such as ``/v1/models`` are appended as-is
+        api_key: Sent as a bearer token
+        pool_maxsize: Connections kept open per host (size it to your concurrency)
+        pool_connections: Number of distinct hosts to keep pools for
+        pool_block: Wait for a free connection instead of opening extra ones
+        keep_alive: Set to False to close the connection after every request
+        connect_timeout: Seconds to establish a connection
+        read_timeout: Seconds to wait for the server between bytes
+        cache: Optional ``ResponseCache`` consulted by ``complete``
+        semantic_cache: Optional ``SemanticCache`` for near-duplicate prompts
+        retry_policy: Retries for 429/5xx/timeouts (default ``RetryPolicy()``;
+            ``RetryPolicy(max_attempts=1)`` disables them)
+        circuit_breaker: Fails fast while this endpoint is unhealthy (default
+            ``CircuitBreaker()``; ``failure_threshold=0`` never opens). With
+            ``endpoints`` the pool's per-endpoint breakers take over, and
+            this one defaults to never opening
+        rate_limiter: Optional ``RateLimiter`` applied to every completion
+            call, per model id
+        single_flight: Shares one upstream call between identical concurrent
+            completions (default ``SingleFlight()``, deterministic payloads only)
+        endpoints: Optional ``EndpointPool``; requests then go to its
+            healthiest endpoint and fail over to the next one, and
+            ``base_url`` defaults to the pool's first endpoint
+        hedger: Optional ``Hedger``; slow non-streamed completions get a
+            backup request and the first answer wins
+        metrics: Registry for per-call metrics (default: a new ``MetricsRegistry``)
+        router: Picks the model for calls that don't name one, per call site,
+            escalating when an answer is rejected (default: ``DEFAULT_MODEL`` only)
+        fixtures: Optional ``HTTPFixtures``; records every exchange to a file,
+            or replays recorded exchanges instead of using the network
+        warmup_connections: Connections per endpoint to resolve and open in
+            the background at construction (0 = no warmup; see ``warm_up``)
+        models_ttl: Seconds ``list_models`` reuses the cached model list
+        models_cache_dir: Directory for the on-disk model list shared
+            between processes (``None`` = memory only)
+    """
+
+    def __init__(self, base_url: Optional[str] = None, api_key: Optional[str] = None,
+                 pool_maxsize: int = 10, pool_connections: int = 4, pool_block: bool = False,
+                 keep_alive: bool = True, connect_timeout: float = 5.0, read_timeout: float = 60.0,
+                 cache: Optional[ResponseCache] = None,
+                 semantic_cache: Optional[SemanticCache] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 single_flight: Optional[SingleFlight] = None,
+                 endpoints: Optional[EndpointPool] = None,
+                 hedger: Optional[Hedger] = None,
+                 metrics: Optional[MetricsRegistry] = None,
+                 router: Optional[CascadeRouter] = None,
+                 fixtures: Optional[HTTPFixtures] = None,
+                 warmup_connections: int = 0,
+                 models_ttl: float = 3600.0,
+                 models_cache_dir: Optional[str] = None):
+        if base_url is None and endpoints is not None:
+            base_url = endpoints.primary.base_url
+        self.base_url = (base_url or os.getenv("BASE_URL", DEFAULT_BASE_URL)).rstrip("/")
+        self.api_key = api_key or os.getenv("API_KEY", "ALI-CLASS-2025")
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.timeout = (connect_timeout, read_timeout)
+        self.cache = cache
+        self.semantic_cache = semantic_cache
+        if endpoints is not None and circuit_breaker is None:
+            circuit_breaker = CircuitBreaker(failure_threshold=0)
+        self.retrier = Retrier(retry_policy, circuit_breaker)
+        self.rate_limiter = rate_limiter
+        self.single_flight = single_flight or SingleFlight()
+        self.endpoints = endpoints
+        self.hedger = hedger
+        if hedger is not None and hedger.max_workers is None:
+            # A primary and its hedge for every pooled connection
+            hedger.max_workers = 2 * pool_maxsize
+        self.metrics = metrics or MetricsRegistry()
+        self.router = router or CascadeRouter()
+        self.fixtures = fixtures
+        self.catalog = ModelCatalog(self, ttl=models_ttl, directory=models_cache_dir)
+
+        self.session = requests.Session()
+        pool_settings = {"pool_connections": pool_connections, "pool_maxsize": pool_maxsize,
+                         "pool_block": pool_block}
+        adapter = fixtures.adapter(**pool_settings) if fixtures is not None else TimingAdapter(**pool_settings)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "Connection": "keep-alive" if keep_alive else "close"
+        })
+
+        self.warmup_results = None
+        self._warmup_thread = None
+        if warmup_connections and fixtures is None:
+            self.warm_up(warmup_connections, wait=False)
+
+    @classmethod
+    def from_env(cls, **overrides) -> "LLMClient":
+        """Build a client from ``BASE_URL``/``API_KEY`` and the optional ``LLM_*`` tuning variables
+
+        ``LLM_CACHE`` (``deterministic`` or ``always``) turns on the on-disk
+        response cache in ``LLM_CACHE_DIR``; ``LLM_SEMANTIC_CACHE_THRESHOLD``
+        turns on the in-memory semantic cache. ``LLM_RATE_LIMITS`` is a JSON
+        object such as ``{"gpt-3.5-turbo": {"rpm": 500, "tpm": 90000}}``.
+        ``LLM_ENDPOINTS`` is a comma-separated list of base URLs to route
+        between. ``LLM_HEDGE_PERCENTILE`` turns on request hedging.
+        ``LLM_ROUTES`` and ``DEFAULT_MODEL`` configure the model router.
+        ``LLM_FIXTURES`` with ``LLM_FIXTURES_MODE`` (``record``/``replay``)
+        and ``LLM_FIXTURES_LATENCY`` (``original``/``zero``) record or replay
+        HTTP traffic. ``LLM_WARMUP_CONNECTIONS`` warms that many connections
+        per endpoint in the background. The model list is cached on disk in
+        ``LLM_CACHE_DIR`` for ``LLM_MODELS_TTL`` seconds.
+        """
+        settings = {
+            "pool_maxsize": int(os.getenv("LLM_POOL_MAXSIZE", "10")),
+            "keep_alive": os.getenv("LLM_KEEP_ALIVE", "true").lower() != "false",
+            "connect_timeout": float(os.getenv("LLM_CONNECT_TIMEOUT", "5")),
+            "read_timeout": float(os.getenv("LLM_READ_TIMEOUT", "60")),
+            "retry_policy": RetryPolicy(
+                max_attempts=int(os.getenv("LLM_MAX_ATTEMPTS", "4")),
+                max_total_time=float(os.getenv("LLM_RETRY_BUDGET", "30"))
+            ),
+            "single_flight": SingleFlight(os.getenv("LLM_COALESCE", "deterministic").lower()),
+            "router": CascadeRouter.from_env(),
+            "warmup_connections": int(os.getenv("LLM_WARMUP_CONNECTIONS", "0")),
+            "models_ttl": float(os.getenv("LLM_MODELS_TTL", "3600")),
+            "models_cache_dir": os.getenv("LLM_CACHE_DIR", ".llm_cache")
+        }
+        cache_mode = os.getenv("LLM_CACHE", "off").lower()
+        if cache_mode != "off":
+            ttl = float(os.getenv("LLM_CACHE_TTL", str(24 * 3600)))
+            settings["cache"] = ResponseCache(
+                directory=os.getenv("LLM_CACHE_DIR", ".llm_cache"),
+                mode=cache_mode,
+                ttl=ttl or None,
+                max_bytes=int(float(os.getenv("LLM_CACHE_MAX_MB", "100")) * 2 ** 20)
+            )
+        semantic_threshold = os.getenv("LLM_SEMANTIC_CACHE_THRESHOLD")
+        if semantic_threshold:
+            settings["semantic_cache"] = SemanticCache(
+                threshold=float(semantic_threshold),
+                audit_rate=float(os.getenv("LLM_SEMANTIC_CACHE_AUDIT_RATE", "0"))
+            )
+        rate_limits = os.getenv("LLM_RATE_LIMITS")
+        if rate_limits:
+            settings["rate_limiter"] = RateLimiter(
+                {model: ModelLimits.from_dict(values) for model, values in json.loads(rate_limits).items()},
+                max_wait=float(os.getenv("LLM_RATE_LIMIT_MAX_WAIT", "120"))
+            )
+        endpoint_urls = [url.strip() for url in os.getenv("LLM_ENDPOINTS", "").split(",") if url.strip()]
+        if endpoint_urls:
+            settings["endpoints"] = EndpointPool(endpoint_urls)
+        hedge_percentile = os.getenv("LLM_HEDGE_PERCENTILE")
+        if hedge_percentile:
+            settings["hedger"] = Hedger(
+                percentile=float(hedge_percentile),
+                budget=float(os.getenv("LLM_HEDGE_BUDGET", "0.05"))
+            )
+        fixtures_path = os.getenv("LLM_FIXTURES")
+        if fixtures_path:
+            settings["fixtures"] = HTTPFixtures(
+                fixtures_path,
+                mode=os.getenv("LLM_FIXTURES_MODE", "replay").lower(),
+                latency=os.getenv("LLM_FIXTURES_LATENCY", "original").lower()
+            )
+        settings.update(overrides)
+        return cls(**settings)
+
+    def warm_up(self, connections: int = 2, wait: bool = True) -> Optional[Dict[str, Any]]:
+        """Resolve every endpoint's host and open ``connections`` pooled connections to it
+
+        Resolved addresses are cached (``DNSCache``) and the connections are
+        parked in the pool, so the first request skips DNS, TCP and TLS
+        setup. With ``wait=False`` this runs on a background thread; see
+        ``wait_warm``. Results per origin end up in ``warmup_results``.
+        """
+        urls = [endpoint.base_url for endpoint in self.endpoints.endpoints] if self.endpoints else [self.base_url]
+        adapter = self.session.get_adapter(urls[0])
+        connections = min(connections, self.pool_maxsize)
+
+        # Resolve verify/cert the way requests does per call (e.g. REQUESTS_CA_BUNDLE),
+        # since urllib3 keys its pools by them
+        settings = self.session.merge_environment_settings(urls[0], {}, None, self.session.verify,
+                                                           self.session.cert)
+
+        def run():
+            self.warmup_results = warm_up(adapter, urls, connections,
+                                          verify=settings["verify"], cert=settings["cert"])
+
+        if wait:
+            run()
+            return self.warmup_results
+        self._warmup_thread = threading.Thread(target=run, name="llm-warmup", daemon=True)
+        self._warmup_thread.start()
+        return None
+
+    def wait_warm(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Wait for a background warmup and return its results"""
+        if self._warmup_thread is not None:
+            self._warmup_thread.join(timeout)
+        return self.warmup_results
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}{path}"
+
+    def request(self, method: str, path: str, model: Optional[str] = None, token_cost: int = 0,
+                **kwargs) -> requests.Response:
+        """Send a request over the pooled session, retrying transient failures
+
+        With a ``model`` and a ``rate_limiter``, every attempt (retries
+        included) waits for admission under that model's limits and reports
+        its status back, so 429s shrink the concurrency limit. An attempt
+        that cannot have produced a completion (a 429/5xx, or an error before
+        the response could be read) refunds its reservation, so retries do
+        not drain the buckets. A successful ``stream=True`` response keeps
+        its slot until the body has been read: its ``permit`` attribute must
+        be released by the caller.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+
+        def send():
+            if self.rate_limiter is None or model is None:
+                return self._dispatch(method, path, kwargs)
+            permit = self.rate_limiter.acquire(model, token_cost)
+            try:
+                response = self._dispatch(method, path, kwargs)
+            except BaseException as e:
+                # A read timeout may still have been served and billed upstream
+                if not isinstance(e, requests.ReadTimeout):
+                    permit.refund()
+                permit.release(e)
+                raise
+            permit.observe(response.status_code)
+            if self.retrier.policy.is_retryable_status(response.status_code):
+                permit.refund()
+            if kwargs.get("stream") and response.status_code == 200:
+                response.permit = permit
+            else:
+                permit.release()
+            return response
+
+        return self.retrier.call(send, name="endpoint pool" if self.endpoints is not None else self.base_url)
+
+    def _dispatch(self, method: str, path: str, kwargs: Dict[str, Any]) -> requests.Response:
+        """One attempt: straight to ``base_url``, or through the endpoint pool"""
+        if self.endpoints is None:
+            return self.session.request(method, self.url(path), **kwargs)
+
+        # Fail over immediately, best endpoint first; the retrier only backs
+        # off once every endpoint has failed
+        policy = self.retrier.policy
+        response = error = None
+        tried = 0
+        for endpoint in self.endpoints.ranked():
+            if not endpoint.breaker.allow():
+                continue
+            if tried:
+                self.endpoints.record_failover()
+            tried += 1
+            if response is not None:
+                response.close()
+            response = error = None
+
+            call_kwargs = kwargs
+            if endpoint.api_key:
+                headers = dict(kwargs.get("headers") or {})
+                headers["Authorization"] = f"Bearer {endpoint.api_key}"
+                call_kwargs = dict(kwargs, headers=headers)
+
+            endpoint.begin()
+            started = time.perf_counter()
+            try:
+                response = self.session.request(method, f"{endpoint.base_url}{path}", **call_kwargs)
+            except Exception as e:
+                if not is_endpoint_error(e):
+                    endpoint.cancel()
+                    raise
+                endpoint.end(time.perf_counter() - started, ok=False)
+                if not policy.is_retryable_exception(e):
+                    raise
+                error = e
+                continue
+            ok = not policy.is_retryable_status(response.status_code)
+            endpoint.end(time.perf_counter() - started, ok=ok,
+                         throttled=response.status_code in THROTTLE_STATUSES)
+            if ok:
+                return response
+
+        if error is not None:
+            raise error
+        if response is None:
+            raise CircuitOpenError("Every endpoint's circuit is open")
+        return response
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+    def list_models(self, refresh: bool = False) -> Dict[str, Any]:
+        """Return the parsed ``/v1/models`` response, from ``catalog`` while it is fresh"""
+        return self.catalog.response(refresh)
+
+    def chat(self, messages: List[Dict[str, str]], model: Optional[str] = None,
+             max_tokens: int = 150, temperature: float = 0.7, cache: Optional[bool] = None,
+             wait_timeout: Optional[float] = None, call_site: Optional[str] = None,
+             **extra) -> Dict[str, Any]:
+        """Return the parsed ``/v1/chat/completions`` response
+
+        Without a ``model`` the router picks one for the call site.
+        """
+        payload = {
+            "model": model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature
+        }
+        payload.update(extra)
+        return self.complete(payload, cache=cache, wait_timeout=wait_timeout,
+                             call_site=call_site or caller_site())
+
+    def complete(self, payload: Dict[str, Any], cache: Optional[bool] = None,
+                 wait_timeout: Optional[float] = None, call_site: Optional[str] = None) -> Dict[str, Any]:
+        """POST a prepared payload to ``/v1/chat/completions`` and return the parsed response
+
+        Args:
+            payload: Request body, exactly as the API expects it
+            cache: ``True`` to opt in to the response cache and to sharing an
+                identical in-flight call, ``False`` to bypass both, ``None``
+                to follow their modes
+            wait_timeout: Seconds to wait for a shared call, including one
+                this call started, before raising ``CoalescedWaitTimeout``
+            call_site: Name the call is attributed to in ``metrics``
+                (default: ``module.function`` of the caller)
+        """
+        call_site = call_site or caller_site()
+        model = payload.get("model")
+        if not model:
+            return self.router.complete(self, payload, call_site, cache=cache, wait_timeout=wait_timeout)
+        cache_key = None
+        if self.cache is not None:
+            if self.cache.should_cache(payload, cache):
+                cache_key = payload_key(payload, self.base_url)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    self.metrics.record_cache_hit(model, call_site)
+                    return cached
+            else:
+                self.cache.record_bypass()
+
+        semantic_key = semantic_hit = None
+        if self.semantic_cache is not None and self.semantic_cache.should_cache(payload, cache):
+            semantic_key = self.semantic_cache.split_payload(payload)
+            if semantic_key is not None:
+                semantic_hit = self.semantic_cache.lookup(*semantic_key)
+                if semantic_hit is not None and not self.semantic_cache.should_audit():
+                    self.metrics.record_cache_hit(model, call_site)
+                    return copy.deepcopy(semantic_hit["response"])
+
+        def fetch():
+            result = self._post_completion(payload, call_site)
+            if semantic_hit is not None:
+                # Audited hit: the fresh answer is served and compared with the cached one
+                self.semantic_cache.record_audit(response_text(semantic_hit["response"]), response_text(result))
+            elif semantic_key is not None:
+                self.semantic_cache.store(*semantic_key, copy.deepcopy(result))
+            if cache_key is not None:
+                self.cache.put(cache_key, result)
+            return result
+
+        if not self.single_flight.should_coalesce(payload, cache):
+            return fetch()
+        # The call fills the caches even if every caller has stopped waiting
+        result, shared = self.single_flight.do(cache_key or payload_key(payload, self.base_url),
+                                               fetch, wait_timeout)
+        if shared:
+            self.metrics.record_cache_hit(model, call_site)
+        return result
+
+    def _post_completion(self, payload: Dict[str, Any], call_site: str = "unknown") -> Dict[str, Any]:
+        """The actual HTTP round trip behind ``complete``"""
+        model = payload.get("model")
+        token_cost = estimate_payload_tokens(payload)
+
+        def send():
+            return self.post("/v1/chat/completions", json=payload, model=model, token_cost=token_cost)
+
+        started = time.perf_counter()
+        try:
+            response = self.hedger.call(send) if self.hedger is not None else send()
+        except Exception:
+            self.metrics.record(model, call_site, time.perf_counter() - started, ok=False)
+            raise
+        if response.status_code != 200:
+            self.metrics.record(model, call_site, time.perf_counter() - started,
+                                ttfb=response.elapsed.total_seconds(), ok=False)
+            raise LLMError(f"Error: {response.status_code} - {response.text}",
+                           response.status_code, response.text)
+        result = response.json()
+        # requests' ``elapsed`` stops when the headers have been parsed
+        self.metrics.record(model, call_site, time.perf_counter() - started,
+                            ttfb=response.elapsed.total_seconds(),
+                            connect=getattr(response, "connect_time", None),
+                            usage=result.get("usage"))
+        if self.rate_limiter is not None and model:
+            usage = result.get("usage") or {}
+            self.rate_limiter.reconcile(model, token_cost, usage.get("total_tokens"))
+        return result
+
+    def chat_text(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """Return only the assistant's reply"""
+        return response_text(self.chat(messages, **kwargs))
+
+    def stream_chat(self, messages: List[Dict[str, str]], model: Optional[str] = None,
+                    max_tokens: int = 150, temperature: float = 0.7, call_site: Optional[str] = None,
+                    **extra) -> "ChatStream":
+        """Start a ``stream=true`` completion and return a ``ChatStream`` of text deltas"""
+        from .streaming import ChatStream, StreamStats
+
+        payload = {
+            "model": model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "stream": True
+        }
+        payload.update(extra)
+        call_site = call_site or caller_site()
+        if not model:
+            # Streamed text is already on screen, so there is no escalation
+            model = self.router.models_for(call_site)[0]
+            payload["model"] = model
+        stats = StreamStats()
+        token_cost = estimate_payload_tokens(payload)
+        response = self.post("/v1/chat/completions", json=payload, stream=True,
+                             headers={"Accept": "text/event-stream"},
+                             model=model, token_cost=token_cost)
+        permit = getattr(response, "permit", None)
+        if response.status_code != 200:
+            body = response.text
+            response.close()
+            self.metrics.record(model, call_site, time.perf_counter() - stats.started, ok=False)
+            raise LLMError(f"Error: {response.status_code} - {body}", response.status_code, body)
+        connect = getattr(response, "connect_time", None)
+
+        def finished(stats):
+            if permit is not None:
+                permit.release()
+                # Without ``stream_options.include_usage`` the prompt side stays an estimate
+                usage = stats.usage or {}
+                actual = usage.get("total_tokens")
+                if actual is None:
+                    actual = estimate_messages_tokens(messages) + stats.completion_tokens
+                self.rate_limiter.reconcile(model, token_cost, actual)
+            self.metrics.record(model, call_site, stats.total_time, ttfb=stats.time_to_first_token,
+                                connect=connect,
+                                usage=stats.usage or {"completion_tokens": stats.completion_tokens},
+                                ok=stats.ok)
+
+        return ChatStream(response, stats, on_finish=finished)
+
+    def stream_json(self, messages: List[Dict[str, str]], max_depth: Optional[int] = 1,
+                    **kwargs) -> Iterator[Event]:
+        """Stream a JSON answer and yield ``(path, value)`` as each field or element closes
+
+        Ask for JSON in the prompt (or pass ``response_format``); text around
+        the document, such as a Markdown fence, is ignored.
+        """
+        kwargs.setdefault("call_site", caller_site())
+        return self.stream_chat(messages, **kwargs).json_events(max_depth)
+
+    def stream_generate(self, prompt: str, **kwargs) -> "ChatStream":
+        return self.stream_chat([{"role": "user", "content": prompt}], **kwargs)
+
+    def generate(self, prompt: str, **kwargs) -> str:
+        """Single-prompt convenience wrapper around ``chat_text``"""
+        return self.chat_text([{"role": "user", "content": prompt}], **kwargs)
+
+    def close(self):
+        if self.hedger is not None:
+            self.hedger.close()
+        self.single_flight.close()
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+        if self.fixtures is not None:
+            self.fixtures.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def get_default_client() -> LLMClient:
+    """Process-wide shared client, created from the environment on first use"""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = LLMClient.from_env()
+        return _default_client
@@ -0,0 +1,228 @@
+"""
+🧮 Batched Embeddings
+Embed any number of texts through ``/v1/embeddings``: texts are packed into
+requests within the provider's item and token limits, the requests run
+concurrently over the pooled session, and the vectors come back as one
+contiguous float32 matrix in input order
+"""
+
+import base64
+import math
+import os
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .client import LLMClient, get_default_client
+from .errors import LLMError
+from .metrics import caller_site
+from .tokens import estimate_tokens
+
+try:
+    import numpy as np
+except ImportError:  # numpy is needed for the result matrix, not for importing the package
+    np = None
+
+DEFAULT_EMBEDDING_MODEL = "text-embedding-3-small"
+
+# OpenAI limits: 2048 inputs and 300k tokens per request, 8191 tokens per input.
+# The token limit keeps a margin because local counts are estimates.
+MAX_ITEMS_PER_REQUEST = 2048
+MAX_TOKENS_PER_REQUEST = 250_000
+MAX_TOKENS_PER_INPUT = 8191
+
+
+def plan_batches(token_counts: Sequence[int], max_items: int = MAX_ITEMS_PER_REQUEST,
+                 max_tokens: int = MAX_TOKENS_PER_REQUEST) -> List[Tuple[int, int]]:
+    """Split inputs into contiguous ``(start, end)`` ranges within both limits
+
+    Greedy packing in input order gives the fewest requests, and contiguous
+    ranges let every response be copied straight into its rows.
+    """
+    batches = []
+    start = tokens = 0
+    for index, count in enumerate(token_counts):
+        if index > start and (index - start >= max_items or tokens + count > max_tokens):
+            batches.append((start, index))
+            start, tokens = index, 0
+        tokens += count
+    if start < len(token_counts):
+        batches.append((start, len(token_counts)))
+    return batches
+
+
+def decode_embedding(value: Any) -> "np.ndarray":
+    """One ``data[].embedding``: a list of floats or base64 little-endian float32"""
+    if isinstance(value, str):
+        return np.frombuffer(base64.b64decode(value), dtype="<f4")
+    return np.asarray(value, dtype=np.float32)
+
+
+class EmbeddingClient:
+    """Batched, concurrent client for ``/v1/embeddings``
+
+    Args:
+        client: ``LLMClient`` whose pooled session, retries, rate limits and
+            metrics are used (default: the shared client)
+        model: Embedding model id
+        max_items: Inputs per request
+        max_tokens: Estimated tokens per request
+        max_input_tokens: Longer inputs are truncated to about this many tokens
+        concurrency: Requests in flight (default: the client's ``pool_maxsize``)
+        min_batch_items: Smallest batch worth splitting a job into to keep
+            every worker busy
+        encoding_format: ``"float"`` or ``"base64"``. base64 is about 4x
+            smaller on the wire and much faster to parse; use it when the
+            endpoint supports it.
+        dimensions: Ask for shortened vectors (``text-embedding-3-*`` models)
+    """
+
+    def __init__(self, client: Optional[LLMClient] = None, model: str = DEFAULT_EMBEDDING_MODEL,
+                 max_items: int = MAX_ITEMS_PER_REQUEST, max_tokens: int = MAX_TOKENS_PER_REQUEST,
+                 max_input_tokens: int = MAX_TOKENS_PER_INPUT, concurrency: Optional[int] = None,
+                 min_batch_items: int = 64, encoding_format: str = "float",
+                 dimensions: Optional[int] = None):
+        if np is None:
+            raise ImportError("EmbeddingClient needs numpy: pip install numpy")
+        if encoding_format not in ("float", "base64"):
+            raise ValueError("encoding_format must be 'float' or 'base64'")
+        self.client = client or get_default_client()
+        self.model = model
+        self.max_items = max_items
+        self.max_tokens = max_tokens
+        self.max_input_tokens = max_input_tokens
+        self.concurrency = max(1, concurrency or self.client.pool_maxsize)
+        self.min_batch_items = min_batch_items
+        self.encoding_format = encoding_format
+        self.dimensions = dimensions
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="llm-embed")
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "requests": 0, "texts": 0, "truncated": 0, "prompt_tokens": 0, "seconds": 0.0}
+
+    @classmethod
+    def from_env(cls, client: Optional[LLMClient] = None, **overrides) -> "EmbeddingClient":
+        """``LLM_EMBEDDING_MODEL``, ``LLM_EMBEDDING_CONCURRENCY`` and ``LLM_EMBEDDING_FORMAT``"""
+        settings = {
+            "model": os.getenv("LLM_EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODEL),
+            "encoding_format": os.getenv("LLM_EMBEDDING_FORMAT", "float")
+        }
+        concurrency = os.getenv("LLM_EMBEDDING_CONCURRENCY")
+        if concurrency:
+            settings["concurrency"] = int(concurrency)
+        settings.update(overrides)
+        return cls(client, **settings)
+
+    def _prepare(self, texts: Sequence[str]) -> Tuple[List[str], List[int]]:
+        """Replace empty inputs (rejected by the API) and truncate oversized ones"""
+        prepared, counts = [], []
+        truncated = 0
+        max_chars = self.max_input_tokens * 4
+        for text in texts:
+            text = text or " "
+            if len(text) > max_chars:
+                text = text[:max_chars]
+                truncated += 1
+            prepared.append(text)
+            counts.append(estimate_tokens(text))
+        if truncated:
+            with self._lock:
+                self._stats["truncated"] += truncated
+        return prepared, counts
+
+    def plan(self, token_counts: Sequence[int]) -> List[Tuple[int, int]]:
+        """Batches for one job; small jobs are spread so every worker gets a share"""
+        spread = math.ceil(len(token_counts) / self.concurrency) if token_counts else 1
+        max_items = min(self.max_items, max(self.min_batch_items, spread))
+        return plan_batches(token_counts, max_items, self.max_tokens)
+
+    def _request(self, inputs: List[str], token_cost: int, call_site: str) -> Dict[str, Any]:
+        payload = {"model": self.model, "input": inputs, "encoding_format": self.encoding_format}
+        if self.dimensions:
+            payload["dimensions"] = self.dimensions
+        metrics = self.client.metrics
+        started = time.perf_counter()
+        try:
+            response = self.client.post("/v1/embeddings", json=payload, model=self.model, token_cost=token_cost)
+        except Exception:
+            metrics.record(self.model, call_site, time.perf_counter() - started, ok=False)
+            raise
+        if response.status_code != 200:
+            metrics.record(self.model, call_site, time.perf_counter() - started,
+                           ttfb=response.elapsed.total_seconds(), ok=False)
+            raise LLMError(f"Error: {response.status_code} - {response.text}",
+                           response.status_code, response.text)
+        result = response.json()
+        usage = result.get("usage") or {}
+        metrics.record(self.model, call_site, time.perf_counter() - started,
+                       ttfb=response.elapsed.total_seconds(),
+                       connect=getattr(response, "connect_time", None),
+                       usage=usage)
+        if self.client.rate_limiter is not None:
+            self.client.rate_limiter.reconcile(self.model, token_cost,
+                                               usage.get("total_tokens", usage.get("prompt_tokens")))
+        return result
+
+    def embed(self, texts: Sequence[str], call_site: Optional[str] = None) -> "np.ndarray":
+        """Return a C-contiguous ``(len(texts), dimensions)`` float32 matrix
+
+        Row ``i`` is the embedding of ``texts[i]``. The first failed request
+        cancels the batches that have not started and raises ``LLMError``.
+        """
+        call_site = call_site or caller_site()
+        started = time.perf_counter()
+        inputs, counts = self._prepare(texts)
+        if not inputs:
+            return np.empty((0, self.dimensions or 0), dtype=np.float32)
+
+        matrix = None
+        matrix_lock = threading.Lock()
+
+        def run(start: int, end: int) -> int:
+            nonlocal matrix
+            result = self._request(inputs[start:end], sum(counts[start:end]), call_site)
+            data = result.get("data") or []
+            if len(data) != end - start:
+                raise LLMError(f"Expected {end - start} embeddings, got {len(data)}")
+            for position, item in enumerate(data):
+                vector = decode_embedding(item["embedding"])
+                with matrix_lock:
+                    if matrix is None:
+                        matrix = np.empty((len(inputs), vector.shape[0]), dtype=np.float32)
+                matrix[start + item.get("index", position)] = vector
+            return int((result.get("usage") or {}).get("prompt_tokens") or 0)
+
+        batches = self.plan(counts)
+        futures = [self._executor.submit(run, start, end) for start, end in batches]
+        done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+        for future in pending:
+            future.cancel()
+        prompt_tokens = 0
+        for future in futures:
+            if future in done:
+                # Raises the first failure
+                prompt_tokens += future.result()
+
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats["requests"] += len(batches)
+            self._stats["texts"] += len(inputs)
+            self._stats["prompt_tokens"] += prompt_tokens
+            self._stats["seconds"] += time.perf_counter() - started
+        return matrix
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["texts_per_second"] = round(stats["texts"] / stats["seconds"], 1) if stats["seconds"] else None
+        stats["seconds"] = round(stats["seconds"], 3)
+        return stats
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,139 @@
+"""
+🧭 Endpoint Pool
+Several OpenAI-compatible endpoints behind one client: latency-aware routing
+with automatic failover when one of them goes bad
+"""
+
+import random
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+from .resilience import CircuitBreaker
+
+
+class Endpoint:
+    """One endpoint with its own health statistics and circuit breaker
+
+    Args:
+        base_url: Endpoint root, like ``LLMClient(base_url=...)``
+        api_key: Bearer token for this endpoint (``None`` uses the client's)
+        alpha: EWMA smoothing; higher reacts faster to change
+        breaker: Circuit breaker for this endpoint (default ``CircuitBreaker()``)
+    """
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None, alpha: float = 0.2,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.alpha = alpha
+        self.breaker = breaker or CircuitBreaker()
+        self._lock = threading.Lock()
+        self.ewma_latency = None
+        self.error_rate = 0.0
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.throttled = 0
+
+    def begin(self):
+        with self._lock:
+            self.in_flight += 1
+            self.requests += 1
+
+    def end(self, latency: float, ok: bool, throttled: bool = False):
+        """Record one finished request
+
+        A throttled (429) request raises the error rate, so routing moves
+        away from the endpoint, but is not a circuit breaker failure.
+        """
+        with self._lock:
+            self.in_flight -= 1
+            if ok:
+                self.ewma_latency = latency if self.ewma_latency is None else (
+                    self.alpha * latency + (1 - self.alpha) * self.ewma_latency)
+            elif throttled:
+                self.throttled += 1
+            else:
+                self.failures += 1
+            self.error_rate = self.alpha * (0.0 if ok else 1.0) + (1 - self.alpha) * self.error_rate
+        if ok:
+            self.breaker.record_success()
+        elif throttled:
+            self.breaker.cancel()
+        else:
+            self.breaker.record_failure()
+
+    def cancel(self):
+        """Forget a request that failed on our side before reaching the endpoint"""
+        with self._lock:
+            self.in_flight -= 1
+        self.breaker.cancel()
+
+    def cost(self, error_penalty: float) -> float:
+        """Expected wait: latency scaled by queued work and recent errors
+
+        Endpoints never tried yet cost 0, so they get tried; endpoints that
+        have only ever failed or throttled go last.
+        """
+        with self._lock:
+            if self.ewma_latency is None:
+                return float("inf") if self.failures or self.throttled else 0.0
+            latency = self.ewma_latency
+            return latency * (self.in_flight + 1) * (1 + error_penalty * self.error_rate)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ewma_latency_ms": round(self.ewma_latency * 1000, 2) if self.ewma_latency is not None else None,
+                "error_rate": round(self.error_rate, 4),
+                "in_flight": self.in_flight,
+                "requests": self.requests,
+                "failures": self.failures,
+                "throttled": self.throttled,
+                "circuit": self.breaker.state
+            }
+
+
+class EndpointPool:
+    """Route each request to the endpoint with the lowest expected latency
+
+    Args:
+        endpoints: ``Endpoint`` objects or base URLs, in order of preference
+        error_penalty: How strongly the recent error rate inflates an endpoint's cost
+        explore_rate: Fraction of requests sent to a random healthy endpoint
+            so that a slow endpoint's statistics can recover
+    """
+
+    def __init__(self, endpoints: Sequence[Any], error_penalty: float = 10.0,
+                 explore_rate: float = 0.05, seed: Optional[int] = None):
+        if not endpoints:
+            raise ValueError("EndpointPool needs at least one endpoint")
+        self.endpoints = [e if isinstance(e, Endpoint) else Endpoint(e) for e in endpoints]
+        self.error_penalty = error_penalty
+        self.explore_rate = explore_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.failovers = 0
+
+    @property
+    def primary(self) -> Endpoint:
+        return self.endpoints[0]
+
+    def ranked(self) -> List[Endpoint]:
+        """Endpoints whose circuit is not open, best first"""
+        available = [e for e in self.endpoints if e.breaker.state != CircuitBreaker.OPEN]
+        available.sort(key=lambda e: e.cost(self.error_penalty))
+        if len(available) > 1 and self._rng.random() < self.explore_rate:
+            explored = available.pop(self._rng.randrange(len(available)))
+            available.insert(0, explored)
+        return available
+
+    def record_failover(self):
+        with self._lock:
+            self.failovers += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "failovers": self.failovers,
+            "endpoints": {e.base_url: e.stats() for e in self.endpoints}
+        }
@@ -0,0 +1,38 @@
+"""
+❌ LLM Client Errors
+"""
+
+from typing import Optional
+
+
+class LLMError(Exception):
+    """A failed call to the LLM endpoint"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, body: Optional[str] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.body = body
+
+
+class CircuitOpenError(LLMError):
+    """Raised without calling the endpoint while its circuit breaker is open"""
+
+
+class RateLimitTimeout(LLMError):
+    """Raised when the client-side rate limiter could not admit a call in time"""
+
+
+class CoalescedWaitTimeout(LLMError):
+    """Raised when a caller's own timeout expires while it waits for a shared call"""
+
+
+class RequestPreempted(LLMError):
+    """Raised for a queued call that was evicted for higher-priority work"""
+
+
+class FixtureMissError(LLMError):
+    """Raised in fixture replay mode for a request that was never recorded"""
+
+
+class UnknownModelError(LLMError):
+    """Raised when a model id is not in the endpoint's model catalog"""
@@ -0,0 +1,300 @@
+"""
+📼 HTTP Fixtures
+Record every request/response pair the client sends, streamed chunks and
+their timings included, and replay them later with the original or zero
+latency, so benchmarks of our own code don't measure provider variance
+"""
+
+import codecs
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .cache import canonical_json
+from .errors import FixtureMissError
+from .metrics import TimingAdapter
+
+MODES = ("record", "replay")
+LATENCIES = ("original", "zero")
+
+# Recorded chunks are decoded content, so these no longer describe the body
+_DROPPED_HEADERS = {"content-length", "content-encoding", "transfer-encoding", "connection",
+                    "keep-alive", "date", "set-cookie"}
+
+
+def request_key(method: str, url: str, body: Any) -> Tuple[str, str, str]:
+    """What identifies a request: method, path and canonical JSON body
+
+    The host is left out so fixtures recorded against one endpoint replay
+    against another with the same paths. Headers (and the API key) are
+    never part of the key or the file.
+    """
+    parts = urlsplit(url)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    return method.upper(), path, canonical_json(_parse_body(body))
+
+
+def _parse_body(body: Any) -> Any:
+    if body is None:
+        return None
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", errors="replace")
+    try:
+        return json.loads(body)
+    except (TypeError, ValueError):
+        return body
+
+
+def read_fixtures(path: str) -> List[Dict[str, Any]]:
+    """Load the recorded exchanges from a fixture file, in recording order"""
+    exchanges = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if "format" not in record:
+                exchanges.append(record)
+    return exchanges
+
+
+class _Exchange:
+    """One request being recorded; written once its body has been read"""
+
+    def __init__(self, fixtures: "HTTPFixtures", request: requests.PreparedRequest, started: float):
+        method, path, _ = request_key(request.method, request.url, request.body)
+        self.fixtures = fixtures
+        self.started = started
+        self.record = {"method": method, "path": path, "body": _parse_body(request.body), "chunks": []}
+        # Network reads can split a multi-byte character; carry the partial bytes over
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._done = False
+
+    def headers(self, response: requests.Response):
+        self.record["status"] = response.status_code
+        self.record["reason"] = response.reason
+        self.record["headers"] = {name: value for name, value in response.headers.items()
+                                  if name.lower() not in _DROPPED_HEADERS}
+        self.record["ttfb"] = round(time.perf_counter() - self.started, 6)
+
+    def add(self, chunk: bytes):
+        text = self._decoder.decode(chunk)
+        if text:
+            self.record["chunks"].append([round(time.perf_counter() - self.started, 6), text])
+
+    def finish(self, complete: bool = True):
+        if self._done:
+            return
+        self._done = True
+        tail = self._decoder.decode(b"", final=True)
+        if tail:
+            self.record["chunks"].append([round(time.perf_counter() - self.started, 6), tail])
+        if not complete:
+            self.record["complete"] = False
+        self.fixtures.write(self.record)
+
+
+class _RecordingBody:
+    """Wraps ``response.raw`` and records every chunk as the caller reads it"""
+
+    def __init__(self, raw, exchange: _Exchange):
+        self._raw = raw
+        self._exchange = exchange
+
+    def stream(self, amt=None, decode_content=None):
+        complete = False
+        try:
+            for chunk in self._raw.stream(amt, decode_content=decode_content):
+                self._exchange.add(chunk)
+                yield chunk
+            complete = True
+        finally:
+            self._exchange.finish(complete)
+
+    def read(self, *args, **kwargs):
+        data = self._raw.read(*args, **kwargs)
+        if data:
+            self._exchange.add(data)
+        else:
+            self._exchange.finish()
+        return data
+
+    def close(self):
+        self._raw.close()
+        # Closed before the end of the body (e.g. a stream abandoned early)
+        self._exchange.finish(complete=False)
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class RecordingAdapter(TimingAdapter):
+    """``TimingAdapter`` that writes each exchange to the fixture file"""
+
+    def __init__(self, fixtures: "HTTPFixtures", **kwargs):
+        super().__init__(**kwargs)
+        self.fixtures = fixtures
+
+    def send(self, request, **kwargs):
+        exchange = _Exchange(self.fixtures, request, time.perf_counter())
+        response = super().send(request, **kwargs)
+        exchange.headers(response)
+        response.raw = _RecordingBody(response.raw, exchange)
+        return response
+
+
+class _ReplayBody:
+    """Stands in for ``response.raw``: yields the recorded chunks on their original schedule"""
+
+    def __init__(self, chunks: List[List[Any]], started: float, realtime: bool):
+        self._chunks = deque(chunks)
+        self._started = started
+        self._realtime = realtime
+        self._buffer = b""
+
+    def _next(self) -> Optional[bytes]:
+        if not self._chunks:
+            return None
+        offset, text = self._chunks.popleft()
+        if self._realtime:
+            delay = self._started + offset - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        return text.encode("utf-8")
+
+    def stream(self, amt=None, decode_content=None):
+        while True:
+            chunk = self._next()
+            if chunk is None:
+                return
+            yield chunk
+
+    def read(self, amt=None, *args, **kwargs):
+        while amt is None or len(self._buffer) < amt:
+            chunk = self._next()
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if amt is None:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:amt], self._buffer[amt:]
+        return data
+
+    def close(self):
+        self._chunks.clear()
+
+    def release_conn(self):
+        pass
+
+
+class ReplayAdapter(BaseAdapter):
+    """Answers requests from the fixture file without touching the network"""
+
+    def __init__(self, fixtures: "HTTPFixtures"):
+        super().__init__()
+        self.fixtures = fixtures
+
+    def send(self, request, **kwargs):
+        started = time.perf_counter()
+        record = self.fixtures.lookup(request)
+        realtime = self.fixtures.latency == "original"
+        if realtime:
+            # Session.send measures ``response.elapsed`` around this call
+            time.sleep(max(0.0, record.get("ttfb", 0.0)))
+
+        response = requests.Response()
+        response.status_code = record["status"]
+        response.reason = record.get("reason")
+        response.headers = CaseInsensitiveDict(record.get("headers") or {})
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = _ReplayBody(record.get("chunks") or [], started, realtime)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.connect_time = 0.0
+        return response
+
+    def close(self):
+        pass
+
+
+class HTTPFixtures:
+    """Record/replay store for the client's HTTP traffic
+
+    Args:
+        path: JSON Lines fixture file (a header line, then one exchange per line)
+        mode: ``"record"`` appends every exchange to ``path``; ``"replay"``
+            serves them back and raises ``FixtureMissError`` for anything else
+        latency: Replay timing, ``"original"`` (recorded time to first byte
+            and chunk spacing) or ``"zero"``
+
+    Identical requests are replayed in the order they were recorded, and
+    the last recording repeats once they run out, so retried 429/5xx
+    sequences play back as they happened.
+    """
+
+    def __init__(self, path: str, mode: str = "replay", latency: str = "original"):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        if latency not in LATENCIES:
+            raise ValueError(f"latency must be one of {LATENCIES}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._stats = {"recorded": 0, "replayed": 0, "misses": 0}
+        self._file = None
+        self._recordings: Dict[Tuple[str, str, str], Deque[Dict[str, Any]]] = {}
+        if mode == "record":
+            self._file = open(path, "a", encoding="utf-8")
+            self._write_line({"format": "llm-fixtures", "version": 1, "started": datetime.now().isoformat()})
+        else:
+            for record in read_fixtures(path):
+                key = request_key(record["method"], record["path"], json.dumps(record.get("body")))
+                self._recordings.setdefault(key, deque()).append(record)
+
+    def adapter(self, **pool_kwargs) -> BaseAdapter:
+        """Transport adapter for the client's session"""
+        if self.mode == "record":
+            return RecordingAdapter(self, **pool_kwargs)
+        return ReplayAdapter(self)
+
+    def _write_line(self, record: Dict[str, Any]):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def write(self, record: Dict[str, Any]):
+        with self._lock:
+            if self._file is None or self._file.closed:
+                return
+            self._write_line(record)
+            self._stats["recorded"] += 1
+
+    def lookup(self, request: requests.PreparedRequest) -> Dict[str, Any]:
+        key = request_key(request.method, request.url, request.body)
+        with self._lock:
+            queue = self._recordings.get(key)
+            if not queue:
+                self._stats["misses"] += 1
+                raise FixtureMissError(f"No recorded response for {key[0]} {key[1]} in {self.path}")
+            self._stats["replayed"] += 1
+            return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats, mode=self.mode, path=self.path)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None and not self._file.closed:
+                self._file.close()
@@ -0,0 +1,154 @@
+"""
+🦔 Hedged Requests
+Send a backup copy of a slow request and use whichever answer arrives first,
+trading a little extra load for a much shorter latency tail
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+# Workers when no client has sized the hedger
+DEFAULT_MAX_WORKERS = 32
+
+
+class Hedger:
+    """Hedge calls that take longer than a recent latency percentile
+
+    The primary call starts at once. If it has not finished ``delay()``
+    seconds after it began (the ``percentile`` of recent primary
+    latencies), an identical hedge is sent and the first successful
+    response wins. The loser is closed when it finishes; it cannot be
+    cancelled upstream, so every hedge costs a second completion.
+
+    Args:
+        percentile: Latency percentile that triggers a hedge
+        budget: Largest fraction of calls that may be hedged
+        min_delay: Never hedge earlier than this
+        initial_delay: Delay used until ``min_samples`` latencies are known
+        window: Recent primary latencies kept for the percentile
+        max_workers: Threads running primaries and hedges. ``LLMClient``
+            sets it to twice its ``pool_maxsize`` when left at ``None``, so
+            hedging never caps the client's concurrency.
+    """
+
+    def __init__(self, percentile: float = 95.0, budget: float = 0.05, min_delay: float = 0.05,
+                 initial_delay: float = 2.0, window: int = 500, min_samples: int = 20,
+                 max_workers: Optional[int] = None):
+        self.percentile = percentile
+        self.budget = budget
+        self.min_delay = min_delay
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self._latencies = deque(maxlen=window)
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+        # Every call earns ``budget`` hedge credits; a hedge spends one
+        self._credits = 1.0
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.budget_denied = 0
+
+    def delay(self) -> float:
+        """Seconds to wait for the primary before hedging"""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return max(self.min_delay, self.initial_delay)
+            values = sorted(self._latencies)
+        rank = max(1, math.ceil(self.percentile / 100.0 * len(values)))
+        return max(self.min_delay, values[rank - 1])
+
+    def _take_credit(self) -> bool:
+        with self._lock:
+            if self._credits >= 1.0:
+                self._credits -= 1.0
+                self.hedged += 1
+                return True
+            self.budget_denied += 1
+            return False
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers or DEFAULT_MAX_WORKERS,
+                                                    thread_name_prefix="llm-hedge")
+            return self._executor
+
+    def _timed(self, send: Callable[[], requests.Response], record: bool,
+               began: Optional[threading.Event] = None) -> requests.Response:
+        if began is not None:
+            began.set()
+        started = time.perf_counter()
+        response = send()
+        if record:
+            with self._lock:
+                self._latencies.append(time.perf_counter() - started)
+        return response
+
+    @staticmethod
+    def _succeeded(future) -> bool:
+        return future.exception() is None and future.result().status_code == 200
+
+    @staticmethod
+    def _discard(future):
+        if future.exception() is None:
+            future.result().close()
+
+    def call(self, send: Callable[[], requests.Response]) -> requests.Response:
+        """Run ``send``, hedging it with a second ``send`` if it is slow"""
+        with self._lock:
+            self.calls += 1
+            self._credits = min(10.0, self._credits + self.budget)
+
+        executor = self._pool()
+        began = threading.Event()
+        primary = executor.submit(self._timed, send, True, began)
+        # Time spent queued for a worker is not the endpoint being slow
+        began.wait()
+        done, _ = wait([primary], timeout=self.delay())
+        if done or not self._take_credit():
+            return primary.result()
+
+        hedge = executor.submit(self._timed, send, False)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if self._succeeded(future):
+                    for other in pending:
+                        other.add_done_callback(self._discard)
+                    if future is hedge:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return future.result()
+        # Both failed: report what the primary got
+        if hedge.exception() is None:
+            hedge.result().close()
+        return primary.result()
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, Any]:
+        delay = self.delay()
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "hedged": self.hedged,
+                "hedge_rate": round(self.hedged / self.calls, 4) if self.calls else None,
+                "hedge_wins": self.hedge_wins,
+                "win_rate": round(self.hedge_wins / self.hedged, 4) if self.hedged else None,
+                "budget_denied": self.budget_denied,
+                "delay_ms": round(delay * 1000, 2),
+                "samples": len(self._latencies)
+            }
@@ -0,0 +1,164 @@
+"""
+🧩 Streaming JSON Parser
+Parse a JSON answer while it is still being generated and hand out every
+field and array element the moment it closes, so work on the first items
+can start before the model has written the last ones
+"""
+
+import json
+import re
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+PathItem = Union[str, int]
+Event = Tuple[Tuple[PathItem, ...], Any]
+
+_WHITESPACE = " \t\r\n"
+_SCALAR_END = ",}]" + _WHITESPACE
+_STRING_STOP = re.compile(r'["\\]')
+
+
+class _Frame:
+    """An open object or array"""
+
+    __slots__ = ("kind", "start", "path", "key", "index", "expect_key")
+
+    def __init__(self, kind: str, start: int, path: Tuple[PathItem, ...]):
+        self.kind = kind
+        self.start = start
+        self.path = path
+        self.key = None
+        self.index = 0
+        self.expect_key = kind == "{"
+
+    def child_path(self) -> Tuple[PathItem, ...]:
+        return self.path + ((self.key if self.kind == "{" else self.index),)
+
+
+class StreamingJSONParser:
+    """Incremental parser fed with text chunks
+
+    ``feed`` returns ``(path, value)`` events for values completed by the
+    chunk, innermost first: ``(("items", 0), {...})`` as soon as the first
+    array element's ``}`` arrives, ``(("items",), [...])`` when the array
+    closes, and finally ``((), document)``. Text before the first ``{`` or
+    ``[`` (prose, a Markdown code fence) and anything after the document
+    is ignored.
+
+    Args:
+        max_depth: Only emit values at most this many levels deep (1 = the
+            top-level fields or elements); ``None`` emits every level. The
+            whole document is always emitted last.
+    """
+
+    def __init__(self, max_depth: Optional[int] = None):
+        self.max_depth = max_depth
+        self.result = None
+        self.done = False
+        self._buffer = ""
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._in_string = False
+        self._escape = False
+        self._token_start = None
+
+    def feed(self, chunk: str) -> List[Event]:
+        events = []
+        if self.done or not chunk:
+            return events
+        self._buffer += chunk
+        buffer = self._buffer
+        i = self._pos
+        end = len(buffer)
+        while i < end and not self.done:
+            ch = buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    i += 1
+                    continue
+                # Skip ahead to the next quote or backslash
+                match = _STRING_STOP.search(buffer, i)
+                if match is None:
+                    i = end
+                    continue
+                i = match.start()
+                if buffer[i] == "\\":
+                    self._escape = True
+                else:
+                    self._in_string = False
+                    self._string_closed(i + 1, events)
+                i += 1
+                continue
+            if self._token_start is not None:
+                if ch not in _SCALAR_END:
+                    i += 1
+                    continue
+                self._value_closed(self._token_start, i, events)
+                self._token_start = None
+
+            if not self._stack:
+                if ch in "{[":
+                    # The document starts here; drop the preamble
+                    buffer = self._buffer = buffer[i:]
+                    end = len(buffer)
+                    i = 0
+                    self._stack.append(_Frame(ch, 0, ()))
+                i += 1
+                continue
+
+            frame = self._stack[-1]
+            if ch in _WHITESPACE or ch == ":":
+                pass
+            elif ch in "{[":
+                self._stack.append(_Frame(ch, i, frame.child_path()))
+            elif ch in "}]":
+                self._stack.pop()
+                self._value_closed(frame.start, i + 1, events, frame)
+            elif ch == ",":
+                if frame.kind == "[":
+                    frame.index += 1
+                else:
+                    frame.expect_key = True
+            elif ch == '"':
+                self._in_string = True
+                self._token_start = i
+            else:
+                self._token_start = i
+            i += 1
+        self._pos = i
+        return events
+
+    def _string_closed(self, end: int, events: List[Event]):
+        start, self._token_start = self._token_start, None
+        frame = self._stack[-1]
+        if frame.kind == "{" and frame.expect_key:
+            frame.key = json.loads(self._buffer[start:end])
+            frame.expect_key = False
+        else:
+            self._value_closed(start, end, events)
+
+    def _value_closed(self, start: int, end: int, events: List[Event], frame: Optional[_Frame] = None):
+        value = json.loads(self._buffer[start:end])
+        if frame is not None and not self._stack:
+            self.result = value
+            self.done = True
+            events.append(((), value))
+            return
+        path = frame.path if frame is not None else self._stack[-1].child_path()
+        if self.max_depth is None or len(path) <= self.max_depth:
+            events.append((path, value))
+
+    def close(self) -> Any:
+        """The parsed document; raises ``ValueError`` if it never closed"""
+        if not self.done:
+            raise ValueError("Incomplete JSON document")
+        return self.result
+
+
+def iter_json(chunks: Iterable[str], max_depth: Optional[int] = 1) -> Iterator[Event]:
+    """Parse an iterable of text chunks (e.g. a ``ChatStream``) and yield events as values close"""
+    parser = StreamingJSONParser(max_depth=max_depth)
+    for chunk in chunks:
+        # Keep draining after the document closes so a stream finishes its stats
+        yield from parser.feed(chunk)
+    parser.close()
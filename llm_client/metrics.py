@@ -0,0 +1,260 @@
+"""
+📊 Call Metrics
+Per-call latency breakdown (connect, time to first byte, total), token
+accounting from ``usage`` and an in-process registry with histograms and
+cost, attributed per model and per call site
+"""
+
+import bisect
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .warmup import DNS_CACHE
+
+# Latency bucket upper bounds in seconds (roughly x2 steps). The
+# sub-millisecond ones resolve connects and TTFB on reused local connections.
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0, 160.0)
+
+# Estimated USD per 1M prompt / completion tokens; override with your contract prices
+DEFAULT_COST_TABLE = {
+    "gpt-3.5-turbo": (0.50, 1.50),
+    "gpt-4": (30.00, 60.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "anthropic.claude-3-haiku-20240307-v1:0": (0.25, 1.25),
+    "anthropic.claude-3-sonnet-20240229-v1:0": (3.00, 15.00),
+    "text-embedding-3-small": (0.02, 0.0),
+    "text-embedding-3-large": (0.13, 0.0),
+}
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+_connect = threading.local()
+
+
+# ----------------------------------------------------------------------------
+# Connect timing: urllib3 connections that report how long connect() took
+# ----------------------------------------------------------------------------
+
+class _TimedHTTPConnection(HTTPConnection):
+    def _new_conn(self):
+        # Warmed hosts skip the DNS lookup
+        return DNS_CACHE.create_connection(self) or super()._new_conn()
+
+    def connect(self):
+        started = time.perf_counter()
+        super().connect()
+        _connect.seconds = getattr(_connect, "seconds", 0.0) + time.perf_counter() - started
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def _new_conn(self):
+        return DNS_CACHE.create_connection(self) or super()._new_conn()
+
+    def connect(self):
+        # TCP plus TLS handshake
+        started = time.perf_counter()
+        super().connect()
+        _connect.seconds = getattr(_connect, "seconds", 0.0) + time.perf_counter() - started
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimingAdapter(HTTPAdapter):
+    """``HTTPAdapter`` that sets ``response.connect_time``
+
+    The value is 0.0 when a pooled connection was reused.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool
+        }
+
+    def send(self, request, **kwargs):
+        _connect.seconds = 0.0
+        response = super().send(request, **kwargs)
+        response.connect_time = _connect.seconds
+        return response
+
+
+def caller_site() -> str:
+    """``module.function`` of the first caller outside this package"""
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code.co_filename.startswith(_PACKAGE_DIR):
+        frame = frame.f_back
+    if frame is None:
+        return "unknown"
+    module = os.path.splitext(os.path.basename(frame.f_code.co_filename))[0]
+    return f"{module}.{frame.f_code.co_name}"
+
+
+class Histogram:
+    """Fixed-bucket histogram
+
+    Percentiles are interpolated linearly inside the bucket they fall in,
+    whose bounds are narrowed to the smallest and largest values seen.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = pct / 100.0 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = max(self.buckets[index - 1] if index else 0.0, self.min)
+                upper = min(self.buckets[index] if index < len(self.buckets) else self.max, self.max)
+                return lower + (upper - lower) * max(0.0, rank - seen) / count
+            seen += count
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 2),
+            "p50_ms": round(self.percentile(50) * 1000, 2),
+            "p95_ms": round(self.percentile(95) * 1000, 2),
+            "p99_ms": round(self.percentile(99) * 1000, 2),
+            "max_ms": round(self.max * 1000, 2)
+        }
+
+
+class _Series:
+    """Everything recorded for one (model, call site) pair"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+        self.connect = Histogram()
+        self.ttfb = Histogram()
+        self.total = Histogram()
+
+    def merge_into(self, target: Dict[str, Any]):
+        for name in ("calls", "errors", "cache_hits", "prompt_tokens", "completion_tokens", "cost"):
+            target[name] = target.get(name, 0) + getattr(self, name)
+        for name in ("connect", "ttfb", "total"):
+            histogram = target.setdefault(name, Histogram())
+            for index, count in enumerate(getattr(self, name).counts):
+                histogram.counts[index] += count
+            source = getattr(self, name)
+            histogram.count += source.count
+            histogram.total += source.total
+            histogram.min = min(histogram.min, source.min)
+            histogram.max = max(histogram.max, source.max)
+
+
+class MetricsRegistry:
+    """Thread-safe store of call metrics keyed by model and call site
+
+    Args:
+        cost_table: ``{model: (usd_per_1m_prompt, usd_per_1m_completion)}``;
+            models missing from it cost 0
+    """
+
+    def __init__(self, cost_table: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.cost_table = dict(DEFAULT_COST_TABLE if cost_table is None else cost_table)
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        prompt_price, completion_price = self.cost_table.get(model, (0.0, 0.0))
+        return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+    def _get(self, model: str, call_site: str) -> _Series:
+        key = (model or "unknown", call_site or "unknown")
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series()
+        return series
+
+    def record(self, model: str, call_site: str, total: float, ttfb: Optional[float] = None,
+               connect: Optional[float] = None, usage: Optional[Dict[str, Any]] = None, ok: bool = True):
+        """Record one upstream call"""
+        usage = usage or {}
+        prompt_tokens = int(usage.get("prompt_tokens") or 0)
+        completion_tokens = int(usage.get("completion_tokens") or 0)
+        with self._lock:
+            series = self._get(model, call_site)
+            series.calls += 1
+            if not ok:
+                series.errors += 1
+            series.prompt_tokens += prompt_tokens
+            series.completion_tokens += completion_tokens
+            series.cost += self.cost(model, prompt_tokens, completion_tokens)
+            series.total.observe(total)
+            if ttfb is not None:
+                series.ttfb.observe(ttfb)
+            if connect is not None:
+                series.connect.observe(connect)
+
+    def record_cache_hit(self, model: str, call_site: str):
+        with self._lock:
+            self._get(model, call_site).cache_hits += 1
+
+    def summary(self, by: str = "model") -> Dict[str, Any]:
+        """Totals and latency percentiles grouped ``by`` ``model``, ``call_site`` or ``both``"""
+        if by not in ("model", "call_site", "both"):
+            raise ValueError("by must be 'model', 'call_site' or 'both'")
+        groups = {}
+        with self._lock:
+            for (model, call_site), series in self._series.items():
+                key = {"model": model, "call_site": call_site}.get(by, f"{model} @ {call_site}")
+                series.merge_into(groups.setdefault(key, {}))
+        result = {}
+        for key, group in groups.items():
+            result[key] = {
+                "calls": group["calls"],
+                "errors": group["errors"],
+                "cache_hits": group["cache_hits"],
+                "prompt_tokens": group["prompt_tokens"],
+                "completion_tokens": group["completion_tokens"],
+                "cost_usd": round(group["cost"], 6),
+                "connect": group["connect"].summary(),
+                "ttfb": group["ttfb"].summary(),
+                "total": group["total"].summary()
+            }
+        return result
+
+    def total_cost(self) -> float:
+        with self._lock:
+            return sum(series.cost for series in self._series.values())
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
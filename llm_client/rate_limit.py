@@ -0,0 +1,329 @@
+"""
+🚦 Client-Side Rate Limiting
+Token buckets for requests/min and tokens/min plus AIMD adaptive concurrency,
+kept separately for every model id
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .errors import RateLimitTimeout
+from .resilience import is_endpoint_error
+
+# Responses that mean "slow down"
+OVERLOAD_STATUSES = (429, 503)
+
+
+class TokenBucket:
+    """Thread-safe token bucket
+
+    Args:
+        rate: Tokens added per second
+        capacity: Largest burst; defaults to ``burst_seconds`` worth of rate
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, burst_seconds: float = 10.0):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate * burst_seconds)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` now (possibly going into debt) and return how long to wait
+
+        Reserving instead of polling keeps callers in FIFO order and lets a
+        single request larger than the bucket through once it has refilled.
+        """
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def refund(self, amount: float):
+        """Give back tokens that were reserved but not used"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+
+class AIMDConcurrency:
+    """Concurrency limit that grows additively on success and halves on overload
+
+    Args:
+        initial: Starting limit
+        minimum: Never go below this many requests in flight
+        maximum: Never go above this many
+        decrease_factor: Multiplier applied on a 429/503/timeout
+
+    Only calls that started after the last decrease can trigger another one,
+    so a burst of 429s from the same window halves the limit once.
+    """
+
+    def __init__(self, initial: float = 4, minimum: float = 1, maximum: float = 64,
+                 decrease_factor: float = 0.5):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self.increases = 0
+        self.decreases = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[float]:
+        """Wait for a slot; returns the admission time, or None on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+            self.in_flight += 1
+            return time.monotonic()
+
+    def release(self, admitted_at: float, overloaded: Optional[bool]):
+        """Finish one request; ``None`` means the outcome says nothing about load"""
+        with self._condition:
+            self.in_flight -= 1
+            if overloaded:
+                if admitted_at >= self._last_decrease:
+                    self.limit = max(self.minimum, self.limit * self.decrease_factor)
+                    self._last_decrease = time.monotonic()
+                    self.decreases += 1
+            elif overloaded is False and self.limit < self.maximum:
+                # +1 per "window" of limit successes
+                self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+                self.increases += 1
+            self._condition.notify_all()
+
+
+class ModelLimits:
+    """Provider limits for one model; ``None`` leaves that dimension unlimited"""
+
+    def __init__(self, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None,
+                 max_concurrency: int = 16, initial_concurrency: int = 4,
+                 burst_seconds: float = 10.0):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrency = max_concurrency
+        self.initial_concurrency = min(initial_concurrency, max_concurrency)
+        self.burst_seconds = burst_seconds
+
+    @classmethod
+    def from_dict(cls, values: Dict[str, Any]) -> "ModelLimits":
+        return cls(
+            requests_per_minute=values.get("rpm"),
+            tokens_per_minute=values.get("tpm"),
+            max_concurrency=values.get("max_concurrency", 16),
+            initial_concurrency=values.get("initial_concurrency", 4),
+            burst_seconds=values.get("burst_seconds", 10.0)
+        )
+
+
+class _ModelState:
+    def __init__(self, limits: ModelLimits):
+        self.limits = limits
+        self.requests = (TokenBucket(limits.requests_per_minute / 60.0, burst_seconds=limits.burst_seconds)
+                         if limits.requests_per_minute else None)
+        self.tokens = (TokenBucket(limits.tokens_per_minute / 60.0, burst_seconds=limits.burst_seconds)
+                       if limits.tokens_per_minute else None)
+        self.concurrency = AIMDConcurrency(initial=limits.initial_concurrency,
+                                           maximum=limits.max_concurrency)
+        self.lock = threading.Lock()
+        self.admitted = 0
+        self.throttled = 0
+        self.overloaded = 0
+        self.wait_seconds = 0.0
+        self.refunded = 0
+
+    def debit(self, tokens: int) -> int:
+        """Tokens a reservation actually takes: never more than the bucket holds"""
+        if self.tokens is None:
+            return 0
+        return int(min(tokens, self.tokens.capacity))
+
+    def give_back(self, tokens: int):
+        if self.requests is not None:
+            self.requests.refund(1)
+        if self.tokens is not None and tokens:
+            self.tokens.refund(tokens)
+
+
+class Permit:
+    """One admitted call; report its outcome with ``observe`` before it is released
+
+    Used as a context manager, or released explicitly when the call outlives
+    the block that started it (a streamed response). ``refund`` returns the
+    reservation of an attempt that got no completion, such as a 429 that is
+    about to be retried.
+    """
+
+    def __init__(self, state: _ModelState, admitted_at: float, reserved_tokens: int):
+        self._state = state
+        self._admitted_at = admitted_at
+        self.reserved_tokens = reserved_tokens
+        self._overloaded = None
+        self._released = False
+        self._refunded = False
+
+    def observe(self, status_code: int):
+        self._overloaded = status_code in OVERLOAD_STATUSES
+
+    def refund(self):
+        """Give back the request and tokens this attempt reserved; later calls do nothing"""
+        if self._refunded:
+            return
+        self._refunded = True
+        self._state.give_back(self.reserved_tokens)
+        with self._state.lock:
+            self._state.refunded += 1
+
+    def release(self, error: Optional[BaseException] = None):
+        """Give the concurrency slot back; later calls do nothing"""
+        if self._released:
+            return
+        self._released = True
+        if error is not None and self._overloaded is None and is_endpoint_error(error):
+            # Timeouts and dropped connections are overload signals too
+            self._overloaded = True
+        if self._overloaded:
+            with self._state.lock:
+                self._state.overloaded += 1
+        self._state.concurrency.release(self._admitted_at, self._overloaded)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release(exc)
+
+
+class RateLimiter:
+    """Admission control for LLM calls, per model id
+
+    Args:
+        limits: ``{model_id: ModelLimits}``; the key ``"*"`` applies to
+            models without their own entry. Models matching neither are not
+            limited.
+        max_wait: Seconds a call may wait for admission before
+            ``RateLimitTimeout`` is raised
+    """
+
+    def __init__(self, limits: Dict[str, ModelLimits], max_wait: float = 120.0):
+        self.limits = dict(limits)
+        self.max_wait = max_wait
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def _state(self, model: str) -> Optional[_ModelState]:
+        with self._lock:
+            state = self._states.get(model)
+            if state is None:
+                limits = self.limits.get(model) or self.limits.get("*")
+                if limits is None:
+                    return None
+                state = self._states[model] = _ModelState(limits)
+            return state
+
+    def acquire(self, model: str, tokens: int = 0) -> Permit:
+        """Block until a call for ``model`` costing about ``tokens`` may start"""
+        state = self._state(model)
+        if state is None:
+            return _UNLIMITED_PERMIT
+
+        started = time.monotonic()
+        tokens = state.debit(tokens)
+        wait = 0.0
+        if state.requests is not None:
+            wait = max(wait, state.requests.reserve(1))
+        if state.tokens is not None and tokens:
+            wait = max(wait, state.tokens.reserve(tokens))
+        if wait > self.max_wait:
+            state.give_back(tokens)
+            raise RateLimitTimeout(f"Rate limit for {model}: next slot in {wait:.1f}s")
+        if wait > 0:
+            time.sleep(wait)
+
+        remaining = self.max_wait - (time.monotonic() - started)
+        admitted_at = state.concurrency.acquire(timeout=max(0.0, remaining))
+        if admitted_at is None:
+            state.give_back(tokens)
+            raise RateLimitTimeout(f"Rate limit for {model}: no concurrency slot within {self.max_wait:.0f}s")
+
+        waited = admitted_at - started
+        with state.lock:
+            state.admitted += 1
+            if waited > 0.001:
+                state.throttled += 1
+            state.wait_seconds += waited
+        return Permit(state, admitted_at, tokens)
+
+    def reconcile(self, model: str, reserved_tokens: int, actual_tokens: Optional[int]):
+        """Correct the token bucket once the response's ``usage`` is known"""
+        state = self._state(model)
+        if state is None or state.tokens is None or actual_tokens is None:
+            return
+        difference = state.debit(reserved_tokens) - actual_tokens
+        if difference > 0:
+            state.tokens.refund(difference)
+        elif difference < 0:
+            state.tokens.reserve(-difference)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            states = dict(self._states)
+        return {
+            model: {
+                "admitted": state.admitted,
+                "throttled": state.throttled,
+                "overloaded": state.overloaded,
+                "refunded": state.refunded,
+                "wait_seconds": round(state.wait_seconds, 3),
+                "concurrency_limit": round(state.concurrency.limit, 2),
+                "in_flight": state.concurrency.in_flight,
+                "requests_available": round(state.requests.available, 2) if state.requests else None,
+                "tokens_available": round(state.tokens.available, 1) if state.tokens else None
+            }
+            for model, state in states.items()
+        }
+
+
+class _UnlimitedPermit:
+    reserved_tokens = 0
+
+    def observe(self, status_code: int):
+        pass
+
+    def refund(self):
+        pass
+
+    def release(self, error: Optional[BaseException] = None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+_UNLIMITED_PERMIT = _UnlimitedPermit()
@@ -0,0 +1,247 @@
+"""
+🛡️ Resilience
+Retries with exponential backoff and jitter, ``Retry-After`` support, a total
+retry budget and a circuit breaker that fails fast while the endpoint is down
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+from .errors import CircuitOpenError
+
+RETRYABLE_STATUSES = (408, 429, 500, 502, 503, 504)
+
+# Retried, but not held against the endpoint's health: the endpoint is up
+# and pacing is the rate limiter's job
+THROTTLE_STATUSES = (429,)
+
+# Request errors raised before anything was sent
+_LOCAL_REQUEST_ERRORS = (requests.exceptions.InvalidURL, requests.exceptions.InvalidSchema,
+                         requests.exceptions.MissingSchema, requests.exceptions.InvalidHeader,
+                         requests.exceptions.URLRequired)
+
+
+def is_endpoint_error(error: BaseException) -> bool:
+    """Whether an exception raised by a request says anything about the endpoint
+
+    Errors raised on our side, such as a fixture miss in replay mode, the
+    rate limiter giving up or a malformed URL, must not count against the
+    endpoint's health or the adaptive concurrency limit.
+    """
+    return isinstance(error, requests.RequestException) and not isinstance(error, _LOCAL_REQUEST_ERRORS)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a ``Retry-After`` header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class RetryPolicy:
+    """When and how long to wait before retrying a failed request
+
+    Args:
+        max_attempts: Total tries including the first one (1 disables retries)
+        base_delay: Backoff for the first retry; doubles on every attempt
+        max_delay: Upper bound for a single backoff
+        max_total_time: Give up once this many seconds have been spent on retries
+        retry_statuses: HTTP statuses treated as transient
+    """
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 0.5, max_delay: float = 20.0,
+                 max_total_time: float = 30.0, retry_statuses=RETRYABLE_STATUSES):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_total_time = max_total_time
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        return status_code in self.retry_statuses
+
+    @staticmethod
+    def is_retryable_exception(error: BaseException) -> bool:
+        return isinstance(error, (requests.Timeout, requests.ConnectionError))
+
+    def backoff(self, retry_number: int, rng: random.Random) -> float:
+        """Full-jitter exponential backoff for the n-th retry (starting at 0)"""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** retry_number))
+        return rng.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """Per-endpoint breaker: closed → open after repeated failures → half-open probe
+
+    Args:
+        failure_threshold: Consecutive failures that open the circuit (0 never opens)
+        reset_timeout: Seconds to stay open before letting one probe through
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a request may go out now"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def retry_in(self) -> float:
+        """Seconds until the breaker will let a probe through"""
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def cancel(self):
+        """Give back a probe slot for an attempt that never reached the endpoint"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or (
+                    self.failure_threshold and self._failures >= self.failure_threshold):
+                if self._state != self.OPEN:
+                    self.times_opened += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected
+        }
+
+
+class Retrier:
+    """Runs a request function under a ``RetryPolicy`` and a ``CircuitBreaker``"""
+
+    def __init__(self, policy: Optional[RetryPolicy] = None,
+                 breaker: Optional[CircuitBreaker] = None,
+                 sleep: Callable[[float], None] = time.sleep, seed: Optional[int] = None):
+        self.policy = policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.sleep = sleep
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.retries = 0
+        self.gave_up = 0
+
+    def _count(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def call(self, send: Callable[[], requests.Response], name: str = "endpoint") -> requests.Response:
+        """Call ``send`` until it succeeds, fails permanently or the budget runs out
+
+        Returns the last response (callers still check ``status_code``) or
+        re-raises the last network error.
+        """
+        self._count("calls")
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                raise CircuitOpenError(
+                    f"Circuit open for {name}; retry in {self.breaker.retry_in():.1f}s")
+
+            response, error = None, None
+            try:
+                response = send()
+            except Exception as e:
+                if not is_endpoint_error(e):
+                    self.breaker.cancel()
+                    raise
+                if not self.policy.is_retryable_exception(e):
+                    self.breaker.record_failure()
+                    raise
+                error = e
+
+            if response is not None and not self.policy.is_retryable_status(response.status_code):
+                # Client errors such as 400/401 say nothing about endpoint health
+                self.breaker.record_success()
+                return response
+            if response is not None and response.status_code in THROTTLE_STATUSES:
+                self.breaker.cancel()
+            else:
+                self.breaker.record_failure()
+
+            attempt += 1
+            delay = self.policy.backoff(attempt - 1, self._rng)
+            if response is not None:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after is not None:
+                    delay = max(delay, retry_after)
+            elapsed = time.monotonic() - started
+            if attempt >= self.policy.max_attempts or elapsed + delay > self.policy.max_total_time:
+                self._count("gave_up")
+                if error is not None:
+                    raise error
+                return response
+
+            if response is not None:
+                response.close()
+            self._count("retries")
+            self.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "gave_up": self.gave_up,
+            "circuit": self.breaker.stats()
+        }
@@ -0,0 +1,143 @@
+"""
+🪜 Cascading Model Router
+Send each request to the cheapest, fastest model first and escalate to a
+stronger one only when the answer fails a verifier or confidence check
+"""
+
+import json
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+DEFAULT_MODEL = "gpt-3.5-turbo"
+
+# Phrases that signal the model itself is unsure or gave up
+UNCERTAIN_PHRASES = (
+    r"\bI(?:'m| am) not (?:sure|certain)\b",
+    r"\bI (?:don't|do not) know\b",
+    r"\bI (?:can't|cannot) (?:help|answer|determine)\b",
+    r"\bI'?m unable to\b",
+)
+
+Verifier = Callable[[Dict[str, Any], Dict[str, Any]], bool]
+
+
+class ConfidenceCheck:
+    """Default verifier: accept an answer unless it looks unreliable
+
+    Rejects empty answers, answers that say the model is unsure and answers
+    cut off by the model's own limit. An answer cut off by the ``max_tokens``
+    the caller asked for is accepted: a stronger model would be cut off
+    there too. When the response carries ``logprobs``, also rejects a mean
+    token log-probability below ``min_mean_logprob``.
+    """
+
+    def __init__(self, min_mean_logprob: float = -1.0, uncertain_phrases: Sequence[str] = UNCERTAIN_PHRASES):
+        self.min_mean_logprob = min_mean_logprob
+        self._uncertain = re.compile("|".join(uncertain_phrases), re.IGNORECASE) if uncertain_phrases else None
+
+    def __call__(self, payload: Dict[str, Any], result: Dict[str, Any]) -> bool:
+        choices = result.get("choices") or []
+        if not choices:
+            return False
+        choice = choices[0]
+        text = (choice.get("message") or {}).get("content") or ""
+        if not text.strip():
+            return False
+        if choice.get("finish_reason") == "length" and not payload.get("max_tokens"):
+            return False
+        if self._uncertain is not None and self._uncertain.search(text):
+            return False
+        tokens = ((choice.get("logprobs") or {}).get("content")) or []
+        if tokens:
+            mean = sum(token.get("logprob", 0.0) for token in tokens) / len(tokens)
+            if mean < self.min_mean_logprob:
+                return False
+        return True
+
+
+class Route:
+    """Models to try in order (cheap first) and the check that accepts an answer"""
+
+    def __init__(self, models: Sequence[str], verifier: Optional[Verifier] = None):
+        if not models:
+            raise ValueError("A route needs at least one model")
+        self.models = list(models)
+        self.verifier = verifier
+
+
+class CascadeRouter:
+    """Pick models per call site and escalate on rejected answers
+
+    Call sites are matched exactly (``workshop_part1_setup.generate_text``),
+    then by function name (``generate_text``), then ``"*"``. The default
+    route has a single model, so nothing escalates until a route with two
+    or more models is configured.
+
+    Args:
+        routes: ``{call_site: Route or [models]}``
+        default_models: Route for call sites nothing matches
+        verifier: Check used by routes without their own (default ``ConfidenceCheck()``)
+    """
+
+    def __init__(self, routes: Optional[Dict[str, Any]] = None,
+                 default_models: Optional[Sequence[str]] = None,
+                 verifier: Optional[Verifier] = None):
+        self.routes = {site: route if isinstance(route, Route) else Route(route)
+                       for site, route in (routes or {}).items()}
+        self.default_route = Route(default_models or [DEFAULT_MODEL])
+        self.verifier = verifier or ConfidenceCheck()
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    @classmethod
+    def from_env(cls, **overrides) -> "CascadeRouter":
+        """``LLM_ROUTES`` as JSON ``{call_site: [models]}``; ``DEFAULT_MODEL`` for everything else"""
+        settings = {
+            "routes": json.loads(os.getenv("LLM_ROUTES") or "{}"),
+            "default_models": [os.getenv("DEFAULT_MODEL", DEFAULT_MODEL)]
+        }
+        settings.update(overrides)
+        return cls(**settings)
+
+    def route_for(self, call_site: str) -> Route:
+        function = call_site.rsplit(".", 1)[-1]
+        return self.routes.get(call_site) or self.routes.get(function) or self.routes.get("*") or self.default_route
+
+    def models_for(self, call_site: str, default: Optional[Sequence[str]] = None) -> List[str]:
+        """Models configured for a call site; ``default`` if only the fallback route matches"""
+        route = self.route_for(call_site)
+        if route is self.default_route and default:
+            return list(default)
+        return list(route.models)
+
+    def record(self, call_site: str, model: str, tier: int):
+        """Count an answer served by ``model``, the ``tier``-th model tried (0 = cheapest)"""
+        with self._lock:
+            stats = self._stats.setdefault(call_site, {"calls": 0, "escalations": 0, "served_by": {}})
+            stats["calls"] += 1
+            stats["escalations"] += 1 if tier else 0
+            stats["served_by"][model] = stats["served_by"].get(model, 0) + 1
+
+    def complete(self, client, payload: Dict[str, Any], call_site: str, **kwargs) -> Dict[str, Any]:
+        """Run ``payload`` through ``client.complete`` down the route until an answer is accepted
+
+        The last model's answer is returned even if it is rejected.
+        """
+        route = self.route_for(call_site)
+        verifier = route.verifier or self.verifier
+        for tier, model in enumerate(route.models):
+            result = client.complete(dict(payload, model=model), call_site=call_site, **kwargs)
+            if tier == len(route.models) - 1 or verifier(payload, result):
+                self.record(call_site, model, tier)
+                return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            result = {}
+            for call_site, stats in self._stats.items():
+                entry = dict(stats, served_by=dict(stats["served_by"]))
+                entry["escalation_rate"] = round(stats["escalations"] / stats["calls"], 4) if stats["calls"] else None
+                result[call_site] = entry
+            return result
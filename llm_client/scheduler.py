@@ -0,0 +1,290 @@
+"""
+🎚️ Priority Scheduler
+Queue LLM calls by caller class in front of the client: strict priority
+between classes, weighted fair queuing within a priority level, per-class
+concurrency caps and eviction of queued low-priority work under pressure
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+from .client import LLMClient, get_default_client
+from .errors import RequestPreempted
+from .metrics import Histogram, caller_site
+from .tokens import estimate_payload_tokens
+
+
+class PriorityClass:
+    """How one caller class is scheduled
+
+    Args:
+        priority: Lower runs first; queued work of a lower class only starts
+            when no higher class has anything runnable
+        weight: Share of dispatches among classes with the same priority
+        max_concurrency: Most calls of this class in flight at once (None =
+            every slot), so background work always leaves slots free
+    """
+
+    def __init__(self, priority: int = 0, weight: float = 1.0, max_concurrency: Optional[int] = None):
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        self.priority = priority
+        self.weight = weight
+        self.max_concurrency = max_concurrency
+
+    @classmethod
+    def from_dict(cls, values: Dict[str, Any]) -> "PriorityClass":
+        return cls(
+            priority=values.get("priority", 0),
+            weight=values.get("weight", 1.0),
+            max_concurrency=values.get("max_concurrency")
+        )
+
+
+def default_classes(max_concurrency: int) -> Dict[str, PriorityClass]:
+    """``interactive`` ahead of ``batch``; batch never takes the last quarter of the slots"""
+    return {
+        "interactive": PriorityClass(priority=0),
+        "batch": PriorityClass(priority=1, max_concurrency=max(1, max_concurrency * 3 // 4))
+    }
+
+
+class _Item:
+    __slots__ = ("klass", "call", "future", "finish_tag", "enqueued_at")
+
+    def __init__(self, klass: str, call: Callable[[], Any], finish_tag: float):
+        self.klass = klass
+        self.call = call
+        self.future = Future()
+        self.finish_tag = finish_tag
+        self.enqueued_at = time.perf_counter()
+
+
+class _ClassState:
+    def __init__(self, config: PriorityClass):
+        self.config = config
+        self.queue = deque()
+        self.in_flight = 0
+        self.last_finish = 0.0
+        self.wait = Histogram()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.preempted = 0
+
+    def runnable(self) -> bool:
+        limit = self.config.max_concurrency
+        return bool(self.queue) and (limit is None or self.in_flight < limit)
+
+
+class PriorityScheduler:
+    """Run LLM calls on a fixed number of slots, highest priority class first
+
+    Within one priority level, classes share dispatches in proportion to
+    their ``weight`` (weighted fair queuing on virtual finish tags, using
+    each call's ``cost``: the estimated tokens for completions). When
+    ``max_queue`` calls are waiting, a new call evicts the most recently
+    queued call of the lowest priority below its own, whose future fails
+    with ``RequestPreempted``; with nothing to evict, the new call itself is
+    rejected that way.
+
+    Args:
+        client: Client the convenience methods call (default: the shared client)
+        max_concurrency: Calls in flight across all classes (default: the
+            client's ``pool_maxsize``)
+        classes: ``{name: PriorityClass}`` (default: ``default_classes``)
+        max_queue: Calls that may wait across all classes
+    """
+
+    def __init__(self, client: Optional[LLMClient] = None, max_concurrency: Optional[int] = None,
+                 classes: Optional[Dict[str, PriorityClass]] = None, max_queue: int = 1000):
+        self.client = client or get_default_client()
+        self.max_concurrency = max(1, max_concurrency or self.client.pool_maxsize)
+        self.max_queue = max_queue
+        classes = classes if classes is not None else default_classes(self.max_concurrency)
+        if not classes:
+            raise ValueError("At least one priority class is needed")
+        self._states = {name: _ClassState(config) for name, config in classes.items()}
+        self._virtual_time = 0.0
+        self._queued = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._workers = [threading.Thread(target=self._work, name=f"llm-scheduler-{n}", daemon=True)
+                         for n in range(self.max_concurrency)]
+        for worker in self._workers:
+            worker.start()
+
+    @classmethod
+    def from_env(cls, client: Optional[LLMClient] = None, **overrides) -> "PriorityScheduler":
+        """``LLM_PRIORITY_CLASSES`` as JSON ``{name: {"priority", "weight", "max_concurrency"}}``
+        and ``LLM_SCHEDULER_CONCURRENCY``"""
+        settings = {}
+        classes = os.getenv("LLM_PRIORITY_CLASSES")
+        if classes:
+            settings["classes"] = {name: PriorityClass.from_dict(values)
+                                   for name, values in json.loads(classes).items()}
+        concurrency = os.getenv("LLM_SCHEDULER_CONCURRENCY")
+        if concurrency:
+            settings["max_concurrency"] = int(concurrency)
+        settings.update(overrides)
+        return cls(client, **settings)
+
+    # ------------------------------------------------------------------
+    # Queueing
+    # ------------------------------------------------------------------
+
+    def submit(self, priority_class: str, call: Callable[..., Any], *args, cost: float = 1.0,
+               **kwargs) -> Future:
+        """Queue ``call(*args, **kwargs)`` under ``priority_class`` and return its ``Future``"""
+        state = self._states.get(priority_class)
+        if state is None:
+            raise ValueError(f"Unknown priority class: {priority_class}")
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Scheduler is closed")
+            state.submitted += 1
+            if self._queued >= self.max_queue and not self._evict_below(state.config.priority):
+                state.preempted += 1
+                future = Future()
+                future.set_exception(RequestPreempted(f"Queue full ({self.max_queue} waiting)"))
+                return future
+
+            # A class that has used less than its weight's share gets the
+            # earlier finish tags
+            start = max(self._virtual_time, state.last_finish)
+            state.last_finish = start + max(cost, 1e-9) / state.config.weight
+            item = _Item(priority_class, lambda: call(*args, **kwargs), state.last_finish)
+            state.queue.append(item)
+            self._queued += 1
+            self._condition.notify()
+        return item.future
+
+    def _evict_below(self, priority: int) -> bool:
+        """Drop the newest queued call of the lowest priority worse than ``priority``"""
+        victims = [state for state in self._states.values()
+                   if state.queue and state.config.priority > priority]
+        if not victims:
+            return False
+        victim = max(victims, key=lambda state: (state.config.priority, state.queue[-1].enqueued_at))
+        item = victim.queue.pop()
+        self._queued -= 1
+        victim.preempted += 1
+        item.future.set_exception(RequestPreempted(f"Preempted by higher-priority work ({item.klass})"))
+        return True
+
+    def _next_item(self) -> Optional[_Item]:
+        """Best runnable item: lowest priority value, then earliest finish tag"""
+        best = None
+        for state in self._states.values():
+            if not state.runnable():
+                continue
+            head = state.queue[0]
+            if best is None or (state.config.priority, head.finish_tag) < (best[0].config.priority, best[1].finish_tag):
+                best = (state, head)
+        if best is None:
+            return None
+        state, item = best
+        state.queue.popleft()
+        state.in_flight += 1
+        self._queued -= 1
+        self._virtual_time = max(self._virtual_time, item.finish_tag)
+        state.wait.observe(time.perf_counter() - item.enqueued_at)
+        return item
+
+    def _work(self):
+        while True:
+            with self._condition:
+                item = self._next_item()
+                while item is None:
+                    if self._closed and not self._queued:
+                        return
+                    self._condition.wait()
+                    item = self._next_item()
+            if item.future.set_running_or_notify_cancel():
+                try:
+                    result = item.call()
+                except BaseException as e:
+                    item.future.set_exception(e)
+                    ok = False
+                else:
+                    item.future.set_result(result)
+                    ok = True
+            else:
+                ok = None
+            with self._condition:
+                state = self._states[item.klass]
+                state.in_flight -= 1
+                if ok:
+                    state.completed += 1
+                elif ok is False:
+                    state.failed += 1
+                # A freed class cap can make a different class runnable
+                self._condition.notify_all()
+
+    # ------------------------------------------------------------------
+    # Client calls
+    # ------------------------------------------------------------------
+
+    def submit_complete(self, payload: Dict[str, Any], priority_class: str = "interactive",
+                        **kwargs) -> Future:
+        """Queue ``client.complete(payload)``; its cost is the payload's estimated tokens"""
+        # The call site is captured here: on the worker thread the caller's frames are gone
+        kwargs.setdefault("call_site", caller_site())
+        return self.submit(priority_class, self.client.complete, payload,
+                           cost=estimate_payload_tokens(payload), **kwargs)
+
+    def complete(self, payload: Dict[str, Any], priority_class: str = "interactive",
+                 **kwargs) -> Dict[str, Any]:
+        kwargs.setdefault("call_site", caller_site())
+        return self.submit_complete(payload, priority_class, **kwargs).result()
+
+    def chat(self, messages: List[Dict[str, str]], priority_class: str = "interactive",
+             **kwargs) -> Dict[str, Any]:
+        kwargs.setdefault("call_site", caller_site())
+        cost = estimate_payload_tokens({"messages": messages, "max_tokens": kwargs.get("max_tokens", 150)})
+        return self.submit(priority_class, self.client.chat, messages, cost=cost, **kwargs).result()
+
+    def generate(self, prompt: str, priority_class: str = "interactive", **kwargs) -> str:
+        kwargs.setdefault("call_site", caller_site())
+        cost = estimate_payload_tokens({"messages": [{"role": "user", "content": prompt}],
+                                        "max_tokens": kwargs.get("max_tokens", 150)})
+        return self.submit(priority_class, self.client.generate, prompt, cost=cost, **kwargs).result()
+
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                name: {
+                    "priority": state.config.priority,
+                    "weight": state.config.weight,
+                    "submitted": state.submitted,
+                    "completed": state.completed,
+                    "failed": state.failed,
+                    "preempted": state.preempted,
+                    "queued": len(state.queue),
+                    "in_flight": state.in_flight,
+                    "wait": state.wait.summary()
+                }
+                for name, state in self._states.items()
+            }
+
+    def close(self, wait: bool = True):
+        """Stop accepting calls; queued calls still run"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,262 @@
+"""
+🧠 Semantic Cache
+Serve a cached answer when a new prompt means the same thing as an earlier
+one, even if it is worded differently
+"""
+
+import hashlib
+import math
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .cache import canonical_json
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; the pure Python path is fine for small caches
+    np = None
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+class HashingEmbedder:
+    """Dependency-free text embedding from hashed words and character trigrams
+
+    Cheap and deterministic, good at catching rephrasings that reuse most of
+    the same words. Swap in a real model (e.g. sentence-transformers) through
+    ``SemanticCache(embed=...)`` for paraphrases with different vocabulary.
+    """
+
+    def __init__(self, dimensions: int = 512):
+        self.dimensions = dimensions
+
+    def _bucket(self, feature: str) -> Tuple[int, float]:
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        return value % self.dimensions, 1.0 if value >> 63 else -1.0
+
+    def __call__(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        words = _WORD.findall(text.lower())
+        for word in words:
+            index, sign = self._bucket("w:" + word)
+            vector[index] += 2.0 * sign
+            padded = f" {word} "
+            for i in range(len(padded) - 2):
+                index, sign = self._bucket("c:" + padded[i:i + 3])
+                vector[index] += sign
+        return normalize(vector)
+
+
+def normalize(vector: Sequence[float]) -> List[float]:
+    norm = math.sqrt(sum(value * value for value in vector))
+    if norm == 0:
+        return list(vector)
+    return [value / norm for value in vector]
+
+
+class VectorIndex:
+    """In-memory nearest-neighbour index over unit vectors (cosine similarity)
+
+    Brute force, which is exact and fast enough for the few thousand entries
+    a prompt cache holds; uses numpy when it is installed.
+    """
+
+    def __init__(self):
+        self._ids = []
+        self._vectors = []
+        self._matrix = None
+
+    def __len__(self):
+        return len(self._ids)
+
+    def ids(self) -> List[Any]:
+        return list(self._ids)
+
+    def add(self, item_id: Any, vector: Sequence[float]):
+        self._ids.append(item_id)
+        self._vectors.append(list(vector))
+        self._matrix = None
+
+    def remove(self, item_id: Any):
+        index = self._ids.index(item_id)
+        del self._ids[index]
+        del self._vectors[index]
+        self._matrix = None
+
+    def nearest(self, vector: Sequence[float]) -> Optional[Tuple[Any, float]]:
+        """Return ``(item_id, similarity)`` of the closest vector"""
+        if not self._ids:
+            return None
+        if np is not None:
+            if self._matrix is None:
+                self._matrix = np.asarray(self._vectors, dtype=np.float32)
+            scores = self._matrix @ np.asarray(vector, dtype=np.float32)
+            best = int(scores.argmax())
+            return self._ids[best], float(scores[best])
+        best_index, best_score = 0, -2.0
+        for index, candidate in enumerate(self._vectors):
+            score = sum(a * b for a, b in zip(candidate, vector))
+            if score > best_score:
+                best_index, best_score = index, score
+        return self._ids[best_index], best_score
+
+
+class SemanticCache:
+    """Nearest-neighbour prompt cache with a similarity threshold
+
+    Entries are partitioned by scope (model, parameters and all messages but
+    the last user turn), so an answer is only reused for the same model,
+    settings and conversation context. Only greedy requests (``temperature``
+    0) use the cache unless the caller opts in: for a sampled request, a
+    stored answer to a different prompt would replace a fresh sample.
+
+    Args:
+        embed: Callable mapping text to a vector; defaults to ``HashingEmbedder``
+        threshold: Minimum cosine similarity to count as a hit
+        max_entries: Oldest entries are evicted beyond this size
+        ttl: Seconds an answer may be reused (``None`` for no expiry)
+        audit_rate: Fraction of hits that are re-asked upstream to measure
+            false positives
+        answers_agree: ``(cached, fresh) -> bool`` used by audits; defaults to
+            comparing the answers' embeddings with ``audit_threshold``
+    """
+
+    def __init__(self, embed: Optional[Callable[[str], Sequence[float]]] = None,
+                 threshold: float = 0.92, max_entries: int = 2000, ttl: Optional[float] = None,
+                 audit_rate: float = 0.0, audit_threshold: float = 0.8,
+                 answers_agree: Optional[Callable[[str, str], bool]] = None):
+        self.embed = embed or HashingEmbedder()
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.audit_rate = audit_rate
+        self.audit_threshold = audit_threshold
+        self.answers_agree = answers_agree or self._embeddings_agree
+        self._lock = threading.Lock()
+        self._indexes = {}
+        self._entries = OrderedDict()
+        self._next_id = 0
+        self._rng = random.Random()
+
+        self.lookups = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.expired = 0
+        self.audits = 0
+        self.false_positives = 0
+        self._hit_similarity_total = 0.0
+
+    @staticmethod
+    def should_cache(payload: Dict[str, Any], opt_in: Optional[bool] = None) -> bool:
+        """Greedy payloads, or any payload when the caller passes ``cache=True``"""
+        if opt_in is not None:
+            return opt_in
+        return payload.get("temperature", 1.0) == 0
+
+    @staticmethod
+    def split_payload(payload: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """Return ``(scope, prompt)`` for a cacheable payload, else None"""
+        messages = payload.get("messages") or []
+        if payload.get("stream") or not messages or messages[-1].get("role") != "user":
+            return None
+        prompt = messages[-1].get("content")
+        if not isinstance(prompt, str):
+            return None
+        scope = dict(payload)
+        scope["messages"] = messages[:-1]
+        return canonical_json(scope), prompt
+
+    def _vector(self, text: str) -> List[float]:
+        return normalize(self.embed(text))
+
+    def lookup(self, scope: str, prompt: str) -> Optional[Dict[str, Any]]:
+        """Return ``{"response", "similarity", "prompt"}`` for the best match above the threshold"""
+        vector = self._vector(prompt)
+        now = time.time()
+        with self._lock:
+            self.lookups += 1
+            if self.ttl is not None:
+                # An expired nearest neighbour must not hide a valid runner-up
+                self._remove_expired(scope, now - self.ttl)
+            index = self._indexes.get(scope)
+            match = index.nearest(vector) if index else None
+            if match is not None:
+                entry_id, similarity = match
+                entry = self._entries[entry_id]
+                if similarity >= self.threshold:
+                    self.hits += 1
+                    self._hit_similarity_total += similarity
+                    self._entries.move_to_end(entry_id)
+                    return {"response": entry["response"], "similarity": similarity,
+                            "prompt": entry["prompt"]}
+            self.misses += 1
+            return None
+
+    def store(self, scope: str, prompt: str, response: Dict[str, Any]):
+        vector = self._vector(prompt)
+        with self._lock:
+            self._next_id += 1
+            entry_id = self._next_id
+            self._entries[entry_id] = {"scope": scope, "prompt": prompt,
+                                       "response": response, "stored": time.time()}
+            self._indexes.setdefault(scope, VectorIndex()).add(entry_id, vector)
+            self.stores += 1
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove_expired(self, scope: str, stored_before: float):
+        index = self._indexes.get(scope)
+        if index is None:
+            return
+        for entry_id in [entry_id for entry_id in index.ids() if self._entries[entry_id]["stored"] < stored_before]:
+            self._remove(entry_id)
+            self.expired += 1
+
+    def _remove(self, entry_id: int):
+        entry = self._entries.pop(entry_id)
+        index = self._indexes[entry["scope"]]
+        index.remove(entry_id)
+        if not len(index):
+            del self._indexes[entry["scope"]]
+
+    def should_audit(self) -> bool:
+        return self.audit_rate > 0 and self._rng.random() < self.audit_rate
+
+    def _embeddings_agree(self, cached: str, fresh: str) -> bool:
+        a, b = self._vector(cached), self._vector(fresh)
+        return sum(x * y for x, y in zip(a, b)) >= self.audit_threshold
+
+    def record_audit(self, cached_answer: str, fresh_answer: str) -> bool:
+        """Compare a served answer with a fresh one; returns True if they agree"""
+        agree = self.answers_agree(cached_answer, fresh_answer)
+        with self._lock:
+            self.audits += 1
+            if not agree:
+                self.false_positives += 1
+        return agree
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "threshold": self.threshold,
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / self.lookups, 4) if self.lookups else None,
+                "mean_hit_similarity": round(self._hit_similarity_total / self.hits, 4) if self.hits else None,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "expired": self.expired,
+                "audits": self.audits,
+                "false_positives": self.false_positives,
+                "false_positive_rate": round(self.false_positives / self.audits, 4) if self.audits else None
+            }
@@ -0,0 +1,132 @@
+"""
+🛬 Single-Flight Requests
+Identical concurrent requests share one upstream call and its response
+"""
+
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .cache import CACHE_MODES, is_deterministic
+from .errors import CoalescedWaitTimeout
+
+# Threads for leaders that wait with a timeout, when no client has sized them
+DEFAULT_MAX_WORKERS = 32
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one
+
+    The first caller for a key runs the call on its own thread; later
+    callers wait for that result with their own timeout instead of sending
+    a request. A first caller with a timeout hands the call to a shared,
+    bounded pool and waits like the others. Giving up does not cancel the
+    shared call, which still completes for the others. When anyone joined,
+    each caller gets its own deep copy of the result. Nothing is kept once
+    the call finishes, so this is not a cache.
+
+    Args:
+        mode: Which payloads may share a call, as for ``ResponseCache``:
+            ``deterministic`` (temperature 0 or a fixed seed), ``always``
+            (every non-streamed payload) or ``off``
+        max_workers: Threads running calls for first callers with a timeout
+    """
+
+    def __init__(self, mode: str = "deterministic", max_workers: int = DEFAULT_MAX_WORKERS):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"mode must be one of {CACHE_MODES}")
+        self.mode = mode
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self.max_waiters = 0
+
+    def should_coalesce(self, payload: Dict[str, Any], opt_in: Optional[bool] = None) -> bool:
+        if opt_in is False or self.mode == "off" or payload.get("stream"):
+            return False
+        if opt_in or self.mode == "always":
+            return True
+        return is_deterministic(payload)
+
+    def do(self, key: str, call: Callable[[], Any], timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        """Run ``call`` once per concurrent ``key``; returns ``(result, shared)``
+
+        ``shared`` is True for callers that joined a call another caller
+        started. Errors are raised in every caller that waited on the call.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.calls += 1
+            else:
+                flight.waiters += 1
+                self.coalesced += 1
+                self.max_waiters = max(self.max_waiters, flight.waiters)
+
+        if leader and timeout is None:
+            self._run(key, flight, call)
+            if flight.error is not None:
+                raise flight.error
+            # Nobody else holds this result unless someone joined
+            return (copy.deepcopy(flight.result) if flight.waiters else flight.result), False
+        if leader:
+            self._pool().submit(self._run, key, flight, call)
+
+        if not flight.done.wait(timeout):
+            with self._lock:
+                self.timeouts += 1
+            raise CoalescedWaitTimeout(f"No shared response within {timeout}s")
+        if flight.error is not None:
+            raise flight.error
+        return copy.deepcopy(flight.result), not leader
+
+    def _run(self, key: str, flight: _Flight, call: Callable[[], Any]):
+        try:
+            flight.result = call()
+        except BaseException as e:
+            flight.error = e
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="llm-single-flight")
+            return self._executor
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.calls + self.coalesced
+            return {
+                "mode": self.mode,
+                "in_flight": len(self._flights),
+                "upstream_calls": self.calls,
+                "coalesced": self.coalesced,
+                "coalesced_rate": round(self.coalesced / total, 4) if total else None,
+                "max_waiters": self.max_waiters,
+                "timeouts": self.timeouts
+            }
@@ -0,0 +1,224 @@
+"""
+🌊 Streaming Completions
+Incremental Server-Sent Events parsing for ``stream=true`` chat completions,
+with time-to-first-token and tokens-per-second measurements
+"""
+
+import codecs
+import json
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from .errors import LLMError
+from .json_stream import Event, iter_json
+
+DONE = "[DONE]"
+
+
+class SSEParser:
+    """Incremental Server-Sent Events parser
+
+    Feed raw bytes as they arrive; complete events come out as soon as their
+    terminating blank line has been seen. Lines split across network chunks
+    are buffered until they are complete.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._data = []
+        self._decoder = None
+
+    def feed(self, chunk: Union[bytes, str]) -> List[str]:
+        """Consume a chunk and return the ``data`` payload of every finished event"""
+        if isinstance(chunk, bytes):
+            if self._decoder is None:
+                self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            chunk = self._decoder.decode(chunk)
+        self._buffer += chunk
+
+        events = []
+        while True:
+            newline = self._buffer.find("\n")
+            if newline < 0:
+                break
+            line = self._buffer[:newline].rstrip("\r")
+            self._buffer = self._buffer[newline + 1:]
+            event = self._process_line(line)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def _process_line(self, line: str) -> Optional[str]:
+        if not line:
+            # Blank line dispatches the pending event
+            if not self._data:
+                return None
+            data = "\n".join(self._data)
+            self._data = []
+            return data
+        if line.startswith(":"):
+            return None  # comment / keep-alive
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if field == "data":
+            self._data.append(value)
+        return None
+
+    def flush(self) -> List[str]:
+        """Return an event left unterminated when the stream ended"""
+        events = []
+        if self._buffer:
+            event = self._process_line(self._buffer.rstrip("\r"))
+            self._buffer = ""
+            if event is not None:
+                events.append(event)
+        event = self._process_line("")
+        if event is not None:
+            events.append(event)
+        return events
+
+
+class StreamStats:
+    """Timing and token counts for one streamed completion"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.first_token_at = None
+        self.finished_at = None
+        self.chunks = 0
+        self.deltas = 0
+        self.usage = None
+        self.finish_reason = None
+        self.model = None
+        # True once the stream ended with [DONE]; False if it failed or was cut short
+        self.ok = None
+
+    @property
+    def time_to_first_token(self) -> Optional[float]:
+        return None if self.first_token_at is None else self.first_token_at - self.started
+
+    @property
+    def total_time(self) -> Optional[float]:
+        return None if self.finished_at is None else self.finished_at - self.started
+
+    @property
+    def completion_tokens(self) -> int:
+        """Reported usage when the server sends it, otherwise one token per content delta"""
+        if self.usage and self.usage.get("completion_tokens") is not None:
+            return self.usage["completion_tokens"]
+        return self.deltas
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        """Generation speed after the first token arrived"""
+        if self.first_token_at is None or self.finished_at is None:
+            return None
+        generating = self.finished_at - self.first_token_at
+        if generating <= 0:
+            return None
+        return max(self.completion_tokens - 1, 0) / generating
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "time_to_first_token": self.time_to_first_token,
+            "total_time": self.total_time,
+            "completion_tokens": self.completion_tokens,
+            "tokens_per_second": self.tokens_per_second,
+            "chunks": self.chunks,
+            "finish_reason": self.finish_reason,
+            "ok": self.ok
+        }
+
+
+class ChatStream:
+    """Iterator over the text deltas of a streamed chat completion
+
+    ``text`` holds everything received so far and ``stats`` is complete once
+    the iterator is exhausted or the stream is closed, when
+    ``on_finish(stats)`` is called (once).
+    """
+
+    def __init__(self, response, stats: Optional[StreamStats] = None,
+                 on_finish: Optional[Callable[[StreamStats], None]] = None):
+        self.response = response
+        self.stats = stats or StreamStats()
+        self.on_finish = on_finish
+        self.parser = SSEParser()
+        self._parts = []
+        self._done = False
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def __iter__(self) -> Iterator[str]:
+        try:
+            for chunk in self.response.iter_content(chunk_size=None):
+                for data in self.parser.feed(chunk):
+                    yield from self._handle(data)
+                if self._done:
+                    return
+            for data in self.parser.flush():
+                yield from self._handle(data)
+        finally:
+            self._finish()
+
+    def _finish(self):
+        if self.stats.finished_at is None:
+            self.stats.finished_at = time.perf_counter()
+            self.stats.ok = self._done
+            if self.on_finish is not None:
+                self.on_finish(self.stats)
+        self.response.close()
+
+    def _handle(self, data: str) -> Iterator[str]:
+        if data.strip() == DONE:
+            self._done = True
+            return
+        try:
+            event = json.loads(data)
+        except json.JSONDecodeError:
+            return
+        if not isinstance(event, dict):
+            return
+        if "error" in event:
+            raise LLMError(f"Stream error: {event['error']}", self.response.status_code, data)
+
+        self.stats.chunks += 1
+        self.stats.model = event.get("model", self.stats.model)
+        if event.get("usage"):
+            self.stats.usage = event["usage"]
+        for choice in event.get("choices", []):
+            if choice.get("finish_reason"):
+                self.stats.finish_reason = choice["finish_reason"]
+            delta = choice.get("delta", {}).get("content")
+            if delta:
+                if self.stats.first_token_at is None:
+                    self.stats.first_token_at = time.perf_counter()
+                self.stats.deltas += 1
+                self._parts.append(delta)
+                yield delta
+
+    def json_events(self, max_depth: Optional[int] = 1) -> Iterator[Event]:
+        """Parse the streamed text as JSON and yield ``(path, value)`` as each value closes
+
+        See ``StreamingJSONParser``; the last event is ``((), document)``.
+        """
+        return iter_json(self, max_depth=max_depth)
+
+    def read(self) -> str:
+        """Consume the rest of the stream and return the full text"""
+        for _ in self:
+            pass
+        return self.text
+
+    def close(self):
+        self._finish()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,36 @@
+"""
+🔢 Token Estimation
+Cheap local token counts for budgeting, without a tokenizer dependency
+"""
+
+import math
+from typing import Any, Dict, List
+
+# OpenAI-style chat formats add a few tokens of framing per message
+TOKENS_PER_MESSAGE = 4
+TOKENS_PER_REPLY = 3
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly 4 characters per token for English text, rounded up"""
+    if not text:
+        return 0
+    return math.ceil(len(text) / 4)
+
+
+def estimate_message_tokens(message: Dict[str, Any]) -> int:
+    content = message.get("content") or ""
+    if not isinstance(content, str):
+        # Multi-part content: count the text parts
+        content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return TOKENS_PER_MESSAGE + estimate_tokens(content) + estimate_tokens(message.get("name", ""))
+
+
+def estimate_messages_tokens(messages: List[Dict[str, Any]]) -> int:
+    """Prompt tokens for a whole ``messages`` list"""
+    return sum(estimate_message_tokens(message) for message in messages) + TOKENS_PER_REPLY
+
+
+def estimate_payload_tokens(payload: Dict[str, Any]) -> int:
+    """Prompt estimate plus the completion budget (``max_tokens``)"""
+    return estimate_messages_tokens(payload.get("messages") or []) + int(payload.get("max_tokens") or 0)
@@ -0,0 +1,129 @@
+"""
+✂️ Conversation Trimming
+Keep a growing chat history inside a prompt token budget so every turn does
+not resend the whole session
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from .tokens import TOKENS_PER_REPLY, estimate_message_tokens
+
+TRIM_POLICIES = ("drop_oldest", "sliding_window")
+
+
+class ConversationTrimmer:
+    """Trim ``messages`` to a token budget, keeping system prompts and recent turns
+
+    System messages are always kept. The most recent message is always kept,
+    even if it alone exceeds the budget. A trimmed history never starts with
+    an assistant reply whose question was dropped, and an assistant message
+    with ``tool_calls`` is kept or dropped together with its ``tool`` replies.
+
+    Args:
+        max_tokens: Budget for the prompt (the reply's ``max_tokens`` comes on top)
+        policy: ``drop_oldest`` drops the oldest turns until the rest fits;
+            ``sliding_window`` first keeps only the last ``window`` messages,
+            then applies the budget
+        window: Messages kept by ``sliding_window`` (system messages excluded)
+        estimate: Token estimate for one message
+    """
+
+    def __init__(self, max_tokens: int = 3000, policy: str = "drop_oldest", window: int = 20,
+                 estimate: Optional[Callable[[Dict[str, Any]], int]] = None):
+        if policy not in TRIM_POLICIES:
+            raise ValueError(f"policy must be one of {TRIM_POLICIES}")
+        self.max_tokens = max_tokens
+        self.policy = policy
+        self.window = window
+        self.estimate = estimate or estimate_message_tokens
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.trimmed_calls = 0
+        self.messages_dropped = 0
+        self.tokens_in = 0
+        self.tokens_out = 0
+        self.over_budget = 0
+
+    def trim(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return the messages to send; ``messages`` itself is not modified"""
+        costs = [self.estimate(message) for message in messages]
+        total = sum(costs) + TOKENS_PER_REPLY
+
+        groups = self._tool_groups(messages)
+        pinned = [message.get("role") == "system" for message in messages]
+        turns = [i for i, is_pinned in enumerate(pinned) if not is_pinned]
+        droppable = [i for i in turns if groups[i] is not groups[turns[-1]]] if turns else []
+        keep = [True] * len(messages)
+        kept_total = total
+
+        def drop(index):
+            nonlocal kept_total
+            for member in groups[index]:
+                if keep[member]:
+                    keep[member] = False
+                    kept_total -= costs[member]
+
+        if self.policy == "sliding_window" and self.window > 0:
+            overflow = len(turns) - self.window
+            for index in droppable[:max(0, overflow)]:
+                drop(index)
+        for index in droppable:
+            if kept_total <= self.max_tokens:
+                break
+            if keep[index]:
+                drop(index)
+
+        # Don't open the history with an orphaned assistant reply
+        for index in droppable:
+            if not keep[index]:
+                continue
+            if messages[index].get("role") == "assistant" and index > 0 and not keep[index - 1]:
+                drop(index)
+            break
+
+        trimmed = [message for message, kept in zip(messages, keep) if kept]
+        with self._lock:
+            self.calls += 1
+            self.tokens_in += total
+            self.tokens_out += kept_total
+            if len(trimmed) < len(messages):
+                self.trimmed_calls += 1
+                self.messages_dropped += len(messages) - len(trimmed)
+            if kept_total > self.max_tokens:
+                self.over_budget += 1
+        return trimmed
+
+    @staticmethod
+    def _tool_groups(messages: List[Dict[str, Any]]) -> List[List[int]]:
+        """For every index, the indices that must be dropped along with it
+
+        ``tool`` messages belong to the assistant message with ``tool_calls``
+        they follow; the API rejects either one without the other.
+        """
+        groups = [[index] for index in range(len(messages))]
+        owner = None
+        for index, message in enumerate(messages):
+            role = message.get("role")
+            if role == "assistant" and message.get("tool_calls"):
+                owner = index
+            elif role == "tool" and owner is not None:
+                groups[owner].append(index)
+                groups[index] = groups[owner]
+            elif role != "tool":
+                owner = None
+        return groups
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "policy": self.policy,
+                "max_tokens": self.max_tokens,
+                "calls": self.calls,
+                "trimmed_calls": self.trimmed_calls,
+                "messages_dropped": self.messages_dropped,
+                "estimated_tokens_in": self.tokens_in,
+                "estimated_tokens_sent": self.tokens_out,
+                "estimated_tokens_saved": self.tokens_in - self.tokens_out,
+                "over_budget": self.over_budget
+            }
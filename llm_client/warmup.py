@@ -0,0 +1,139 @@
+"""
+🔥 Connection Warmup
+Resolve endpoint hostnames ahead of time and open pooled connections in
+the background, so the first real request skips DNS, TCP and TLS setup
+"""
+
+import socket
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from urllib3.util import connection as urllib3_connection
+
+
+class DNSCache:
+    """Process-wide cache of resolved addresses for warmed hosts
+
+    Only hosts that were resolved through ``resolve`` (the warmup does this)
+    are served from the cache; every other host uses normal DNS. Stale
+    entries are re-resolved on next use and an entry whose addresses all
+    refuse connections is dropped.
+
+    Args:
+        ttl: Seconds an answer is reused
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.lookups = 0
+
+    def resolve(self, host: str, port: int) -> List[str]:
+        """Resolve now and remember the addresses"""
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        with self._lock:
+            self.lookups += 1
+            self._entries[(host, port)] = (time.monotonic() + self.ttl, addresses)
+        return addresses
+
+    def addresses(self, host: str, port: int) -> Optional[List[str]]:
+        """Cached addresses, re-resolved when stale; None for hosts never warmed"""
+        with self._lock:
+            entry = self._entries.get((host, port))
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+        if entry is None:
+            return None
+        try:
+            return self.resolve(host, port)
+        except OSError:
+            self.invalidate(host, port)
+            return None
+
+    def invalidate(self, host: str, port: int):
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+    def create_connection(self, conn) -> Optional[socket.socket]:
+        """Connect a urllib3 connection through cached addresses; None falls back to normal DNS"""
+        host, port = conn.host, conn.port
+        addresses = self.addresses(host, port)
+        if not addresses:
+            return None
+        for address in addresses:
+            try:
+                return urllib3_connection.create_connection(
+                    (address, port), conn.timeout,
+                    source_address=conn.source_address,
+                    socket_options=conn.socket_options)
+            except OSError:
+                continue
+        self.invalidate(host, port)
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"hosts": len(self._entries), "lookups": self.lookups, "hits": self.hits}
+
+
+DNS_CACHE = DNSCache()
+
+
+def _origin(url: str) -> Tuple[str, str, int]:
+    parts = urlsplit(url)
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    return parts.scheme, parts.hostname, port
+
+
+def _pool_for(adapter, url: str, verify: Any, cert: Any):
+    """The urllib3 pool ``requests`` will use for ``url`` (pools are keyed by TLS settings too)"""
+    if hasattr(adapter, "get_connection_with_tls_context"):
+        return adapter.get_connection_with_tls_context(requests.Request("GET", url).prepare(),
+                                                       verify=verify, cert=cert)
+    return adapter.get_connection(url)
+
+
+def warm_up(adapter, urls: Iterable[str], connections: int = 2, verify: Any = True, cert: Any = None,
+            dns_cache: DNSCache = DNS_CACHE) -> Dict[str, Dict[str, Any]]:
+    """Resolve each URL's host and park ``connections`` open connections in the adapter's pool
+
+    Failures are recorded per origin, never raised: warmup only ever saves time.
+    """
+    results = {}
+    for url in dict.fromkeys(urls):
+        scheme, host, port = _origin(url)
+        origin = f"{scheme}://{host}:{port}"
+        if origin in results:
+            continue
+        result = results[origin] = {"connections": 0}
+        started = time.perf_counter()
+        try:
+            result["addresses"] = dns_cache.resolve(host, port)
+            result["dns_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+            # Take connections out of the urllib3 pool, connect them (TCP plus
+            # TLS), and put them back so requests find them ready
+            pool = _pool_for(adapter, url, verify, cert)
+            opened = []
+            started = time.perf_counter()
+            try:
+                for _ in range(min(connections, pool.pool.maxsize)):
+                    conn = pool._get_conn()
+                    opened.append(conn)
+                    if conn.sock is None:
+                        conn.connect()
+            finally:
+                for conn in opened:
+                    pool._put_conn(conn)
+            result["connections"] = len(opened)
+            result["connect_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+    return results
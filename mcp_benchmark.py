@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+📈 MCP Server Benchmark
+Drives working_mcp_server.py with a configurable request mix and reports
+throughput, latency percentiles and CPU use as JSON
+
+Examples:
+    python3 mcp_benchmark.py --clients 8 --duration 10
+    python3 mcp_benchmark.py --arrival open --rate 2000 --transport loopback
+    python3 mcp_benchmark.py --mix "tools/list=1,calculate=4" --output before.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from mcp_transport import LoopbackTransport, StdioTransport, TrafficRecorder
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "working_mcp_server.py")
+
+DEFAULT_MIX = {
+    "tools/list": 1,
+    "hello_world": 3,
+    "calculate": 3,
+    "get_current_time": 1
+}
+
+CALCULATE_EXPRESSIONS = ["2 + 2", "10 * 5", "100 / 4", "15 * 8 + 3", "(10 + 5) * 2"]
+HELLO_NAMES = ["Alice", "Bob", "Workshop Participant", "MCP User"]
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parse a mix such as ``"tools/list=1,calculate=4"`` into weights"""
+    mix = {}
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown operation in mix: {name}")
+        mix[name] = float(weight) if weight else 1.0
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("Mix must contain at least one operation with a positive weight")
+    return mix
+
+
+def build_request(operation: str, request_id: int, rng: random.Random) -> Dict[str, Any]:
+    """Build the JSON-RPC request for one operation from the mix"""
+    if operation == "tools/list":
+        return {"jsonrpc": "2.0", "id": request_id, "method": "tools/list"}
+
+    if operation == "hello_world":
+        arguments = {"name": rng.choice(HELLO_NAMES)}
+    elif operation == "calculate":
+        arguments = {"expression": rng.choice(CALCULATE_EXPRESSIONS)}
+    else:
+        arguments = {}
+
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tools/call",
+        "params": {"name": operation, "arguments": arguments}
+    }
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize_latencies(latencies: List[float]) -> Dict[str, Any]:
+    """Latency summary in milliseconds"""
+    values = sorted(latencies)
+    result = {"count": len(values)}
+    if not values:
+        return result
+    result.update({
+        "mean_ms": round(sum(values) / len(values) * 1000, 4),
+        "p50_ms": round(percentile(values, 50) * 1000, 4),
+        "p95_ms": round(percentile(values, 95) * 1000, 4),
+        "p99_ms": round(percentile(values, 99) * 1000, 4),
+        "max_ms": round(values[-1] * 1000, 4)
+    })
+    return result
+
+
+def cpu_times() -> Dict[str, float]:
+    """CPU seconds used by this process and by its reaped children"""
+    times = os.times()
+    return {
+        "client": times.user + times.system,
+        "server": times.children_user + times.children_system
+    }
+
+
+class MCPBenchmark:
+    """Load generator for MCP servers"""
+
+    def __init__(self, clients: int = 4, duration: float = 10.0, warmup: float = 1.0,
+                 arrival: str = "closed", rate: float = 1000.0,
+                 mix: Optional[Dict[str, float]] = None, transport: str = "stdio",
+                 max_outstanding: int = 10000, seed: int = 42,
+                 recorder: Optional[TrafficRecorder] = None):
+        if arrival not in ("open", "closed"):
+            raise ValueError("arrival must be 'open' or 'closed'")
+        if transport not in ("stdio", "loopback"):
+            raise ValueError("transport must be 'stdio' or 'loopback'")
+        self.clients = clients
+        self.duration = duration
+        self.warmup = warmup
+        self.arrival = arrival
+        self.rate = rate
+        self.mix = dict(mix or DEFAULT_MIX)
+        self.transport = transport
+        self.max_outstanding = max_outstanding
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.recorder = recorder
+
+        self._operations = list(self.mix)
+        self._weights = [self.mix[name] for name in self._operations]
+        self._next_id = 0
+        self._recording = False
+        self._latencies = {name: [] for name in self._operations}
+        self._errors = {name: 0 for name in self._operations}
+        self._outstanding = 0
+        self._shed = 0
+
+    def _make_transport(self):
+        if self.transport == "loopback":
+            from working_mcp_server import SimpleMCPServer
+            transport = LoopbackTransport(SimpleMCPServer())
+        else:
+            transport = StdioTransport([sys.executable, SERVER_SCRIPT])
+        return self.recorder.tap(transport) if self.recorder else transport
+
+    async def _call(self, transport, operation: str, started: float):
+        """Issue one request; ``started`` is when it was meant to be sent"""
+        self._next_id += 1
+        request = build_request(operation, self._next_id, self.rng)
+        response = await transport.request(request)
+        elapsed = time.perf_counter() - started
+        if not self._recording:
+            return
+        if response is None or "error" in response:
+            self._errors[operation] += 1
+        else:
+            self._latencies[operation].append(elapsed)
+
+    def _pick_operation(self) -> str:
+        return self.rng.choices(self._operations, weights=self._weights)[0]
+
+    async def _closed_loop_client(self, transport, deadline: float):
+        while time.perf_counter() < deadline:
+            await self._call(transport, self._pick_operation(), time.perf_counter())
+
+    async def _open_loop_request(self, transport, operation: str, scheduled: float):
+        try:
+            await self._call(transport, operation, scheduled)
+        finally:
+            self._outstanding -= 1
+
+    async def _open_loop_generator(self, transports: List[Any], deadline: float):
+        """Poisson arrivals at ``rate`` req/s, spread round-robin over clients
+
+        Latency is measured from the scheduled arrival time, so queueing
+        behind a slow server shows up instead of being hidden.
+        """
+        pending = set()
+        next_arrival = time.perf_counter()
+        index = 0
+        while next_arrival < deadline:
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self._outstanding >= self.max_outstanding:
+                if self._recording:
+                    self._shed += 1
+            else:
+                self._outstanding += 1
+                transport = transports[index % len(transports)]
+                index += 1
+                task = asyncio.create_task(
+                    self._open_loop_request(transport, self._pick_operation(), next_arrival))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            next_arrival += self.rng.expovariate(self.rate)
+        if pending:
+            await asyncio.gather(*pending)
+
+    async def _drive(self, transports: List[Any], seconds: float):
+        deadline = time.perf_counter() + seconds
+        if self.arrival == "closed":
+            await asyncio.gather(*(self._closed_loop_client(t, deadline) for t in transports))
+        else:
+            await self._open_loop_generator(transports, deadline)
+
+    async def run(self) -> Dict[str, Any]:
+        """Run warmup and measurement phases and return the JSON report"""
+        transports = [self._make_transport() for _ in range(self.clients)]
+        cpu_before = cpu_times()
+        try:
+            for transport in transports:
+                await transport.start()
+                await transport.request({
+                    "jsonrpc": "2.0", "id": 0, "method": "initialize",
+                    "params": {"protocolVersion": "2024-11-05", "capabilities": {},
+                               "clientInfo": {"name": "mcp-benchmark", "version": "1.0.0"}}
+                })
+
+            if self.warmup > 0:
+                await self._drive(transports, self.warmup)
+
+            self._recording = True
+            cpu_start = cpu_times()
+            wall_start = time.perf_counter()
+            await self._drive(transports, self.duration)
+            wall = time.perf_counter() - wall_start
+            cpu_client = cpu_times()["client"] - cpu_start["client"]
+            self._recording = False
+        finally:
+            for transport in transports:
+                await transport.close()
+
+        # Server CPU is only visible once the child processes have been reaped
+        cpu_server = cpu_times()["server"] - cpu_before["server"]
+        return self.report(wall, cpu_client, cpu_server)
+
+    def report(self, wall: float, cpu_client: float, cpu_server: float) -> Dict[str, Any]:
+        all_latencies = [value for values in self._latencies.values() for value in values]
+        completed = len(all_latencies)
+        errors = sum(self._errors.values())
+
+        operations = {}
+        for name in self._operations:
+            operations[name] = summarize_latencies(self._latencies[name])
+            operations[name]["errors"] = self._errors[name]
+
+        cpu = {
+            "client_seconds": round(cpu_client, 4),
+            "client_percent": round(cpu_client / wall * 100, 2) if wall else None
+        }
+        if self.transport == "stdio":
+            # Includes warmup: child CPU is only reported for the whole lifetime
+            cpu["server_seconds"] = round(cpu_server, 4)
+
+        return {
+            "config": {
+                "transport": self.transport,
+                "arrival": self.arrival,
+                "rate": self.rate if self.arrival == "open" else None,
+                "clients": self.clients,
+                "duration": self.duration,
+                "warmup": self.warmup,
+                "mix": self.mix,
+                "seed": self.seed
+            },
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform()
+            },
+            "results": {
+                "wall_seconds": round(wall, 4),
+                "completed": completed,
+                "errors": errors,
+                "shed": self._shed,
+                "throughput_rps": round(completed / wall, 2) if wall else None,
+                "latency": summarize_latencies(all_latencies),
+                "operations": operations,
+                "cpu": cpu
+            }
+        }
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark the workshop MCP server")
+    parser.add_argument("--clients", type=int, default=4, help="Concurrent clients (one connection each)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Unmeasured seconds before the run")
+    parser.add_argument("--arrival", choices=["closed", "open"], default="closed",
+                        help="closed: send the next request after each response; open: Poisson arrivals")
+    parser.add_argument("--rate", type=float, default=1000.0, help="Target req/s for open-loop arrival")
+    parser.add_argument("--mix", type=str, default=None,
+                        help="Operation weights, e.g. 'tools/list=1,hello_world=3,calculate=3,get_current_time=1'")
+    parser.add_argument("--transport", choices=["stdio", "loopback"], default="stdio")
+    parser.add_argument("--max-outstanding", type=int, default=10000,
+                        help="Open-loop cap on in-flight requests; arrivals above it are shed")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=str, default=None, help="Write the JSON report to this file")
+    parser.add_argument("--record", type=str, default=None, help="Record all traffic to this file for mcp_replay.py")
+    args = parser.parse_args()
+
+    recorder = TrafficRecorder(args.record) if args.record else None
+
+    benchmark = MCPBenchmark(
+        clients=args.clients,
+        duration=args.duration,
+        warmup=args.warmup,
+        arrival=args.arrival,
+        rate=args.rate,
+        mix=parse_mix(args.mix) if args.mix else None,
+        transport=args.transport,
+        max_outstanding=args.max_outstanding,
+        seed=args.seed,
+        recorder=recorder
+    )
+    try:
+        report = asyncio.run(benchmark.run())
+    finally:
+        if recorder:
+            recorder.close()
+    text = json.dumps(report, indent=2, sort_keys=True)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+        print(f"📈 Report written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
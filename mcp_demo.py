@@ -3,19 +3,39 @@
 🎯 MCP Server Demo - Practical Usage Examples
 """
 
+import argparse
 import asyncio
 import subprocess
 import json
 import sys
 
+from mcp_transport import (CLIENT_TO_SERVER, SERVER_TO_CLIENT, LoopbackTransport,
+                           TrafficRecorder, drain_stderr)
+
 class MCPDemo:
     """MCP Server Demo Class"""
     
-    def __init__(self):
+    def __init__(self, loopback: bool = False, record_path: str = None):
         self.process = None
+        self.stderr_drain = None
+        self.loopback = loopback
+        self.transport = None
+        self.recorder = TrafficRecorder(record_path) if record_path else None
+        self.record_session = self.recorder.new_session() if self.recorder else None
     
     async def start_server(self):
         """Start the MCP server"""
+        if self.loopback:
+            # Same protocol, but the server runs in this event loop
+            from working_mcp_server import SimpleMCPServer
+            print("🚀 Starting MCP Server (in-process loopback)...")
+            self.transport = LoopbackTransport(SimpleMCPServer())
+            if self.recorder:
+                self.transport = self.recorder.tap(self.transport)
+            await self.transport.start()
+            print("✅ MCP Server started successfully!")
+            return
+        
         print("🚀 Starting MCP Server...")
         self.process = subprocess.Popen(
             ['python3', 'working_mcp_server.py'],
@@ -24,16 +44,26 @@ class MCPDemo:
             stderr=subprocess.PIPE,
             text=True
         )
+        # Keep reading server logs so a full stderr pipe can't stall requests
+        self.stderr_drain = drain_stderr(self.process)
         await asyncio.sleep(1)  # Wait for server to start
         print("✅ MCP Server started successfully!")
     
     async def send_request(self, request):
         """Send a request to the MCP server"""
-        self.process.stdin.write(json.dumps(request) + "\n")
+        if self.transport:
+            return await self.transport.request(request)
+        
+        request_line = json.dumps(request)
+        if self.recorder:
+            self.recorder.record(self.record_session, CLIENT_TO_SERVER, request_line)
+        self.process.stdin.write(request_line + "\n")
         self.process.stdin.flush()
         
         response_line = self.process.stdout.readline()
         if response_line:
+            if self.recorder:
+                self.recorder.record(self.record_session, SERVER_TO_CLIENT, response_line)
             return json.loads(response_line.strip())
         return None
     
@@ -203,11 +233,22 @@ class MCPDemo:
     
     async def stop_server(self):
         """Stop the MCP server"""
+        if self.transport:
+            await self.transport.close()
+            print("\n✅ MCP Server stopped")
         if self.process:
             print("\n🛑 Stopping MCP Server...")
             self.process.terminate()
             self.process.wait()
             print("✅ MCP Server stopped")
+        if self.stderr_drain:
+            self.stderr_drain.join(timeout=1)
+            stats = self.stderr_drain.stats()
+            print(f"📜 Server log: {stats['lines_total']} lines "
+                  f"({stats['lines_dropped']} dropped from buffer)")
+        if self.recorder:
+            self.recorder.close()
+            print(f"📼 Recorded {self.recorder.messages_recorded} messages to {self.recorder.path}")
     
     async def run_demo(self):
         """Run the complete demo"""
@@ -244,7 +285,12 @@ class MCPDemo:
 
 async def main():
     """Main entry point"""
-    demo = MCPDemo()
+    parser = argparse.ArgumentParser(description="MCP server demo")
+    parser.add_argument("--loopback", action="store_true", help="Run the server in-process instead of as a subprocess")
+    parser.add_argument("--record", metavar="PATH", help="Record all JSON-RPC traffic to PATH for mcp_replay.py")
+    args = parser.parse_args()
+    
+    demo = MCPDemo(loopback=args.loopback, record_path=args.record)
     await demo.run_demo()
 
 if __name__ == "__main__":
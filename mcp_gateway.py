@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+🌉 MCP Gateway
+One MCP endpoint in front of several tool servers: a merged, namespaced tool
+catalog, pooled upstream connections, shared result caching, concurrency
+limits and per-upstream latency stats
+
+Examples:
+    python3 mcp_gateway.py
+    python3 mcp_gateway.py --upstream workshop="python3 working_mcp_server.py" \\
+                           --upstream demo="python3 basic_workshop/notebooks/workshop_mcp_server.py"
+"""
+
+import argparse
+import asyncio
+import json
+import shlex
+import sys
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from mcp_benchmark import SERVER_SCRIPT, summarize_latencies
+from mcp_transport import LineTransport, StdioTransport
+
+# Tool results that must never be served from the cache
+DEFAULT_UNCACHEABLE_TOOLS = {"get_current_time"}
+
+
+class TTLCache:
+    """Small LRU cache whose entries also expire after ``ttl`` seconds"""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, value):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None
+        }
+
+
+class Upstream:
+    """Pool of connections to one tool server"""
+
+    def __init__(self, name: str, transport_factory: Callable[[], LineTransport],
+                 pool_size: int = 2, latency_window: int = 2048):
+        self.name = name
+        self.transport_factory = transport_factory
+        self.pool_size = pool_size
+        self._idle = asyncio.Queue()
+        self._connections = []
+        self._next_id = 0
+        self.latencies = deque(maxlen=latency_window)
+        self.calls = 0
+        self.errors = 0
+        self.reconnects = 0
+
+    async def _connect(self) -> LineTransport:
+        transport = await self.transport_factory().start()
+        self._next_id += 1
+        try:
+            response = await transport.request({
+                "jsonrpc": "2.0", "id": self._next_id, "method": "initialize",
+                "params": {"protocolVersion": "2024-11-05", "capabilities": {},
+                           "clientInfo": {"name": "mcp-gateway", "version": "1.0.0"}}
+            })
+            if response is None:
+                raise ConnectionError(f"Upstream '{self.name}' closed the connection during initialize")
+        except BaseException:
+            await transport.close()
+            raise
+        self._connections.append(transport)
+        return transport
+
+    async def start(self):
+        for _ in range(self.pool_size):
+            self._idle.put_nowait(await self._connect())
+
+    async def request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Forward one request over an idle pooled connection
+
+        A connection that fails or is interrupted mid-request is closed and
+        its pool slot is left empty (``None``); the next caller to take that
+        slot reconnects, and gets ``ConnectionError`` if that fails, so the
+        pool never shrinks and callers never wait on a slot that is gone.
+        """
+        transport = await self._idle.get()
+        healthy = False
+        try:
+            if transport is None:
+                self.reconnects += 1
+                try:
+                    transport = await self._connect()
+                except Exception as e:
+                    self.errors += 1
+                    raise ConnectionError(f"Upstream '{self.name}' is unreachable: {e}") from e
+
+            self._next_id += 1
+            message = {"jsonrpc": "2.0", "id": self._next_id, "method": method}
+            if params is not None:
+                message["params"] = params
+
+            started = time.perf_counter()
+            self.calls += 1
+            try:
+                response = await transport.request(message)
+            except Exception:
+                response = None
+            if response is None:
+                self.errors += 1
+                raise ConnectionError(f"Upstream '{self.name}' closed the connection")
+
+            healthy = True
+            self.latencies.append(time.perf_counter() - started)
+            if "error" in response:
+                self.errors += 1
+            return response
+        finally:
+            self._idle.put_nowait(transport if healthy else None)
+            if not healthy and transport is not None:
+                # Its stream may still hold the reply to the interrupted request
+                self._connections.remove(transport)
+                await transport.close()
+
+    async def close(self):
+        for transport in self._connections:
+            await transport.close()
+        self._connections.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pool_size": self.pool_size,
+            "calls": self.calls,
+            "errors": self.errors,
+            "reconnects": self.reconnects,
+            "latency": summarize_latencies(list(self.latencies))
+        }
+
+
+class MCPGateway:
+    """Aggregating MCP server that proxies to several upstream servers
+
+    Tools are exposed as ``<upstream><separator><tool>``. The gateway speaks
+    the same newline-delimited JSON-RPC as ``SimpleMCPServer``, so it can run
+    over stdio or sit behind a ``LoopbackTransport``.
+    """
+
+    def __init__(self, upstreams: Dict[str, Callable[[], LineTransport]], pool_size: int = 2,
+                 max_concurrency: int = 64, cache_ttl: float = 30.0, cache_size: int = 1024,
+                 uncacheable_tools=None, separator: str = "__"):
+        self.upstreams = {name: Upstream(name, factory, pool_size) for name, factory in upstreams.items()}
+        self.separator = separator
+        self.cache = TTLCache(max_entries=cache_size, ttl=cache_ttl) if cache_ttl > 0 else None
+        self.uncacheable_tools = set(DEFAULT_UNCACHEABLE_TOOLS if uncacheable_tools is None else uncacheable_tools)
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
+        self._catalog = None
+        self._started = False
+        self._start_lock = None
+        self.requests_total = 0
+
+    async def start(self):
+        """Connect to every upstream and build the merged catalog"""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._started:
+                return
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            await asyncio.gather(*(upstream.start() for upstream in self.upstreams.values()))
+            await self.refresh_catalog()
+            self._started = True
+
+    async def close(self):
+        for upstream in self.upstreams.values():
+            await upstream.close()
+        self._started = False
+
+    async def refresh_catalog(self) -> List[Dict[str, Any]]:
+        """Fetch ``tools/list`` from every upstream and merge it under namespaced names"""
+        responses = await asyncio.gather(*(upstream.request("tools/list") for upstream in self.upstreams.values()))
+        catalog = []
+        for upstream, response in zip(self.upstreams.values(), responses):
+            for tool in response.get("result", {}).get("tools", []):
+                entry = dict(tool)
+                entry["name"] = f"{upstream.name}{self.separator}{tool['name']}"
+                entry["description"] = f"[{upstream.name}] {tool.get('description', '')}"
+                catalog.append(entry)
+        self._catalog = catalog
+        if self.cache:
+            self.cache.clear()
+        return catalog
+
+    def _route(self, tool_name: str) -> Tuple[Optional[Upstream], str]:
+        upstream_name, _, upstream_tool = (tool_name or "").partition(self.separator)
+        return self.upstreams.get(upstream_name), upstream_tool
+
+    async def _call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the upstream ``result`` object for a namespaced tool call"""
+        upstream, upstream_tool = self._route(tool_name)
+        if upstream is None or not upstream_tool:
+            return {"content": [{"type": "text", "text": f"❌ Unknown tool: {tool_name}"}]}
+
+        cache_key = None
+        if self.cache and upstream_tool not in self.uncacheable_tools:
+            cache_key = (upstream.name, upstream_tool, json.dumps(arguments, sort_keys=True))
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        async with self._semaphore:
+            response = await upstream.request("tools/call", {"name": upstream_tool, "arguments": arguments})
+        if "error" in response:
+            raise RuntimeError(response["error"].get("message", "Upstream error"))
+
+        result = response.get("result", {})
+        if cache_key is not None:
+            self.cache.put(cache_key, result)
+        return result
+
+    async def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle incoming MCP requests"""
+        await self.start()
+        self.requests_total += 1
+        method = request.get("method")
+        request_id = request.get("id")
+
+        if method == "initialize":
+            result = {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {"tools": {}},
+                "serverInfo": {"name": "workshop-mcp-gateway", "version": "1.0.0"}
+            }
+        elif method == "tools/list":
+            result = {"tools": self._catalog}
+        elif method == "tools/call":
+            params = request.get("params", {})
+            try:
+                result = await self._call_tool(params.get("name"), params.get("arguments", {}))
+            except Exception as e:
+                return {"jsonrpc": "2.0", "id": request_id,
+                        "error": {"code": -32603, "message": f"Upstream error: {e}"}}
+        elif method == "gateway/stats":
+            result = self.stats()
+        else:
+            return {"jsonrpc": "2.0", "id": request_id,
+                    "error": {"code": -32601, "message": f"Method not found: {method}"}}
+
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    async def handle_line(self, line: str) -> Optional[str]:
+        """Handle one newline-delimited JSON-RPC message, like ``SimpleMCPServer``"""
+        try:
+            request = json.loads(line.strip())
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(request, dict):
+            return None
+
+        response = await self.handle_request(request)
+        return json.dumps(response)
+
+    def stats(self) -> Dict[str, Any]:
+        """Gateway counters plus latency percentiles for each upstream"""
+        return {
+            "requests_total": self.requests_total,
+            "tools": len(self._catalog or []),
+            "cache": self.cache.stats() if self.cache else None,
+            "upstreams": {name: upstream.stats() for name, upstream in self.upstreams.items()}
+        }
+
+    async def run(self):
+        """Serve over stdio, handling requests concurrently
+
+        Responses are written as soon as they are ready; clients match them
+        to requests by JSON-RPC id.
+        """
+        print("🌉 Starting MCP Gateway...", file=sys.stderr)
+        await self.start()
+        print(f"📋 {len(self._catalog)} tools from {len(self.upstreams)} upstreams:", file=sys.stderr)
+        for tool in self._catalog:
+            print(f"   - {tool['name']}", file=sys.stderr)
+        print("🔌 Gateway ready for connections!", file=sys.stderr)
+
+        loop = asyncio.get_event_loop()
+        pending = set()
+
+        async def respond(line):
+            try:
+                response_line = await self.handle_line(line)
+                if response_line is not None:
+                    print(response_line)
+                    sys.stdout.flush()
+            except Exception as e:
+                print(f"Error: {e}", file=sys.stderr)
+
+        try:
+            while True:
+                line = await loop.run_in_executor(None, sys.stdin.readline)
+                if not line:
+                    break
+                task = asyncio.create_task(respond(line))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+        finally:
+            print(f"📊 Gateway stats: {json.dumps(self.stats())}", file=sys.stderr)
+            await self.close()
+
+
+def parse_upstream(text: str) -> Tuple[str, List[str]]:
+    """Parse ``name=command args`` into a name and an argv list"""
+    name, sep, command = text.partition("=")
+    if not sep or not name.strip() or not command.strip():
+        raise ValueError(f"Upstream must look like name=command, got: {text}")
+    return name.strip(), shlex.split(command)
+
+
+def stdio_factory(command: List[str]) -> Callable[[], LineTransport]:
+    return lambda: StdioTransport(command)
+
+
+async def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Aggregate several MCP servers behind one endpoint")
+    parser.add_argument("--upstream", action="append", default=[],
+                        help="name=command for one upstream server (repeatable)")
+    parser.add_argument("--pool-size", type=int, default=2, help="Connections kept open per upstream")
+    parser.add_argument("--max-concurrency", type=int, default=64, help="Tool calls in flight across all upstreams")
+    parser.add_argument("--cache-ttl", type=float, default=30.0, help="Seconds to cache tool results (0 disables)")
+    parser.add_argument("--cache-size", type=int, default=1024, help="Maximum cached tool results")
+    args = parser.parse_args()
+
+    upstream_specs = [parse_upstream(text) for text in args.upstream] or [
+        ("workshop", [sys.executable, SERVER_SCRIPT])
+    ]
+    gateway = MCPGateway(
+        {name: stdio_factory(command) for name, command in upstream_specs},
+        pool_size=args.pool_size,
+        max_concurrency=args.max_concurrency,
+        cache_ttl=args.cache_ttl,
+        cache_size=args.cache_size
+    )
+    await gateway.run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+📼 MCP Traffic Replayer
+Plays a recording made with mcp_transport.TrafficRecorder back against a
+server and checks that every response matches the recorded one
+
+Examples:
+    python3 mcp_demo.py --record session.mcplog
+    python3 mcp_replay.py session.mcplog                # original timing
+    python3 mcp_replay.py session.mcplog --speed 10     # 10x faster
+    python3 mcp_replay.py session.mcplog --speed max --transport loopback
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from mcp_benchmark import SERVER_SCRIPT, summarize_latencies
+from mcp_transport import (CLIENT_TO_SERVER, SERVER_TO_CLIENT, LoopbackTransport,
+                           StdioTransport, read_recording)
+
+# Tools whose output legitimately changes between runs
+VOLATILE_TOOLS = {"get_current_time"}
+
+
+def _is_volatile(request: Any) -> bool:
+    return (isinstance(request, dict)
+            and request.get("method") == "tools/call"
+            and request.get("params", {}).get("name") in VOLATILE_TOOLS)
+
+
+def responses_match(expected: Any, actual: Any, request: Any = None, strict: bool = False) -> bool:
+    """Compare a replayed response with the recorded one
+
+    Unless ``strict`` is set, responses to volatile tools only need the same
+    id and the same shape of content, not the same text.
+    """
+    if expected == actual:
+        return True
+    if strict or not _is_volatile(request):
+        return False
+    if not isinstance(expected, dict) or not isinstance(actual, dict):
+        return False
+    if expected.get("id") != actual.get("id") or ("error" in expected) != ("error" in actual):
+        return False
+    expected_content = expected.get("result", {}).get("content", [])
+    actual_content = actual.get("result", {}).get("content", [])
+    return [item.get("type") for item in expected_content] == [item.get("type") for item in actual_content]
+
+
+class SessionReplay:
+    """Replays the client side of one recorded connection"""
+
+    def __init__(self, session: int, messages: List[tuple]):
+        self.session = session
+        self.requests = [(t, message) for t, _, direction, message in messages
+                         if direction == CLIENT_TO_SERVER]
+        self.expected = [message for _, _, direction, message in messages
+                         if direction == SERVER_TO_CLIENT]
+        # The server answers every parseable line in order; raw strings are skipped
+        self.answered_requests = [message for _, message in self.requests if not isinstance(message, str)]
+        self.actual = []
+        self.latencies = []
+        self._send_times = deque()
+
+    async def _send(self, transport, start: float, speed: Optional[float]):
+        for elapsed, message in self.requests:
+            if speed:
+                delay = start + elapsed / speed - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            if isinstance(message, str):
+                line = message
+            else:
+                line = json.dumps(message)
+                self._send_times.append(time.perf_counter())
+            await transport.send_line(line + "\n")
+
+    async def _receive(self, transport):
+        while len(self.actual) < len(self.expected):
+            line = await transport.receive_line()
+            if not line:
+                break
+            if self._send_times:
+                self.latencies.append(time.perf_counter() - self._send_times.popleft())
+            self.actual.append(json.loads(line))
+
+    async def run(self, transport, start: float, speed: Optional[float]):
+        await asyncio.gather(self._send(transport, start, speed), self._receive(transport))
+
+    def mismatches(self, strict: bool = False) -> List[Dict[str, Any]]:
+        problems = []
+        for index, expected in enumerate(self.expected):
+            actual = self.actual[index] if index < len(self.actual) else None
+            request = self.answered_requests[index] if index < len(self.answered_requests) else None
+            if not responses_match(expected, actual, request, strict):
+                problems.append({
+                    "session": self.session,
+                    "index": index,
+                    "request": request,
+                    "expected": expected,
+                    "actual": actual
+                })
+        return problems
+
+
+class MCPReplayer:
+    """Replay every session of a recording concurrently"""
+
+    def __init__(self, path: str, speed: Optional[float] = 1.0, transport: str = "stdio",
+                 strict: bool = False):
+        self.path = path
+        self.speed = speed
+        self.transport = transport
+        self.strict = strict
+
+    def _make_transport(self):
+        if self.transport == "loopback":
+            from working_mcp_server import SimpleMCPServer
+            return LoopbackTransport(SimpleMCPServer())
+        return StdioTransport([sys.executable, SERVER_SCRIPT])
+
+    async def run(self) -> Dict[str, Any]:
+        recording = read_recording(self.path)
+        by_session = {}
+        for message in recording["messages"]:
+            by_session.setdefault(message[1], []).append(message)
+        sessions = [SessionReplay(session, messages) for session, messages in sorted(by_session.items())]
+
+        transports = [self._make_transport() for _ in sessions]
+        try:
+            for transport in transports:
+                await transport.start()
+            start = time.perf_counter()
+            await asyncio.gather(*(session.run(transport, start, self.speed)
+                                   for session, transport in zip(sessions, transports)))
+            wall = time.perf_counter() - start
+        finally:
+            for transport in transports:
+                await transport.close()
+
+        mismatches = [problem for session in sessions for problem in session.mismatches(self.strict)]
+        latencies = [value for session in sessions for value in session.latencies]
+        recorded_span = recording["messages"][-1][0] if recording["messages"] else 0.0
+        return {
+            "recording": {
+                "path": self.path,
+                "started": recording["header"].get("started"),
+                "sessions": len(sessions),
+                "messages": len(recording["messages"]),
+                "recorded_seconds": recorded_span
+            },
+            "replay": {
+                "transport": self.transport,
+                "speed": self.speed if self.speed else "max",
+                "strict": self.strict,
+                "wall_seconds": round(wall, 4),
+                "requests_sent": sum(len(session.requests) for session in sessions),
+                "responses": sum(len(session.actual) for session in sessions),
+                "throughput_rps": round(len(latencies) / wall, 2) if wall else None,
+                "latency": summarize_latencies(latencies)
+            },
+            "mismatch_count": len(mismatches),
+            "mismatches": mismatches[:20]
+        }
+
+
+def parse_speed(text: str) -> Optional[float]:
+    """``1``, ``10``, ``0.5`` or ``max`` (no delays at all)"""
+    if text.lower() in ("max", "0"):
+        return None
+    speed = float(text.lower().rstrip("x"))
+    if speed <= 0:
+        raise ValueError("speed must be positive or 'max'")
+    return speed
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Replay a recorded MCP session against a server")
+    parser.add_argument("recording", help="File written by mcp_transport.TrafficRecorder")
+    parser.add_argument("--speed", type=str, default="1", help="Playback speed: 1, 10, 10x or max")
+    parser.add_argument("--transport", choices=["stdio", "loopback"], default="stdio")
+    parser.add_argument("--strict", action="store_true",
+                        help=f"Also compare output of volatile tools ({', '.join(sorted(VOLATILE_TOOLS))})")
+    args = parser.parse_args()
+
+    replayer = MCPReplayer(args.recording, speed=parse_speed(args.speed),
+                           transport=args.transport, strict=args.strict)
+    report = asyncio.run(replayer.run())
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+    if report["mismatch_count"]:
+        print(f"❌ {report['mismatch_count']} responses did not match the recording", file=sys.stderr)
+        sys.exit(1)
+    print("✅ All responses match the recording", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+🔌 MCP Transport Helpers
+Shared plumbing for talking to MCP servers from the demo and test clients
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+
+class StderrRingLog:
+    """Bounded, thread-safe ring buffer of server stderr lines"""
+
+    def __init__(self, max_lines: int = 1000, max_line_length: int = 2000):
+        self.max_lines = max_lines
+        self.max_line_length = max_line_length
+        self._lines = deque(maxlen=max_lines)
+        self._lock = threading.Lock()
+        self.lines_total = 0
+        self.lines_dropped = 0
+        self.lines_truncated = 0
+        self.bytes_total = 0
+
+    def append(self, line: str):
+        """Store one line, evicting the oldest one when the buffer is full"""
+        line = line.rstrip("\r\n")
+        with self._lock:
+            self.lines_total += 1
+            self.bytes_total += len(line)
+            if len(line) > self.max_line_length:
+                line = line[:self.max_line_length] + "…"
+                self.lines_truncated += 1
+            if len(self._lines) == self.max_lines:
+                self.lines_dropped += 1
+            self._lines.append(line)
+
+    def tail(self, count: Optional[int] = None) -> List[str]:
+        """Return the most recent lines (all buffered lines by default)"""
+        with self._lock:
+            lines = list(self._lines)
+        if count is None:
+            return lines
+        return lines[-count:] if count > 0 else []
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters for diagnostics"""
+        with self._lock:
+            return {
+                "lines_total": self.lines_total,
+                "lines_buffered": len(self._lines),
+                "lines_dropped": self.lines_dropped,
+                "lines_truncated": self.lines_truncated,
+                "bytes_total": self.bytes_total,
+                "max_lines": self.max_lines
+            }
+
+
+class StderrDrain:
+    """Background reader that keeps a server's stderr pipe from filling up
+
+    A subprocess started with ``stderr=subprocess.PIPE`` blocks on its next
+    stderr write once the OS pipe buffer is full. The drain reads the pipe on
+    a daemon thread and forwards every line into a ``StderrRingLog``.
+    """
+
+    def __init__(self, stream, log: Optional[StderrRingLog] = None,
+                 on_line: Optional[Callable[[str], None]] = None,
+                 name: str = "mcp-server-stderr"):
+        self.stream = stream
+        self.log = log if log is not None else StderrRingLog()
+        self.on_line = on_line
+        self.name = name
+        self._thread = None
+
+    def start(self) -> "StderrDrain":
+        """Start draining in the background"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            for line in iter(self.stream.readline, ""):
+                if not line:
+                    break
+                if isinstance(line, bytes):
+                    line = line.decode("utf-8", errors="replace")
+                self.log.append(line)
+                if self.on_line:
+                    try:
+                        self.on_line(line.rstrip("\r\n"))
+                    except Exception:
+                        pass
+        except (ValueError, OSError):
+            # Pipe closed underneath us while the process shut down
+            pass
+
+    def join(self, timeout: Optional[float] = None):
+        """Wait for the drain to reach end-of-file"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def tail(self, count: Optional[int] = None) -> List[str]:
+        return self.log.tail(count)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.log.stats()
+
+
+def drain_stderr(process, max_lines: int = 1000, **kwargs) -> StderrDrain:
+    """Attach and start a ``StderrDrain`` for a ``subprocess.Popen`` object"""
+    return StderrDrain(process.stderr, StderrRingLog(max_lines=max_lines), **kwargs).start()
+
+
+class LineTransport:
+    """Newline-delimited JSON-RPC framing shared by every transport
+
+    Subclasses only move raw lines; ``send``/``receive``/``request`` handle
+    the JSON encoding exactly like the stdio clients do.
+    """
+
+    def __init__(self):
+        self._request_lock = asyncio.Lock()
+
+    async def start(self) -> "LineTransport":
+        return self
+
+    async def send_line(self, line: str):
+        raise NotImplementedError
+
+    async def receive_line(self) -> Optional[str]:
+        """Return the next line, or None once the server side has closed"""
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+    async def send(self, message: Dict[str, Any]):
+        await self.send_line(json.dumps(message) + "\n")
+
+    async def receive(self) -> Optional[Dict[str, Any]]:
+        line = await self.receive_line()
+        if not line:
+            return None
+        return json.loads(line.strip())
+
+    async def request(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Send one request and wait for its response
+
+        The server answers strictly in order, so concurrent callers take
+        turns instead of reading each other's responses.
+        """
+        async with self._request_lock:
+            await self.send(message)
+            return await self.receive()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+
+class LoopbackTransport(LineTransport):
+    """In-memory transport to a ``SimpleMCPServer`` in the same event loop
+
+    Lines go through two queues and the server's ``handle_line``, so framing,
+    skipped malformed lines and in-order replies match the stdio transport
+    without paying for a subprocess or pipes.
+    """
+
+    def __init__(self, server):
+        super().__init__()
+        self.server = server
+        self._inbound = asyncio.Queue()
+        self._outbound = asyncio.Queue()
+        self._task = None
+        self.error = None
+
+    async def start(self) -> "LoopbackTransport":
+        if self._task is None:
+            self._task = asyncio.create_task(self._serve())
+        return self
+
+    async def _serve(self):
+        try:
+            while True:
+                line = await self._inbound.get()
+                if line is None:
+                    break
+                response_line = await self.server.handle_line(line)
+                if response_line is not None:
+                    await self._outbound.put(response_line + "\n")
+        except Exception as e:
+            # The stdio server logs and exits on unexpected errors; mirror that
+            self.error = e
+        finally:
+            await self._outbound.put(None)
+
+    async def send_line(self, line: str):
+        if self._task is None or self._task.done():
+            raise ConnectionError("Loopback server is not running")
+        await self._inbound.put(line)
+
+    async def receive_line(self) -> Optional[str]:
+        line = await self._outbound.get()
+        if line is None:
+            # Keep reporting end-of-stream to any later readers
+            self._outbound.put_nowait(None)
+        return line
+
+    async def close(self):
+        if self._task is not None and not self._task.done():
+            await self._inbound.put(None)
+            await self._task
+
+
+class StdioTransport(LineTransport):
+    """Transport to an MCP server subprocess over stdin/stdout
+
+    Server stderr is drained into a ``StderrRingLog`` by a background task.
+    """
+
+    def __init__(self, command: List[str], cwd: Optional[str] = None,
+                 stderr_lines: int = 1000):
+        super().__init__()
+        self.command = command
+        self.cwd = cwd
+        self.stderr_log = StderrRingLog(max_lines=stderr_lines)
+        self.process = None
+        self._stderr_task = None
+
+    async def start(self) -> "StdioTransport":
+        if self.process is None:
+            self.process = await asyncio.create_subprocess_exec(
+                *self.command,
+                cwd=self.cwd,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                limit=2 ** 20
+            )
+            self._stderr_task = asyncio.create_task(self._drain_stderr())
+        return self
+
+    async def _drain_stderr(self):
+        while True:
+            line = await self.process.stderr.readline()
+            if not line:
+                break
+            self.stderr_log.append(line.decode("utf-8", errors="replace"))
+
+    async def send_line(self, line: str):
+        self.process.stdin.write(line.encode("utf-8"))
+        await self.process.stdin.drain()
+
+    async def receive_line(self) -> Optional[str]:
+        line = await self.process.stdout.readline()
+        return line.decode("utf-8") if line else None
+
+    async def close(self):
+        if self.process is None:
+            return
+        if self.process.returncode is None:
+            self.process.stdin.close()
+            try:
+                await asyncio.wait_for(self.process.wait(), timeout=2)
+            except asyncio.TimeoutError:
+                self.process.terminate()
+                await self.process.wait()
+        if self._stderr_task is not None:
+            await self._stderr_task
+
+
+# ============================================================================
+# 📼 Traffic recording
+# ============================================================================
+
+CLIENT_TO_SERVER = ">"
+SERVER_TO_CLIENT = "<"
+
+
+class TrafficRecorder:
+    """Append-only log of JSON-RPC traffic, shared by any number of connections
+
+    The file starts with one header object, followed by one compact JSON array
+    per message: ``[seconds_since_start, session, direction, message]``.
+    ``direction`` is ``">"`` for client to server and ``"<"`` for server to
+    client. Lines that are not JSON objects (malformed JSON, or valid JSON
+    such as ``5`` that is not a JSON-RPC message) are stored as raw strings
+    and counted in ``raw_lines``, so a replay sends them back verbatim as
+    lines the server skips.
+    """
+
+    def __init__(self, path: str, flush_every: int = 64):
+        self.path = path
+        self.flush_every = flush_every
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self._sessions = 0
+        self._pending = 0
+        self.messages_recorded = 0
+        self.raw_lines = 0
+        self._write_line({
+            "format": "mcp-recording",
+            "version": 1,
+            "started": datetime.now().isoformat()
+        })
+
+    def _write_line(self, record):
+        self._file.write(json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n")
+
+    def new_session(self) -> int:
+        with self._lock:
+            self._sessions += 1
+            return self._sessions
+
+    def record(self, session: int, direction: str, line: str):
+        """Append one message as it crossed the transport"""
+        elapsed = round(time.perf_counter() - self._start, 6)
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError:
+            message = None
+        if not isinstance(message, dict):
+            message = line.rstrip("\n")
+        with self._lock:
+            if isinstance(message, str):
+                self.raw_lines += 1
+            self._write_line([elapsed, session, direction, message])
+            self.messages_recorded += 1
+            self._pending += 1
+            if self._pending >= self.flush_every:
+                self._file.flush()
+                self._pending = 0
+
+    def tap(self, transport: "LineTransport") -> "RecordingTransport":
+        """Wrap a transport so its traffic is recorded under a new session id"""
+        return RecordingTransport(transport, self)
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class RecordingTransport(LineTransport):
+    """Transport tap that records every line passing through another transport"""
+
+    def __init__(self, inner: LineTransport, recorder: TrafficRecorder):
+        super().__init__()
+        self.inner = inner
+        self.recorder = recorder
+        self.session = recorder.new_session()
+
+    async def start(self) -> "RecordingTransport":
+        await self.inner.start()
+        return self
+
+    async def send_line(self, line: str):
+        self.recorder.record(self.session, CLIENT_TO_SERVER, line)
+        await self.inner.send_line(line)
+
+    async def receive_line(self) -> Optional[str]:
+        line = await self.inner.receive_line()
+        if line:
+            self.recorder.record(self.session, SERVER_TO_CLIENT, line)
+        return line
+
+    async def close(self):
+        await self.inner.close()
+
+
+def read_recording(path: str) -> Dict[str, Any]:
+    """Load a recording as ``{"header": {...}, "messages": [(t, session, direction, message), ...]}``
+
+    Every message is a JSON-RPC object or a raw line string; records that
+    do not have that shape raise ``ValueError``.
+    """
+    header = {}
+    messages = []
+    # Appending to an existing file starts a new segment with its own clock and
+    # session numbers; shift them so segments play back one after another
+    time_offset = session_offset = 0
+    last_elapsed = max_session = 0
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if isinstance(record, dict):
+                header = header or record
+                time_offset, session_offset = last_elapsed, max_session
+                continue
+            if (not isinstance(record, list) or len(record) != 4
+                    or record[2] not in (CLIENT_TO_SERVER, SERVER_TO_CLIENT)):
+                raise ValueError(f"{path}:{number}: not a recorded message")
+            elapsed, session, direction, message = record
+            if not isinstance(message, (dict, str)):
+                # Older recordings kept non-object JSON as-is; it was sent as a raw line
+                message = json.dumps(message)
+            elapsed += time_offset
+            session += session_offset
+            last_elapsed = elapsed
+            max_session = max(max_session, session)
+            messages.append((elapsed, session, direction, message))
+    return {"header": header, "messages": messages}
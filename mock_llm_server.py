@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+🎭 Mock LLM Server
+Local OpenAI-compatible stand-in for the workshop endpoint: /v1/models,
+/v1/chat/completions (plain and streamed) and /v1/embeddings with
+configurable latency, token rate, error injection and scripted answers, so
+benchmarks run offline and reproducibly
+
+Examples:
+    python3 mock_llm_server.py --port 8100
+    python3 mock_llm_server.py --latency lognormal:0.3,0.5 --token-rate 40 --error-rate 0.05
+    python3 mock_llm_server.py --script answers.json --seed 7
+
+    BASE_URL=http://127.0.0.1:8100/v1 python3 basic_workshop/notebooks/workshop_part1_setup.py
+
+Script files are a JSON list of rules tried in order; the first whose
+``match`` regex is found in the last user message answers (a rule without
+``match`` always matches):
+    [{"match": "weather", "response": "It is sunny."}, {"response": "Default answer."}]
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import math
+import random
+import re
+import socket
+import sys
+import threading
+import time
+import struct
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+from llm_client.semantic_cache import HashingEmbedder
+from llm_client.tokens import estimate_messages_tokens, estimate_tokens
+
+DEFAULT_MODELS = ["gpt-3.5-turbo", "gpt-4", "anthropic.claude-3-haiku-20240307-v1:0",
+                  "text-embedding-3-small"]
+
+# Same per-request limits as the OpenAI embeddings API
+EMBEDDING_DIMENSIONS = 1536
+MAX_EMBEDDING_INPUTS = 2048
+
+FILLER_WORDS = ("the model keeps talking so that replies have a realistic length "
+                "for benchmarking streaming throughput and time to first token").split()
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Parse a latency distribution such as ``fixed:0.2`` into a sampler (seconds)
+
+    Supported: ``fixed:S``, ``uniform:LOW,HIGH``, ``normal:MEAN,STD``,
+    ``lognormal:MEDIAN,SIGMA`` and ``exp:MEAN``.
+    """
+    kind, _, args = spec.partition(":")
+    try:
+        values = [float(value) for value in args.split(",")] if args else []
+    except ValueError:
+        raise ValueError(f"Bad latency spec: {spec}")
+    kind = kind.strip().lower()
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "normal" and len(values) == 2:
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal" and len(values) == 2:
+        mu = math.log(values[0]) if values[0] > 0 else 0.0
+        return lambda rng: rng.lognormvariate(mu, values[1])
+    if kind == "exp" and len(values) == 1:
+        return lambda rng: rng.expovariate(1.0 / values[0]) if values[0] > 0 else 0.0
+    raise ValueError(f"Bad latency spec: {spec}")
+
+
+def load_script(path: str) -> List[Dict[str, Any]]:
+    with open(path) as f:
+        rules = json.load(f)
+    if not isinstance(rules, list):
+        raise ValueError("Script must be a JSON list of rules")
+    for rule in rules:
+        if "match" in rule:
+            rule["_pattern"] = re.compile(rule["match"], re.IGNORECASE)
+    return rules
+
+
+class MockLLMServer:
+    """Threaded HTTP server speaking the OpenAI chat completions and embeddings APIs
+
+    Args:
+        host: Interface to bind
+        port: Port to bind (0 picks a free one; see ``url``)
+        latency: Time to first token, as a ``parse_latency`` spec
+        token_rate: Completion tokens per second after the first one
+            (0 sends the whole reply at once)
+        reply_tokens: Length of generated answers, capped by ``max_tokens``
+        error_rate: Fraction of completions answered with an error
+        error_statuses: Statuses picked from for injected errors
+        script: Rules from ``load_script``; unmatched prompts get a generated answer
+        models: Model ids served by ``/v1/models``
+        seed: Seed for latencies, errors and generated answers
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8100, latency: str = "fixed:0",
+                 token_rate: float = 0.0, reply_tokens: int = 50, error_rate: float = 0.0,
+                 error_statuses=(429, 500, 503), script: Optional[List[Dict[str, Any]]] = None,
+                 models: Optional[List[str]] = None, seed: Optional[int] = None):
+        self.latency_spec = latency
+        self.sample_latency = parse_latency(latency)
+        self.token_rate = token_rate
+        self.reply_tokens = reply_tokens
+        self.error_rate = error_rate
+        self.error_statuses = list(error_statuses)
+        self.script = script or []
+        self.models = list(models or DEFAULT_MODELS)
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counters = {"models": 0, "not_modified": 0, "completions": 0, "streams": 0, "embeddings": 0, "errors": 0, "scripted": 0}
+
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.mock = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as ``BASE_URL``"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def draw(self) -> Dict[str, Any]:
+        """Random decisions for one request, drawn under the lock for reproducibility"""
+        with self._lock:
+            latency = self.sample_latency(self.rng)
+            error = None
+            if self.error_rate and self.rng.random() < self.error_rate:
+                error = self.rng.choice(self.error_statuses)
+            return {"latency": latency, "error": error}
+
+    def reply_for(self, payload: Dict[str, Any]) -> str:
+        messages = payload.get("messages") or []
+        prompt = ""
+        for message in reversed(messages):
+            if message.get("role") == "user" and isinstance(message.get("content"), str):
+                prompt = message["content"]
+                break
+        for rule in self.script:
+            pattern = rule.get("_pattern")
+            if pattern is None or pattern.search(prompt):
+                self.count("scripted")
+                return rule.get("response", "")
+
+        budget = min(self.reply_tokens, int(payload.get("max_tokens") or self.reply_tokens))
+        words = f"Mock answer to: {prompt[:80]}".split()
+        words += [FILLER_WORDS[i % len(FILLER_WORDS)] for i in range(max(0, budget - len(words)))]
+        return " ".join(words[:budget])
+
+    def start(self) -> "MockLLMServer":
+        """Serve from a background thread (for tests and benchmarks)"""
+        # A short poll interval keeps stop() (and test teardown) fast
+        self._thread = threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.counters)
+
+
+def _split_tokens(text: str) -> List[str]:
+    """Word-sized stream deltas that join back into ``text``"""
+    return re.findall(r"\S+\s*|\s+", text) or [""]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MockLLM/1.0"
+
+    @property
+    def mock(self) -> MockLLMServer:
+        return self.server.mock
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; don't let Nagle's
+        # algorithm and delayed ACKs add ~40 ms between them
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, body: Dict[str, Any], status: int = 200, headers: Optional[Dict[str, str]] = None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_chunk(self, text: str):
+        data = text.encode("utf-8")
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def do_GET(self):
+        path = self.path.split("?")[0].rstrip("/")
+        if path.endswith("/models"):
+            self.mock.count("models")
+            body = {"object": "list", "data": [
+                {"id": model, "object": "model", "owned_by": "mock"} for model in self.mock.models]}
+            etag = '"%s"' % hashlib.sha256(json.dumps(body).encode("utf-8")).hexdigest()[:16]
+            if self.headers.get("If-None-Match") == etag:
+                self.mock.count("not_modified")
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self._send_json(body, headers={"ETag": etag})
+        elif path.endswith("/mock/stats"):
+            self._send_json(self.mock.stats())
+        else:
+            self._send_json({"error": {"message": f"Unknown path: {self.path}"}}, 404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json({"error": {"message": "Invalid JSON body"}}, 400)
+            return
+        path = self.path.split("?")[0].rstrip("/")
+        if not path.endswith(("/chat/completions", "/embeddings")):
+            self._send_json({"error": {"message": f"Unknown path: {self.path}"}}, 404)
+            return
+        if payload.get("model") not in self.mock.models:
+            self._send_json({"error": {"message": f"Unknown model: {payload.get('model')}"}}, 404)
+            return
+
+        decision = self.mock.draw()
+        time.sleep(decision["latency"])
+        if decision["error"] is not None:
+            self.mock.count("errors")
+            headers = {"Retry-After": "1"} if decision["error"] == 429 else None
+            self._send_json({"error": {"message": "Injected error", "type": "mock_error"}},
+                            decision["error"], headers)
+            return
+        if path.endswith("/embeddings"):
+            self._embed(payload)
+            return
+
+        text = self.mock.reply_for(payload)
+        tokens = _split_tokens(text)
+        usage = {
+            "prompt_tokens": estimate_messages_tokens(payload.get("messages") or []),
+            "completion_tokens": len(tokens)
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        completion_id = f"chatcmpl-mock-{uuid.uuid4().hex[:12]}"
+        if payload.get("stream"):
+            self._stream(payload, completion_id, tokens, usage)
+        else:
+            self._complete(payload, completion_id, text, tokens, usage)
+
+    def _token_delay(self, count: int) -> float:
+        return count / self.mock.token_rate if self.mock.token_rate > 0 else 0.0
+
+    def _complete(self, payload, completion_id, text, tokens, usage):
+        self.mock.count("completions")
+        time.sleep(self._token_delay(len(tokens) - 1))
+        self._send_json({
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload["model"],
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text},
+                         "finish_reason": "stop"}],
+            "usage": usage
+        })
+
+    def _embed(self, payload):
+        inputs = payload.get("input")
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        if not inputs or len(inputs) > MAX_EMBEDDING_INPUTS or not all(isinstance(text, str) and text for text in inputs):
+            self._send_json({"error": {"message": f"input must be 1-{MAX_EMBEDDING_INPUTS} non-empty strings"}}, 400)
+            return
+        self.mock.count("embeddings")
+        embedder = HashingEmbedder(int(payload.get("dimensions") or EMBEDDING_DIMENSIONS))
+        as_base64 = payload.get("encoding_format") == "base64"
+        data = []
+        for index, text in enumerate(inputs):
+            vector = embedder(text)
+            if as_base64:
+                vector = base64.b64encode(struct.pack(f"<{len(vector)}f", *vector)).decode("ascii")
+            data.append({"object": "embedding", "index": index, "embedding": vector})
+        prompt_tokens = sum(estimate_tokens(text) for text in inputs)
+        self._send_json({"object": "list", "data": data, "model": payload["model"],
+                         "usage": {"prompt_tokens": prompt_tokens, "total_tokens": prompt_tokens}})
+
+    def _stream(self, payload, completion_id, tokens, usage):
+        self.mock.count("streams")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def event(delta, finish_reason=None, **extra):
+            chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                     "model": payload["model"],
+                     "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+            chunk.update(extra)
+            self._send_chunk("data: " + json.dumps(chunk) + "\n\n")
+
+        try:
+            event({"role": "assistant", "content": ""})
+            for index, token in enumerate(tokens):
+                if index:
+                    time.sleep(self._token_delay(1))
+                event({"content": token})
+            include_usage = (payload.get("stream_options") or {}).get("include_usage")
+            event({}, "stop", **({"usage": usage} if include_usage else {}))
+            self._send_chunk("data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # Client stopped reading (e.g. closed the stream early)
+            self.close_connection = True
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible mock LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", default="fixed:0",
+                        help="Time to first token: fixed:S, uniform:LO,HI, normal:MEAN,STD, lognormal:MEDIAN,SIGMA, exp:MEAN")
+    parser.add_argument("--token-rate", type=float, default=0.0, help="Completion tokens per second (0 = instant)")
+    parser.add_argument("--reply-tokens", type=int, default=50, help="Length of generated answers")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of completions that fail")
+    parser.add_argument("--error-statuses", default="429,500,503", help="Statuses used for injected errors")
+    parser.add_argument("--script", default=None, help="JSON file with scripted answers")
+    parser.add_argument("--models", default=",".join(DEFAULT_MODELS), help="Comma-separated model ids")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible runs")
+    args = parser.parse_args()
+
+    server = MockLLMServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        token_rate=args.token_rate,
+        reply_tokens=args.reply_tokens,
+        error_rate=args.error_rate,
+        error_statuses=[int(status) for status in args.error_statuses.split(",") if status.strip()],
+        script=load_script(args.script) if args.script else None,
+        models=[model.strip() for model in args.models.split(",") if model.strip()],
+        seed=args.seed
+    )
+    print(f"🎭 Mock LLM server on {server.url}", file=sys.stderr)
+    print(f"   latency={args.latency} token_rate={args.token_rate} error_rate={args.error_rate}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"📊 {json.dumps(server.stats())}", file=sys.stderr)
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
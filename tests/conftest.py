@@ -0,0 +1,36 @@
+"""
+🧪 Shared fixtures
+A MockLLMServer on a free port and LLMClients pointed at it
+"""
+
+import pytest
+
+from llm_client import LLMClient, RetryPolicy
+from mock_llm_server import MockLLMServer
+
+
+@pytest.fixture
+def mock_server():
+    with MockLLMServer(port=0, seed=1) as server:
+        yield server
+
+
+@pytest.fixture
+def make_client(mock_server):
+    """Build clients against ``mock_server``; retries are off unless a policy is passed"""
+    clients = []
+
+    def make(**kwargs):
+        kwargs.setdefault("retry_policy", RetryPolicy(max_attempts=1))
+        client = LLMClient(base_url=mock_server.url, api_key="test-key", **kwargs)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client()
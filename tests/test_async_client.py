@@ -0,0 +1,38 @@
+"""
+🧪 Async client tests
+Concurrent generation over the pooled client, in order and with per-prompt errors
+"""
+
+import asyncio
+import time
+
+from llm_client import AsyncLLMClient
+from mock_llm_server import parse_latency
+
+
+def test_generate_many_runs_concurrently_in_prompt_order(client, mock_server):
+    mock_server.sample_latency = parse_latency("fixed:0.2")
+    prompts = [f"question {n}" for n in range(8)]
+
+    async def run():
+        async with AsyncLLMClient(client, max_workers=8) as async_client:
+            return await async_client.generate_many(prompts, concurrency=8, model="gpt-4", max_tokens=10)
+
+    started = time.perf_counter()
+    results = asyncio.run(run())
+    assert time.perf_counter() - started < 1.0
+    assert [result.index for result in results] == list(range(8))
+    assert all(result.ok and result.text.startswith(f"Mock answer to: question {result.index}")
+               for result in results)
+    # Attributed to the coroutine that asked, not to the worker threads
+    assert client.metrics.summary(by="call_site")["test_async_client.run"]["calls"] == 8
+
+
+def test_failed_prompts_do_not_stop_the_batch(client):
+    async def run():
+        async with AsyncLLMClient(client) as async_client:
+            return await async_client.generate_many(["fine", "also fine"], model="no-such-model")
+
+    results = asyncio.run(run())
+    assert [result.ok for result in results] == [False, False]
+    assert results[0].error.status_code == 404
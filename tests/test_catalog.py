@@ -0,0 +1,70 @@
+"""
+🧪 Model catalog tests
+Memory and disk hits, ETag revalidation, stale-if-error and model id validation
+"""
+
+import pytest
+import requests
+
+from llm_client import UnknownModelError
+
+
+@pytest.fixture
+def cached_client(make_client, tmp_path):
+    def make(**kwargs):
+        return make_client(models_cache_dir=str(tmp_path / "cache"), **kwargs)
+    return make
+
+
+def test_second_call_is_a_memory_hit(cached_client, mock_server):
+    client = cached_client()
+    ids = [model["id"] for model in client.list_models()["data"]]
+    assert "gpt-4" in ids
+    client.list_models()
+    assert mock_server.counters["models"] == 1
+    assert client.catalog.last_source == "memory"
+    assert client.catalog.stats()["fetches"] == 1
+
+
+def test_another_client_reads_the_disk_file(cached_client, mock_server):
+    cached_client().list_models()
+    other = cached_client()
+    assert other.list_models()["data"]
+    assert other.catalog.last_source == "disk"
+    assert mock_server.counters["models"] == 1
+
+
+def test_refresh_revalidates_with_the_etag(cached_client, mock_server):
+    client = cached_client()
+    first = client.list_models()
+    assert client.list_models(refresh=True) == first
+    assert client.catalog.last_source == "not_modified"
+    assert mock_server.counters["not_modified"] == 1
+    assert client.catalog.stats()["not_modified"] == 1
+
+
+def test_expired_list_is_served_stale_when_the_endpoint_fails(cached_client, monkeypatch):
+    client = cached_client(models_ttl=0)
+    first = client.list_models()
+
+    def unreachable(*args, **kwargs):
+        raise requests.ConnectionError("down")
+
+    monkeypatch.setattr(client, "get", unreachable)
+    assert client.list_models() == first
+    assert client.catalog.last_source == "stale"
+    assert client.catalog.stats()["stale_served"] == 1
+
+    client.catalog.invalidate()
+    with pytest.raises(requests.ConnectionError):
+        client.list_models()
+
+
+def test_validate_suggests_close_ids(cached_client, mock_server):
+    client = cached_client()
+    assert client.catalog.validate("gpt-4") == "gpt-4"
+    with pytest.raises(UnknownModelError, match="did you mean gpt-4"):
+        client.catalog.validate("gpt-4x")
+    assert "gpt-3.5-turbo" in client.catalog
+    assert client.catalog.get("nope") is None
+    assert mock_server.counters["models"] == 1
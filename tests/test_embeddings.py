@@ -0,0 +1,52 @@
+"""
+🧪 Embeddings tests
+Batch planning within item and token limits, and vectors back in input order
+"""
+
+import pytest
+
+from llm_client import EmbeddingClient, LLMError
+from llm_client.embeddings import plan_batches
+from llm_client.semantic_cache import HashingEmbedder
+
+np = pytest.importorskip("numpy")
+
+
+def test_plan_batches_respects_both_limits():
+    assert plan_batches([1] * 5, max_items=2, max_tokens=100) == [(0, 2), (2, 4), (4, 5)]
+    assert plan_batches([40, 40, 40, 10], max_items=10, max_tokens=90) == [(0, 2), (2, 4)]
+    # An input larger than the token limit still gets a batch of its own
+    assert plan_batches([500, 1], max_items=10, max_tokens=100) == [(0, 1), (1, 2)]
+    assert plan_batches([]) == []
+
+
+@pytest.mark.parametrize("encoding_format", ["float", "base64"])
+def test_vectors_come_back_in_input_order(make_client, mock_server, encoding_format):
+    texts = [f"document number {n}" for n in range(50)]
+    with EmbeddingClient(make_client(), concurrency=4, min_batch_items=8,
+                         encoding_format=encoding_format) as embedder:
+        matrix = embedder.embed(texts)
+        stats = embedder.stats()
+    assert matrix.dtype == np.float32 and matrix.flags["C_CONTIGUOUS"]
+    embed = HashingEmbedder(matrix.shape[1])
+    for row, text in zip(matrix, texts):
+        assert np.allclose(row, embed(text), atol=1e-6)
+    assert mock_server.counters["embeddings"] == stats["requests"] > 1
+    assert stats["texts"] == 50
+
+
+def test_empty_and_oversized_inputs(make_client):
+    with EmbeddingClient(make_client(), max_input_tokens=10) as embedder:
+        matrix = embedder.embed(["", "x" * 1000])
+        assert matrix.shape[0] == 2
+        assert embedder.stats()["truncated"] == 1
+        assert embedder.embed([]).shape[0] == 0
+
+
+def test_failed_request_raises(make_client, mock_server):
+    mock_server.error_rate = 1.0
+    mock_server.error_statuses = [500]
+    with EmbeddingClient(make_client()) as embedder:
+        with pytest.raises(LLMError) as error:
+            embedder.embed(["a", "b"])
+    assert error.value.status_code == 500
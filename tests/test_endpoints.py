@@ -0,0 +1,115 @@
+"""
+🧪 Endpoint pool tests
+Failover between two mock servers, circuit breakers and latency-aware ranking
+"""
+
+import pytest
+
+from llm_client import CircuitBreaker, CircuitOpenError, Endpoint, EndpointPool, LLMError
+from mock_llm_server import MockLLMServer
+
+
+@pytest.fixture
+def backup_server():
+    with MockLLMServer(port=0, seed=2) as server:
+        yield server
+
+
+@pytest.fixture
+def pool(mock_server, backup_server):
+    return EndpointPool([Endpoint(mock_server.url, breaker=CircuitBreaker(failure_threshold=2)),
+                         backup_server.url], explore_rate=0)
+
+
+def ask(client):
+    return client.generate("hello", model="gpt-4")
+
+
+def test_server_errors_fail_over_and_demote_the_endpoint(make_client, pool, mock_server, backup_server):
+    client = make_client(endpoints=pool)
+    mock_server.error_rate = 1.0
+    mock_server.error_statuses = [500]
+    for _ in range(3):
+        assert ask(client)
+    # After one failure the primary ranks last
+    assert pool.primary.failures == 1
+    assert mock_server.counters["errors"] == 1
+    assert backup_server.counters["completions"] == 3
+    assert pool.stats()["failovers"] == 1
+
+
+def test_open_circuit_is_skipped_without_a_request(make_client, mock_server):
+    pool = EndpointPool([Endpoint(mock_server.url, breaker=CircuitBreaker(failure_threshold=2))])
+    client = make_client(endpoints=pool)
+    mock_server.error_rate = 1.0
+    mock_server.error_statuses = [500]
+    for _ in range(2):
+        with pytest.raises(LLMError):
+            ask(client)
+    with pytest.raises(CircuitOpenError):
+        ask(client)
+    assert pool.primary.breaker.state == CircuitBreaker.OPEN
+    assert mock_server.counters["errors"] == 2
+
+
+def test_throttled_endpoint_fails_over(make_client, pool, mock_server, backup_server):
+    client = make_client(endpoints=pool)
+    mock_server.error_rate = 1.0
+    mock_server.error_statuses = [429]
+    for _ in range(3):
+        assert ask(client)
+    assert pool.primary.throttled == 1
+    assert pool.primary.failures == 0
+    assert backup_server.counters["completions"] == 3
+
+
+def test_throttling_never_opens_the_circuit(make_client, mock_server):
+    pool = EndpointPool([Endpoint(mock_server.url, breaker=CircuitBreaker(failure_threshold=2))])
+    client = make_client(endpoints=pool)
+    mock_server.error_rate = 1.0
+    mock_server.error_statuses = [429]
+    for _ in range(4):
+        with pytest.raises(LLMError) as error:
+            ask(client)
+        assert error.value.status_code == 429
+    assert pool.primary.breaker.state == CircuitBreaker.CLOSED
+    assert pool.primary.throttled == 4
+    assert mock_server.counters["errors"] == 4
+
+
+def test_unreachable_endpoint_fails_over(make_client, backup_server):
+    pool = EndpointPool(["http://127.0.0.1:9/v1", backup_server.url], explore_rate=0)
+    client = make_client(endpoints=pool)
+    assert ask(client)
+    assert pool.primary.failures == 1
+    assert backup_server.counters["completions"] == 1
+
+
+def test_ranking_prefers_the_faster_idle_endpoint():
+    pool = EndpointPool(["http://slow/v1", "http://fast/v1"], explore_rate=0)
+    slow, fast = pool.endpoints
+    for endpoint, latency in ((slow, 0.5), (fast, 0.1)):
+        endpoint.begin()
+        endpoint.end(latency, ok=True)
+    assert pool.ranked() == [fast, slow]
+
+    # Queued work makes the fast endpoint costlier than the idle slow one
+    for _ in range(5):
+        fast.begin()
+    assert pool.ranked() == [slow, fast]
+
+
+def test_pool_failures_do_not_open_the_client_breaker(make_client, mock_server, backup_server):
+    pool = EndpointPool([Endpoint(server.url, breaker=CircuitBreaker(failure_threshold=20))
+                         for server in (mock_server, backup_server)], explore_rate=0)
+    client = make_client(endpoints=pool)
+    for server in (mock_server, backup_server):
+        server.error_rate = 1.0
+        server.error_statuses = [500]
+    for _ in range(6):
+        with pytest.raises(LLMError):
+            ask(client)
+    assert client.retrier.breaker.state == CircuitBreaker.CLOSED
+
+    backup_server.error_rate = 0.0
+    assert ask(client)
@@ -0,0 +1,53 @@
+"""
+🧪 HTTP fixture tests
+Record against the mock server, replay offline, and keep misses away from the breaker
+"""
+
+import pytest
+
+from llm_client import CircuitBreaker, FixtureMissError, HTTPFixtures, ModelLimits, RateLimiter
+
+
+def question(content):
+    return [{"role": "user", "content": content}]
+
+
+@pytest.fixture
+def recording(make_client, tmp_path):
+    """A fixture file holding one completion and one stream"""
+    path = str(tmp_path / "fixtures.jsonl")
+    fixtures = HTTPFixtures(path, mode="record")
+    client = make_client(fixtures=fixtures)
+    answer = client.chat(question("recorded"), model="gpt-4", temperature=0)
+    streamed = client.stream_chat(question("streamed"), model="gpt-4").read()
+    fixtures.close()
+    return path, answer, streamed
+
+
+def test_replay_serves_recorded_exchanges(make_client, recording, mock_server):
+    path, answer, streamed = recording
+    served = mock_server.counters["completions"] + mock_server.counters["streams"]
+    client = make_client(fixtures=HTTPFixtures(path, mode="replay", latency="zero"))
+    assert client.chat(question("recorded"), model="gpt-4", temperature=0) == answer
+    assert client.stream_chat(question("streamed"), model="gpt-4").read() == streamed
+    assert mock_server.counters["completions"] + mock_server.counters["streams"] == served
+    assert client.fixtures.stats()["replayed"] == 2
+
+
+def test_misses_do_not_trip_the_breaker_or_the_limiter(make_client, recording):
+    path, answer, _ = recording
+    limiter = RateLimiter({"*": ModelLimits(initial_concurrency=4)})
+    client = make_client(fixtures=HTTPFixtures(path, mode="replay", latency="zero"),
+                         circuit_breaker=CircuitBreaker(failure_threshold=2), rate_limiter=limiter)
+    for _ in range(3):
+        with pytest.raises(FixtureMissError):
+            client.chat(question("never recorded"), model="gpt-4", temperature=0)
+
+    # The hit after the misses still replays
+    assert client.chat(question("recorded"), model="gpt-4", temperature=0) == answer
+    assert client.retrier.breaker.stats()["consecutive_failures"] == 0
+    assert client.retrier.breaker.state == CircuitBreaker.CLOSED
+    stats = limiter.stats()["gpt-4"]
+    assert (stats["overloaded"], stats["in_flight"]) == (0, 0)
+    assert stats["concurrency_limit"] > 4
+    assert client.fixtures.stats()["misses"] == 3
@@ -0,0 +1,93 @@
+"""
+🧪 Hedged request tests
+When a backup request is sent, which answer wins and how the worker pool is sized
+"""
+
+import threading
+import time
+
+from llm_client import Hedger, LLMClient
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, body=""):
+        self.status_code = status_code
+        self.body = body
+        self.closed = threading.Event()
+
+    def close(self):
+        self.closed.set()
+
+
+def sends(*delays):
+    """A send() whose n-th call sleeps ``delays[n]`` and answers with its index"""
+    counter = iter(range(len(delays)))
+    responses = []
+
+    def send():
+        index = next(counter)
+        time.sleep(delays[index])
+        response = FakeResponse(body=str(index))
+        responses.append(response)
+        return response
+
+    send.responses = responses
+    return send
+
+
+def test_fast_primary_is_not_hedged():
+    hedger = Hedger(initial_delay=0.2, budget=1.0)
+    try:
+        assert hedger.call(sends(0.01)).body == "0"
+        assert hedger.stats()["hedged"] == 0
+    finally:
+        hedger.close()
+
+
+def test_slow_primary_loses_to_its_hedge():
+    hedger = Hedger(initial_delay=0.05, budget=1.0)
+    try:
+        send = sends(0.5, 0.01)
+        started = time.perf_counter()
+        assert hedger.call(send).body == "1"
+        assert time.perf_counter() - started < 0.3
+        stats = hedger.stats()
+        assert (stats["hedged"], stats["hedge_wins"]) == (1, 1)
+        # The primary is closed once it finishes
+        time.sleep(0.5)
+        assert send.responses[-1].body == "0"
+        assert send.responses[-1].closed.wait(1)
+    finally:
+        hedger.close()
+
+
+def test_budget_limits_hedges():
+    hedger = Hedger(initial_delay=0.01, min_delay=0.01, budget=0.0)
+    try:
+        # The initial credit pays for one hedge, then the budget is spent
+        hedger.call(sends(0.1, 0.1))
+        hedger.call(sends(0.1))
+        stats = hedger.stats()
+        assert (stats["hedged"], stats["budget_denied"]) == (1, 1)
+    finally:
+        hedger.close()
+
+
+def test_delay_counts_from_when_the_primary_starts():
+    hedger = Hedger(initial_delay=0.1, budget=1.0, max_workers=1)
+    try:
+        # Occupy the only worker: the primary waits for it longer than the delay
+        hedger._pool().submit(time.sleep, 0.2)
+        assert hedger.call(sends(0.01)).body == "0"
+        assert hedger.stats()["hedged"] == 0
+    finally:
+        hedger.close()
+
+
+def test_client_sizes_the_pool_from_its_connection_pool():
+    client = LLMClient(base_url="http://127.0.0.1:9/v1", pool_maxsize=24, hedger=Hedger())
+    try:
+        assert client.hedger.max_workers == 48
+    finally:
+        client.close()
+    assert Hedger(max_workers=3).max_workers == 3
@@ -0,0 +1,84 @@
+"""
+🧪 Streaming JSON parser tests
+The same events and document for any chunking, plus streamed JSON from the mock
+"""
+
+import json
+import random
+
+import pytest
+
+from llm_client import StreamingJSONParser, iter_json
+from mock_llm_server import load_script
+
+DOCUMENT = {
+    "title": "Tips \"quoted\" \\ and unicode: héllo 👋",
+    "items": [{"n": 1, "ok": True}, {"n": -2.5e3, "ok": False}, {"n": None, "tags": ["a", "b,c", "}]"]}],
+    "empty": {},
+    "nested": [[], [1, [2, [3]]]],
+}
+
+
+def chunked(text, rng):
+    chunks, start = [], 0
+    while start < len(text):
+        size = rng.randint(1, 12)
+        chunks.append(text[start:start + size])
+        start += size
+    return chunks
+
+
+def parse(chunks, max_depth=None):
+    parser = StreamingJSONParser(max_depth=max_depth)
+    events = []
+    for chunk in chunks:
+        events += parser.feed(chunk)
+    return events, parser.close()
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_any_chunking_gives_the_same_events(indent):
+    text = "Here you go:\n```json\n" + json.dumps(DOCUMENT, indent=indent, ensure_ascii=False) + "\n```\nDone."
+    expected, document = parse([text])
+    assert document == DOCUMENT
+    rng = random.Random(3)
+    for _ in range(200):
+        assert parse(chunked(text, rng)) == (expected, DOCUMENT)
+    assert parse(list(text)) == (expected, DOCUMENT)
+
+
+def test_elements_are_emitted_as_they_close():
+    parser = StreamingJSONParser(max_depth=2)
+    assert parser.feed('{"items": [{"n": 1}, ') == [(("items", 0), {"n": 1})]
+    assert parser.feed('{"n": 2}') == [(("items", 1), {"n": 2})]
+    events = parser.feed("]}")
+    assert events == [(("items",), [{"n": 1}, {"n": 2}]), ((), {"items": [{"n": 1}, {"n": 2}]})]
+
+
+def test_max_depth_limits_events():
+    events, _ = parse([json.dumps(DOCUMENT)], max_depth=1)
+    assert [path for path, _ in events] == [("title",), ("items",), ("empty",), ("nested",), ()]
+
+
+def test_scalars_split_across_chunks():
+    events, document = parse(['{"a": tr', 'ue, "b": 12', '34, "c": "x', 'y"}'])
+    assert document == {"a": True, "b": 1234, "c": "xy"}
+    assert events[:3] == [(("a",), True), (("b",), 1234), (("c",), "xy")]
+
+
+def test_incomplete_document_raises():
+    parser = StreamingJSONParser()
+    parser.feed('{"a": [1, 2')
+    with pytest.raises(ValueError):
+        parser.close()
+    with pytest.raises(ValueError):
+        list(iter_json(['{"a": 1']))
+
+
+def test_stream_json_from_the_mock(client, mock_server, tmp_path):
+    script = tmp_path / "script.json"
+    script.write_text(json.dumps([{"response": "```json\n" + json.dumps({"steps": ["one", "two"]}) + "\n```"}]))
+    mock_server.script = load_script(str(script))
+    events = list(client.stream_json([{"role": "user", "content": "steps as JSON"}], model="gpt-4"))
+    assert events == [(("steps",), ["one", "two"]), ((), {"steps": ["one", "two"]})]
+    assert client.metrics.summary()["gpt-4"]["calls"] == 1
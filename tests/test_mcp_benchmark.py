@@ -0,0 +1,50 @@
+"""
+🧪 MCP benchmark tests
+Mix parsing, latency summaries and a short loopback run
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from mcp_benchmark import MCPBenchmark, build_request, parse_mix, percentile, summarize_latencies
+
+
+def test_parse_mix():
+    assert parse_mix("tools/list=1, calculate=4") == {"tools/list": 1.0, "calculate": 4.0}
+    assert parse_mix("hello_world") == {"hello_world": 1.0}
+    with pytest.raises(ValueError):
+        parse_mix("drop_tables=1")
+    with pytest.raises(ValueError):
+        parse_mix("calculate=0")
+
+
+def test_build_request():
+    assert build_request("tools/list", 7, random.Random(1)) == {"jsonrpc": "2.0", "id": 7, "method": "tools/list"}
+    request = build_request("calculate", 8, random.Random(1))
+    assert request["method"] == "tools/call"
+    assert request["params"]["name"] == "calculate"
+    assert request["params"]["arguments"]["expression"]
+
+
+def test_latency_summary_uses_nearest_rank():
+    values = [n / 1000 for n in range(1, 101)]
+    assert percentile(values, 50) == 0.05
+    assert percentile(values, 99) == 0.099
+    assert percentile([], 50) is None
+    summary = summarize_latencies(list(reversed(values)))
+    assert (summary["count"], summary["p95_ms"], summary["max_ms"]) == (100, 95.0, 100.0)
+    assert summarize_latencies([]) == {"count": 0}
+
+
+@pytest.mark.parametrize("arrival", ["closed", "open"])
+def test_short_loopback_run(arrival):
+    benchmark = MCPBenchmark(clients=2, duration=0.3, warmup=0.1, arrival=arrival, rate=200,
+                             transport="loopback")
+    report = asyncio.run(benchmark.run())
+    results = report["results"]
+    assert results["completed"] > 0
+    assert results["errors"] == 0
+    assert results["latency"]["count"] == results["completed"]
+    assert set(results["operations"]) == set(report["config"]["mix"])
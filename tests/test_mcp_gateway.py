@@ -0,0 +1,135 @@
+"""
+🧪 Gateway tests
+MCPGateway in front of loopback upstreams: catalog, routing, result cache
+and connection pool recovery
+"""
+
+import asyncio
+
+import pytest
+
+from mcp_gateway import MCPGateway, Upstream
+from mcp_transport import LoopbackTransport
+from working_mcp_server import SimpleMCPServer
+
+
+class CountingServer(SimpleMCPServer):
+    """SimpleMCPServer that counts tool executions"""
+
+    calls = 0
+
+    async def execute_tool(self, tool_name, arguments):
+        CountingServer.calls += 1
+        return await super().execute_tool(tool_name, arguments)
+
+
+def loopback_factory(server_class=SimpleMCPServer):
+    return lambda: LoopbackTransport(server_class())
+
+
+def call(gateway, request_id, name, arguments):
+    return gateway.handle_request({"jsonrpc": "2.0", "id": request_id, "method": "tools/call",
+                                   "params": {"name": name, "arguments": arguments}})
+
+
+def test_catalog_is_namespaced():
+    async def scenario():
+        gateway = MCPGateway({"a": loopback_factory(), "b": loopback_factory()})
+        try:
+            return await gateway.handle_request({"jsonrpc": "2.0", "id": 1, "method": "tools/list"})
+        finally:
+            await gateway.close()
+
+    tools = asyncio.run(scenario())["result"]["tools"]
+    names = {tool["name"] for tool in tools}
+    assert {"a__calculate", "b__calculate", "a__hello_world"} <= names
+    assert len(tools) == 6
+
+
+def test_tool_results_are_cached():
+    CountingServer.calls = 0
+
+    async def scenario():
+        gateway = MCPGateway({"ws": loopback_factory(CountingServer)}, cache_ttl=30)
+        try:
+            first = await call(gateway, 1, "ws__calculate", {"expression": "2+2"})
+            second = await call(gateway, 2, "ws__calculate", {"expression": "2+2"})
+            await call(gateway, 3, "ws__get_current_time", {})
+            await call(gateway, 4, "ws__get_current_time", {})
+            return first, second, gateway.stats()
+        finally:
+            await gateway.close()
+
+    first, second, stats = asyncio.run(scenario())
+    assert first["result"] == second["result"]
+    assert second["id"] == 2
+    # calculate once, get_current_time is never cached
+    assert CountingServer.calls == 3
+    assert stats["cache"]["hits"] == 1
+
+
+def test_unknown_tool_and_method():
+    async def scenario():
+        gateway = MCPGateway({"ws": loopback_factory()})
+        try:
+            unknown = await call(gateway, 1, "nope__calculate", {})
+            missing = await gateway.handle_request({"jsonrpc": "2.0", "id": 2, "method": "x"})
+            assert await gateway.handle_line("5") is None
+            return unknown, missing
+        finally:
+            await gateway.close()
+
+    unknown, missing = asyncio.run(scenario())
+    assert "Unknown tool" in unknown["result"]["content"][0]["text"]
+    assert missing["error"]["code"] == -32601
+
+
+def test_failed_reconnect_raises_instead_of_hanging():
+    available = {"up": True}
+
+    def factory():
+        if not available["up"]:
+            raise FileNotFoundError("server command not found")
+        return LoopbackTransport(SimpleMCPServer())
+
+    async def scenario():
+        upstream = Upstream("ws", factory, pool_size=1)
+        await upstream.start()
+        # The server goes away and cannot be restarted
+        await upstream._connections[0].close()
+        available["up"] = False
+        with pytest.raises(ConnectionError):
+            await asyncio.wait_for(upstream.request("tools/list"), 2)
+        for _ in range(3):
+            with pytest.raises(ConnectionError):
+                await asyncio.wait_for(upstream.request("tools/list"), 2)
+
+        # Once it can be started again the slot reconnects
+        available["up"] = True
+        response = await asyncio.wait_for(upstream.request("tools/list"), 2)
+        await upstream.close()
+        return response, upstream.stats()
+
+    response, stats = asyncio.run(scenario())
+    assert len(response["result"]["tools"]) == 3
+    assert stats["pool_size"] == 1
+    assert stats["reconnects"] == 4
+
+
+def test_cancelled_request_does_not_leak_the_connection():
+    class SlowServer(SimpleMCPServer):
+        async def execute_tool(self, tool_name, arguments):
+            await asyncio.sleep(0.5)
+            return await super().execute_tool(tool_name, arguments)
+
+    async def scenario():
+        upstream = Upstream("ws", loopback_factory(SlowServer), pool_size=1)
+        await upstream.start()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(upstream.request("tools/call", {"name": "hello_world", "arguments": {}}), 0.05)
+        # The interrupted connection is replaced, so no stale reply is read here
+        response = await asyncio.wait_for(upstream.request("tools/list"), 2)
+        await upstream.close()
+        return response
+
+    assert "tools" in asyncio.run(scenario())["result"]
@@ -0,0 +1,111 @@
+"""
+🧪 Loopback transport tests
+Protocol behaviour of SimpleMCPServer over LoopbackTransport, no subprocess
+"""
+
+import asyncio
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+from mcp_transport import LoopbackTransport
+from working_mcp_server import SimpleMCPServer
+
+
+def workshop_server_class():
+    path = Path(__file__).resolve().parent.parent / "basic_workshop" / "notebooks" / "workshop_mcp_server.py"
+    spec = importlib.util.spec_from_file_location("workshop_mcp_server", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.SimpleMCPServer
+
+INITIALIZE = {
+    "jsonrpc": "2.0", "id": 1, "method": "initialize",
+    "params": {"protocolVersion": "2024-11-05", "capabilities": {},
+               "clientInfo": {"name": "pytest", "version": "1.0.0"}}
+}
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_handshake():
+    async def scenario():
+        async with LoopbackTransport(SimpleMCPServer()) as transport:
+            return await transport.request(INITIALIZE)
+
+    response = run(scenario())
+    assert response["id"] == 1
+    assert response["result"]["protocolVersion"] == "2024-11-05"
+    assert response["result"]["serverInfo"]["name"] == "workshop-mcp-server"
+
+
+def test_tools_list_and_call():
+    async def scenario():
+        async with LoopbackTransport(SimpleMCPServer()) as transport:
+            await transport.request(INITIALIZE)
+            tools = await transport.request({"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+            call = await transport.request({
+                "jsonrpc": "2.0", "id": 3, "method": "tools/call",
+                "params": {"name": "calculate", "arguments": {"expression": "6*7"}}
+            })
+            return tools, call
+
+    tools, call = run(scenario())
+    assert {tool["name"] for tool in tools["result"]["tools"]} == {"hello_world", "get_current_time", "calculate"}
+    assert call["id"] == 3
+    assert call["result"]["content"][0]["text"] == "🧮 6*7 = 42"
+
+
+def test_malformed_lines_are_skipped_in_order():
+    async def scenario():
+        async with LoopbackTransport(SimpleMCPServer()) as transport:
+            await transport.send_line("not json\n")
+            await transport.send_line("\n")
+            await transport.send({"jsonrpc": "2.0", "id": 7, "method": "tools/list"})
+            await transport.send({"jsonrpc": "2.0", "id": 8, "method": "nope"})
+            return await transport.receive(), await transport.receive()
+
+    first, second = run(scenario())
+    assert first["id"] == 7
+    assert second["id"] == 8
+    assert second["error"]["code"] == -32601
+
+
+def test_concurrent_requests_get_their_own_responses():
+    async def scenario():
+        async with LoopbackTransport(SimpleMCPServer()) as transport:
+            return await asyncio.gather(*(
+                transport.request({"jsonrpc": "2.0", "id": n, "method": "tools/call",
+                                   "params": {"name": "hello_world", "arguments": {"name": str(n)}}})
+                for n in range(20)))
+
+    responses = run(scenario())
+    for n, response in enumerate(responses):
+        assert response["id"] == n
+        assert f"Hello {n}!" in response["result"]["content"][0]["text"]
+
+
+def test_send_after_close_fails():
+    async def scenario():
+        transport = await LoopbackTransport(SimpleMCPServer()).start()
+        await transport.close()
+        assert await transport.receive() is None
+        with pytest.raises(ConnectionError):
+            await transport.send(INITIALIZE)
+
+    run(scenario())
+
+
+@pytest.mark.parametrize("server_class", [SimpleMCPServer, workshop_server_class()],
+                         ids=["working", "workshop"])
+def test_both_servers_skip_non_object_json(server_class):
+    async def scenario():
+        async with LoopbackTransport(server_class()) as transport:
+            for line in ("[1, 2]\n", "5\n", '"ping"\n'):
+                await transport.send_line(line)
+            return await transport.request(INITIALIZE)
+
+    assert run(scenario())["id"] == 1
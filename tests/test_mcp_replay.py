@@ -0,0 +1,68 @@
+"""
+🧪 Recorder and replayer tests
+Record a loopback session with TrafficRecorder and play it back with MCPReplayer
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from mcp_replay import MCPReplayer
+from mcp_transport import LoopbackTransport, TrafficRecorder, read_recording
+from working_mcp_server import SimpleMCPServer
+
+
+async def record_session(path):
+    with TrafficRecorder(path) as recorder:
+        async with recorder.tap(LoopbackTransport(SimpleMCPServer())) as transport:
+            await transport.request({"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}})
+            await transport.send_line("not json\n")
+            await transport.send_line("5\n")
+            await transport.request({"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+            await transport.request({"jsonrpc": "2.0", "id": 3, "method": "tools/call",
+                                     "params": {"name": "get_current_time", "arguments": {}}})
+            await transport.request({"jsonrpc": "2.0", "id": 4, "method": "tools/call",
+                                     "params": {"name": "calculate", "arguments": {"expression": "1+2"}}})
+        return recorder
+
+
+def test_record_and_replay_round_trip(tmp_path):
+    path = str(tmp_path / "session.mcplog")
+    recorder = asyncio.run(record_session(path))
+    assert recorder.raw_lines == 2
+
+    recording = read_recording(path)
+    client_messages = [message for _, _, direction, message in recording["messages"] if direction == ">"]
+    assert client_messages[1:3] == ["not json", "5"]
+
+    report = asyncio.run(MCPReplayer(path, speed=None, transport="loopback").run())
+    assert report["mismatch_count"] == 0
+    assert report["replay"]["responses"] == 4
+
+
+def test_replay_detects_changed_responses(tmp_path):
+    path = str(tmp_path / "session.mcplog")
+    asyncio.run(record_session(path))
+    lines = open(path, encoding="utf-8").read().replace("1+2 = 3", "1+2 = 4")
+    open(path, "w", encoding="utf-8").write(lines)
+
+    report = asyncio.run(MCPReplayer(path, speed=None, transport="loopback").run())
+    assert report["mismatch_count"] == 1
+    assert report["mismatches"][0]["request"]["id"] == 4
+
+
+def test_read_recording_validates_records(tmp_path):
+    path = tmp_path / "old.mcplog"
+    path.write_text(json.dumps({"format": "mcp-recording", "version": 1}) + "\n"
+                    + json.dumps([0.1, 1, ">", 5]) + "\n", encoding="utf-8")
+    assert read_recording(str(path))["messages"] == [(0.1, 1, ">", "5")]
+
+    path.write_text(json.dumps([0.1, 1, "?", {}]) + "\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        read_recording(str(path))
+
+
+def test_server_skips_non_object_json():
+    assert asyncio.run(SimpleMCPServer().handle_line("5")) is None
+    assert asyncio.run(SimpleMCPServer().handle_line("[1, 2]")) is None
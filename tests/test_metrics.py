@@ -0,0 +1,57 @@
+"""
+🧪 Metrics tests
+Histogram percentiles, per-call-site aggregation and cost accounting
+"""
+
+import random
+
+import pytest
+
+from llm_client import Histogram, MetricsRegistry
+
+
+def test_percentiles_are_interpolated_inside_buckets():
+    rng = random.Random(7)
+    values = [rng.uniform(0.0001, 0.0004) for _ in range(1000)]
+    histogram = Histogram()
+    for value in values:
+        histogram.observe(value)
+    values.sort()
+    for pct in (50, 95, 99):
+        exact = values[int(pct / 100 * len(values)) - 1]
+        assert histogram.percentile(pct) == pytest.approx(exact, rel=0.1)
+    summary = histogram.summary()
+    assert summary["p50_ms"] == pytest.approx(summary["mean_ms"], rel=0.1)
+
+
+def test_single_value_is_reported_exactly():
+    histogram = Histogram()
+    histogram.observe(0.0123)
+    assert histogram.percentile(50) == pytest.approx(0.0123)
+    assert histogram.percentile(99) == pytest.approx(0.0123)
+    assert Histogram().percentile(50) is None
+
+
+def test_values_past_the_last_bucket_use_the_max():
+    histogram = Histogram(buckets=(1.0,))
+    for value in (0.5, 3.0, 5.0):
+        histogram.observe(value)
+    assert histogram.percentile(100) == 5.0
+    assert 1.0 <= histogram.percentile(50) <= 5.0
+
+
+def test_summary_by_call_site_and_cost():
+    metrics = MetricsRegistry(cost_table={"gpt-4": (30.0, 60.0)})
+    usage = {"prompt_tokens": 1000, "completion_tokens": 500}
+    metrics.record("gpt-4", "app.answer", 0.2, ttfb=0.1, connect=0.0002, usage=usage)
+    metrics.record("gpt-4", "app.summarize", 0.4, ttfb=0.3, usage=usage, ok=False)
+    metrics.record_cache_hit("gpt-4", "app.answer")
+
+    by_model = metrics.summary()["gpt-4"]
+    assert by_model["calls"] == 2
+    assert by_model["errors"] == 1
+    assert by_model["cache_hits"] == 1
+    assert by_model["cost_usd"] == pytest.approx(2 * (1000 * 30.0 + 500 * 60.0) / 1_000_000)
+    assert by_model["total"]["p50_ms"] == pytest.approx(200.0, rel=0.3)
+    assert by_model["connect"]["p50_ms"] == pytest.approx(0.2, rel=0.01)
+    assert by_model["total"]["max_ms"] == 400.0
@@ -0,0 +1,50 @@
+"""
+🧪 Mock server tests
+The OpenAI-compatible surface the client tests rely on
+"""
+
+import json
+import random
+
+import requests
+
+from mock_llm_server import MockLLMServer, load_script, parse_latency
+
+
+def test_models_and_completion(mock_server):
+    models = requests.get(f"{mock_server.url}/models").json()
+    assert "gpt-3.5-turbo" in [model["id"] for model in models["data"]]
+
+    response = requests.post(f"{mock_server.url}/chat/completions", json={
+        "model": "gpt-3.5-turbo", "max_tokens": 5,
+        "messages": [{"role": "user", "content": "hello there"}]})
+    body = response.json()
+    assert response.status_code == 200
+    assert body["usage"]["completion_tokens"] == 5
+    assert body["choices"][0]["message"]["content"].startswith("Mock answer to: hello")
+
+
+def test_unknown_model_is_404(mock_server):
+    response = requests.post(f"{mock_server.url}/chat/completions",
+                             json={"model": "nope", "messages": []})
+    assert response.status_code == 404
+
+
+def test_scripted_answers_and_injected_errors(tmp_path):
+    path = tmp_path / "script.json"
+    path.write_text(json.dumps([{"match": "weather", "response": "It is sunny."}]))
+    with MockLLMServer(port=0, script=load_script(str(path)), error_rate=1.0, error_statuses=(429,)) as server:
+        payload = {"model": "gpt-4", "messages": [{"role": "user", "content": "weather?"}]}
+        failed = requests.post(f"{server.url}/chat/completions", json=payload)
+        assert failed.status_code == 429
+        assert failed.headers["Retry-After"] == "1"
+        server.error_rate = 0.0
+        answer = requests.post(f"{server.url}/chat/completions", json=payload).json()
+        assert answer["choices"][0]["message"]["content"] == "It is sunny."
+        assert server.stats()["errors"] == 1
+
+
+def test_parse_latency():
+    rng = random.Random(0)
+    assert parse_latency("fixed:0.25")(rng) == 0.25
+    assert 0.1 <= parse_latency("uniform:0.1,0.2")(rng) <= 0.2
@@ -0,0 +1,146 @@
+"""
+🧪 Rate limit tests
+Token buckets, AIMD concurrency and how the client holds and reconciles permits
+"""
+
+import pytest
+
+from llm_client import ModelLimits, RateLimiter, RateLimitTimeout
+from llm_client.rate_limit import AIMDConcurrency, TokenBucket
+from llm_client.tokens import estimate_messages_tokens
+
+
+def test_token_bucket_reserves_into_debt():
+    bucket = TokenBucket(rate=1.0, capacity=2)
+    assert bucket.reserve(1) == 0.0
+    assert bucket.reserve(1) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0, abs=0.05)
+    bucket.refund(1)
+    assert bucket.available == pytest.approx(0.0, abs=0.05)
+
+
+def test_aimd_halves_once_per_burst():
+    concurrency = AIMDConcurrency(initial=8)
+    admitted = [concurrency.acquire() for _ in range(3)]
+    for admitted_at in admitted:
+        concurrency.release(admitted_at, overloaded=True)
+    assert concurrency.limit == 4
+    assert concurrency.decreases == 1
+
+    # A call admitted after the cut may cut again
+    concurrency.release(concurrency.acquire(), overloaded=True)
+    assert concurrency.limit == 2
+    concurrency.release(concurrency.acquire(), overloaded=False)
+    assert concurrency.limit == 2.5
+    assert concurrency.in_flight == 0
+
+
+def test_acquire_times_out_and_gives_tokens_back():
+    limiter = RateLimiter({"*": ModelLimits(requests_per_minute=60, burst_seconds=1)}, max_wait=0.1)
+    with limiter.acquire("gpt-4"):
+        pass
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire("gpt-4")
+    assert limiter.stats()["gpt-4"]["requests_available"] == pytest.approx(0.0, abs=0.1)
+
+
+def test_unlisted_models_are_not_limited():
+    limiter = RateLimiter({"gpt-4": ModelLimits(requests_per_minute=1)})
+    with limiter.acquire("gpt-3.5-turbo") as permit:
+        permit.observe(429)
+    assert limiter.stats() == {}
+
+
+def test_429_shrinks_the_concurrency_limit(make_client, mock_server):
+    limiter = RateLimiter({"*": ModelLimits(initial_concurrency=4)})
+    client = make_client(rate_limiter=limiter)
+    mock_server.error_rate = 1.0
+    mock_server.error_statuses = [429]
+    with pytest.raises(Exception):
+        client.generate("hello", model="gpt-4")
+    stats = limiter.stats()["gpt-4"]
+    assert stats["concurrency_limit"] == 2
+    assert stats["overloaded"] == 1
+    assert stats["in_flight"] == 0
+
+
+def token_limiter():
+    # 1 token/s with a large bucket, so refills cannot blur the assertions
+    return RateLimiter({"*": ModelLimits(tokens_per_minute=60, burst_seconds=1000)})
+
+
+def test_completion_usage_is_reconciled(make_client):
+    limiter = token_limiter()
+    client = make_client(rate_limiter=limiter)
+    result = client.chat([{"role": "user", "content": "hello"}], model="gpt-4", max_tokens=200)
+    used = result["usage"]["total_tokens"]
+    assert limiter.stats()["gpt-4"]["tokens_available"] == pytest.approx(1000 - used, abs=1)
+
+
+def test_stream_holds_its_permit_until_closed(make_client):
+    limiter = token_limiter()
+    client = make_client(rate_limiter=limiter)
+    messages = [{"role": "user", "content": "hello"}]
+    stream = client.stream_chat(messages, model="gpt-4", max_tokens=200)
+    assert limiter.stats()["gpt-4"]["in_flight"] == 1
+    next(iter(stream))
+    stream.close()
+    stats = limiter.stats()["gpt-4"]
+    assert stats["in_flight"] == 0
+    # No usage in the stream: the prompt estimate plus the deltas received
+    used = estimate_messages_tokens(messages) + stream.stats.completion_tokens
+    assert stats["tokens_available"] == pytest.approx(1000 - used, abs=1)
+
+
+def test_exhausted_stream_is_reconciled_with_reported_usage(make_client):
+    limiter = token_limiter()
+    client = make_client(rate_limiter=limiter)
+    with client.stream_generate("hello", model="gpt-4", max_tokens=200,
+                                stream_options={"include_usage": True}) as stream:
+        stream.read()
+        assert limiter.stats()["gpt-4"]["in_flight"] == 0
+    used = stream.stats.usage["total_tokens"]
+    assert limiter.stats()["gpt-4"]["tokens_available"] == pytest.approx(1000 - used, abs=1)
+
+
+def test_embedding_usage_is_reconciled(make_client, monkeypatch):
+    pytest.importorskip("numpy")
+    from llm_client import EmbeddingClient
+
+    limiter = token_limiter()
+    reconciled = []
+    monkeypatch.setattr(limiter, "reconcile", lambda *args: reconciled.append(args))
+    with EmbeddingClient(make_client(rate_limiter=limiter)) as embedder:
+        embedder.embed(["x" * 400])
+    assert reconciled == [("text-embedding-3-small", 100, 100)]
+
+
+def test_retried_attempts_refund_their_reservation(make_client, mock_server):
+    from llm_client import RetryPolicy
+
+    limiter = RateLimiter({"*": ModelLimits(requests_per_minute=60, tokens_per_minute=60,
+                                            burst_seconds=1000)})
+    client = make_client(rate_limiter=limiter,
+                         retry_policy=RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.01))
+    mock_server.error_rate = 1.0
+    mock_server.error_statuses = [503]
+    with pytest.raises(Exception):
+        client.generate("hello", model="gpt-4", max_tokens=200)
+    stats = limiter.stats()["gpt-4"]
+    assert stats["refunded"] == 3
+    assert stats["requests_available"] == pytest.approx(1000, abs=1)
+    assert stats["tokens_available"] == pytest.approx(1000, abs=1)
+
+
+def test_oversized_reservation_is_refunded_as_debited():
+    limiter = RateLimiter({"*": ModelLimits(tokens_per_minute=60, burst_seconds=10)})
+    with limiter.acquire("gpt-4", tokens=500) as permit:
+        assert permit.reserved_tokens == 10
+    # Only the 10 debited tokens can come back, less the 4 used
+    limiter.reconcile("gpt-4", 500, 4)
+    assert limiter.stats()["gpt-4"]["tokens_available"] == pytest.approx(6, abs=0.1)
+
+    with limiter.acquire("gpt-4", tokens=6) as permit:
+        permit.refund()
+        permit.refund()
+    assert limiter.stats()["gpt-4"]["tokens_available"] == pytest.approx(6, abs=0.1)
@@ -0,0 +1,112 @@
+"""
+🧪 Retry and circuit breaker tests
+Backoff, Retry-After and breaker transitions, alone and against the mock server
+"""
+
+import pytest
+
+from llm_client import CircuitBreaker, CircuitOpenError, LLMError, RetryPolicy
+from llm_client.resilience import Retrier, parse_retry_after
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def close(self):
+        pass
+
+
+def scripted(*statuses):
+    """A send() returning the given statuses in turn"""
+    remaining = list(statuses)
+    calls = []
+
+    def send():
+        status = remaining.pop(0)
+        calls.append(status)
+        return FakeResponse(status, {"Retry-After": "2"} if status == 429 else {})
+
+    send.calls = calls
+    return send
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_retries_until_success_and_honours_retry_after():
+    delays = []
+    retrier = Retrier(RetryPolicy(max_attempts=4, base_delay=0.01), sleep=delays.append, seed=0)
+    send = scripted(503, 429, 200)
+    assert retrier.call(send).status_code == 200
+    assert send.calls == [503, 429, 200]
+    assert len(delays) == 2
+    assert delays[1] >= 2.0
+    assert retrier.stats()["retries"] == 2
+
+
+def test_client_errors_are_not_retried():
+    retrier = Retrier(RetryPolicy(max_attempts=4), sleep=lambda delay: None)
+    send = scripted(400, 200)
+    assert retrier.call(send).status_code == 400
+    assert send.calls == [400]
+
+
+def test_gives_up_after_max_attempts():
+    retrier = Retrier(RetryPolicy(max_attempts=3, base_delay=0.01),
+                      CircuitBreaker(failure_threshold=0), sleep=lambda delay: None)
+    assert retrier.call(scripted(500, 500, 500, 200)).status_code == 500
+    assert retrier.stats()["gave_up"] == 1
+
+
+def test_breaker_opens_then_probe_closes_it():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    retrier = Retrier(RetryPolicy(max_attempts=1), breaker, sleep=lambda delay: None)
+    retrier.call(scripted(503))
+    retrier.call(scripted(503))
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        retrier.call(scripted(200))
+
+    breaker._opened_at -= 10
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert retrier.call(scripted(200)).status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_429s_never_open_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=2)
+    retrier = Retrier(RetryPolicy(max_attempts=1), breaker, sleep=lambda delay: None)
+    for _ in range(10):
+        assert retrier.call(scripted(429)).status_code == 429
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.stats()["consecutive_failures"] == 0
+
+
+def test_client_retries_against_mock(make_client, mock_server):
+    mock_server.error_rate = 1.0
+    mock_server.error_statuses = [503]
+    client = make_client(retry_policy=RetryPolicy(max_attempts=3, base_delay=0.01))
+    # The endpoint recovers while the client backs off
+    client.retrier.sleep = lambda delay: setattr(mock_server, "error_rate", 0.0)
+    result = client.chat([{"role": "user", "content": "hi"}], model="gpt-4", max_tokens=3)
+    assert result["usage"]["completion_tokens"] == 3
+    assert mock_server.stats()["errors"] == 1
+    assert client.retrier.stats()["retries"] == 1
+
+
+def test_client_breaker_fails_fast(make_client, mock_server):
+    mock_server.error_rate = 1.0
+    mock_server.error_statuses = [500]
+    client = make_client(circuit_breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+    for _ in range(2):
+        with pytest.raises(LLMError):
+            client.chat([{"role": "user", "content": "hi"}], model="gpt-4")
+    with pytest.raises(CircuitOpenError):
+        client.chat([{"role": "user", "content": "hi"}], model="gpt-4")
+    assert mock_server.stats()["errors"] == 2
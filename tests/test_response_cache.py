@@ -0,0 +1,108 @@
+"""
+🧪 Response cache tests
+Content-addressed keys, modes, TTL and eviction, and the client's use of the cache
+"""
+
+import time
+
+import pytest
+
+from llm_client import ResponseCache
+from llm_client.cache import is_deterministic, payload_key
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(directory=str(tmp_path), mode="deterministic")
+    yield cache
+    cache.close()
+
+
+def test_key_ignores_key_order_but_not_endpoint():
+    a = {"model": "m", "messages": [], "temperature": 0}
+    b = {"temperature": 0, "messages": [], "model": "m"}
+    assert payload_key(a, "https://one") == payload_key(b, "https://one")
+    assert payload_key(a, "https://one") != payload_key(a, "https://two")
+
+
+def test_modes(cache):
+    assert is_deterministic({"temperature": 0})
+    assert is_deterministic({"temperature": 0.7, "seed": 3})
+    assert not is_deterministic({"temperature": 0.7})
+    assert not is_deterministic({"temperature": 0, "stream": True})
+    assert cache.should_cache({"temperature": 0})
+    assert not cache.should_cache({"temperature": 0.7})
+    assert cache.should_cache({"temperature": 0.7}, opt_in=True)
+    assert not cache.should_cache({"temperature": 0}, opt_in=False)
+
+
+def test_ttl_and_lru_eviction(tmp_path):
+    cache = ResponseCache(directory=str(tmp_path), ttl=0.05, max_entries=2)
+    cache.put("a", {"n": 1})
+    cache.put("b", {"n": 2})
+    assert cache.get("a") == {"n": 1}
+    cache.put("c", {"n": 3})
+    # "b" was the least recently used
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert cache.stats()["expired"] >= 1
+    cache.close()
+
+
+def test_client_serves_repeats_from_cache(make_client, mock_server, cache):
+    client = make_client(cache=cache)
+    payload = {"model": "gpt-3.5-turbo", "temperature": 0, "max_tokens": 5,
+               "messages": [{"role": "user", "content": "cache me"}]}
+    first = client.complete(dict(payload))
+    second = client.complete(dict(payload))
+    assert first == second
+    assert mock_server.stats()["completions"] == 1
+    assert cache.stats()["hits"] == 1
+
+    # Sampled requests are not cached in deterministic mode
+    client.complete(dict(payload, temperature=0.7))
+    client.complete(dict(payload, temperature=0.7))
+    assert mock_server.stats()["completions"] == 3
+
+
+def test_cache_persists_across_instances(tmp_path):
+    first = ResponseCache(directory=str(tmp_path))
+    first.put("k", {"answer": 42})
+    first.close()
+    second = ResponseCache(directory=str(tmp_path))
+    assert second.get("k") == {"answer": 42}
+    second.close()
+
+
+def test_running_totals_match_the_table(tmp_path):
+    cache = ResponseCache(directory=str(tmp_path), ttl=None, max_bytes=40)
+    statements = []
+    cache._db.set_trace_callback(statements.append)
+    cache.put("a", {"text": "x" * 10})
+    cache.put("a", {"text": "y" * 12})
+    cache.put("b", {"text": "z" * 10})
+    # Over max_bytes: "a" was least recently used and goes
+    assert cache.get("a") is None
+    # Writes never total the whole table
+    assert not any("COUNT(*)" in s and "WHERE" not in s for s in statements)
+    stats = cache.stats()
+    cache._db.set_trace_callback(None)
+    count, size = cache._db.execute("SELECT COUNT(*), SUM(size) FROM responses").fetchone()
+    assert (stats["entries"], stats["bytes"]) == (count, size) == (1, 21)
+    assert stats["evictions"] == 1
+    cache.close()
+
+    # A new instance loads the totals once
+    reopened = ResponseCache(directory=str(tmp_path))
+    assert (reopened.stats()["entries"], reopened.stats()["bytes"]) == (1, 21)
+    reopened.clear()
+    assert reopened.stats()["entries"] == 0
+    reopened.close()
+
+
+def test_uncacheable_calls_are_counted_as_bypassed(make_client, cache):
+    client = make_client(cache=cache)
+    client.chat([{"role": "user", "content": "hi"}], model="gpt-4", temperature=0.7)
+    assert cache.stats()["bypassed"] == 1
@@ -0,0 +1,89 @@
+"""
+🧪 Router tests
+Confidence checks, route matching and escalation down a cascade
+"""
+
+from llm_client import CascadeRouter, ConfidenceCheck, Route
+from mock_llm_server import load_script
+
+
+def answer(text, finish_reason="stop", model="gpt-3.5-turbo"):
+    return {"model": model, "choices": [{"message": {"role": "assistant", "content": text},
+                                         "finish_reason": finish_reason}]}
+
+
+def test_confidence_check():
+    check = ConfidenceCheck()
+    assert check({}, answer("Paris is the capital of France."))
+    assert not check({}, answer("   "))
+    assert not check({}, answer("I'm not sure which city that is."))
+    assert not check({}, {"choices": []})
+
+
+def test_truncation_at_the_callers_max_tokens_is_accepted():
+    check = ConfidenceCheck()
+    assert check({"max_tokens": 100}, answer("A long answer that", finish_reason="length"))
+    assert not check({}, answer("A long answer that", finish_reason="length"))
+
+
+def test_low_mean_logprob_is_rejected():
+    check = ConfidenceCheck(min_mean_logprob=-1.0)
+    result = answer("Maybe")
+    result["choices"][0]["logprobs"] = {"content": [{"logprob": -3.0}, {"logprob": -0.5}]}
+    assert not check({}, result)
+
+
+def test_route_matching():
+    router = CascadeRouter({"app.summarize": ["a"], "answer": ["b"], "*": ["c"]})
+    assert router.models_for("app.summarize") == ["a"]
+    assert router.models_for("other.answer") == ["b"]
+    assert router.models_for("app.anything") == ["c"]
+    assert CascadeRouter().models_for("app.anything", default=["d"]) == ["d"]
+
+
+class FakeClient:
+    """Answers from ``replies[model]`` and records the models asked"""
+
+    def __init__(self, replies):
+        self.replies = replies
+        self.asked = []
+
+    def complete(self, payload, call_site=None, **kwargs):
+        self.asked.append(payload["model"])
+        return answer(self.replies[payload["model"]], model=payload["model"])
+
+
+def test_rejected_answer_escalates():
+    router = CascadeRouter({"answer": ["small", "large"]})
+    client = FakeClient({"small": "I don't know.", "large": "42"})
+    result = router.complete(client, {"messages": [], "max_tokens": 50}, "app.answer")
+    assert result["model"] == "large"
+    assert client.asked == ["small", "large"]
+    stats = router.stats()["app.answer"]
+    assert (stats["calls"], stats["escalations"]) == (1, 1)
+    assert stats["served_by"] == {"large": 1}
+
+
+def test_accepted_answer_stays_on_the_cheap_model():
+    router = CascadeRouter({"answer": Route(["small", "large"], verifier=lambda payload, result: True)})
+    client = FakeClient({"small": "I don't know.", "large": "42"})
+    assert router.complete(client, {"messages": []}, "app.answer")["model"] == "small"
+    assert client.asked == ["small"]
+
+
+def test_default_route_never_escalates():
+    router = CascadeRouter()
+    client = FakeClient({"gpt-3.5-turbo": "I'm not sure."})
+    assert router.complete(client, {"messages": []}, "app.answer")["model"] == "gpt-3.5-turbo"
+    assert router.stats()["app.answer"]["escalations"] == 0
+
+
+def test_client_routes_calls_without_a_model(make_client, mock_server, tmp_path):
+    script = tmp_path / "script.json"
+    script.write_text('[{"match": "capital", "response": "I am not sure, sorry."}]')
+    mock_server.script = load_script(str(script))
+    client = make_client(router=CascadeRouter({"*": ["gpt-3.5-turbo", "gpt-4"]}))
+    result = client.chat([{"role": "user", "content": "What is the capital of Peru?"}], call_site="app.ask")
+    assert result["model"] == "gpt-4"
+    assert mock_server.counters["completions"] == 2
+    assert client.router.stats()["app.ask"]["escalations"] == 1
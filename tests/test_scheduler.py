@@ -0,0 +1,98 @@
+"""
+🧪 Priority scheduler tests
+Strict priority, weighted fair sharing, class caps and preemption of queued work
+"""
+
+import threading
+
+import pytest
+
+from llm_client import PriorityClass, PriorityScheduler, RequestPreempted
+
+
+class Gate:
+    """Holds a scheduler slot until ``open()``"""
+
+    def __init__(self):
+        self.entered = threading.Event()
+        self.released = threading.Event()
+
+    def __call__(self):
+        self.entered.set()
+        self.released.wait(5)
+
+    def open(self):
+        self.released.set()
+
+
+def blocked(scheduler, klass):
+    gate = Gate()
+    scheduler.submit(klass, gate)
+    assert gate.entered.wait(5)
+    return gate
+
+
+def test_higher_priority_runs_first(client):
+    order = []
+    with PriorityScheduler(client, max_concurrency=1) as scheduler:
+        gate = blocked(scheduler, "batch")
+        futures = [scheduler.submit("batch", order.append, f"batch-{n}") for n in range(3)]
+        futures += [scheduler.submit("interactive", order.append, f"interactive-{n}") for n in range(2)]
+        gate.open()
+        for future in futures:
+            future.result(5)
+    assert order == ["interactive-0", "interactive-1", "batch-0", "batch-1", "batch-2"]
+
+
+def test_weights_share_dispatches_within_a_priority(client):
+    order = []
+    classes = {"gold": PriorityClass(weight=3), "bronze": PriorityClass(weight=1)}
+    with PriorityScheduler(client, max_concurrency=1, classes=classes) as scheduler:
+        gate = blocked(scheduler, "gold")
+        futures = []
+        for n in range(8):
+            futures.append(scheduler.submit("bronze", order.append, "bronze"))
+            futures.append(scheduler.submit("gold", order.append, "gold"))
+        gate.open()
+        for future in futures:
+            future.result(5)
+    assert order[:8].count("gold") == 6
+    assert len(order) == 16
+
+
+def test_class_cap_leaves_slots_for_other_classes(client):
+    classes = {"interactive": PriorityClass(priority=0),
+               "batch": PriorityClass(priority=1, max_concurrency=1)}
+    with PriorityScheduler(client, max_concurrency=2, classes=classes) as scheduler:
+        gate = blocked(scheduler, "batch")
+        waiting = scheduler.submit("batch", lambda: "batch")
+        # The second slot is free, but batch is at its cap
+        assert scheduler.submit("interactive", lambda: "interactive").result(5) == "interactive"
+        assert not waiting.done()
+        gate.open()
+        assert waiting.result(5) == "batch"
+
+
+def test_full_queue_preempts_lower_priority_work(client):
+    with PriorityScheduler(client, max_concurrency=1, max_queue=2) as scheduler:
+        gate = blocked(scheduler, "interactive")
+        first = scheduler.submit("batch", lambda: "first")
+        newest = scheduler.submit("batch", lambda: "newest")
+        urgent = scheduler.submit("interactive", lambda: "urgent")
+        with pytest.raises(RequestPreempted):
+            newest.result(1)
+        # Nothing below batch to evict: the new call is rejected instead
+        with pytest.raises(RequestPreempted):
+            scheduler.submit("batch", lambda: "rejected").result(1)
+        gate.open()
+        assert (urgent.result(5), first.result(5)) == ("urgent", "first")
+        assert scheduler.stats()["batch"]["preempted"] == 2
+
+
+def test_client_calls_through_the_scheduler(client, mock_server):
+    with PriorityScheduler(client, max_concurrency=2) as scheduler:
+        text = scheduler.generate("hello", model="gpt-4", priority_class="batch")
+        stats = scheduler.stats()
+    assert text.startswith("Mock answer to: hello")
+    assert stats["batch"]["completed"] == 1
+    assert stats["batch"]["wait"]["count"] == 1
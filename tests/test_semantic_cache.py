@@ -0,0 +1,69 @@
+"""
+🧪 Semantic cache tests
+Near-duplicate prompts, scoping, expiry and which requests may use the cache
+"""
+
+import time
+
+from llm_client import SemanticCache
+from llm_client.semantic_cache import HashingEmbedder
+
+
+def payload(prompt, temperature=0, model="gpt-3.5-turbo"):
+    return {"model": model, "temperature": temperature, "max_tokens": 20,
+            "messages": [{"role": "user", "content": prompt}]}
+
+
+def test_rewording_hits_and_other_scope_misses():
+    cache = SemanticCache(threshold=0.8)
+    scope, prompt = cache.split_payload(payload("What is the capital of France?"))
+    cache.store(scope, prompt, {"answer": "Paris"})
+
+    scope2, prompt2 = cache.split_payload(payload("what is the capital of france"))
+    assert cache.lookup(scope2, prompt2)["response"] == {"answer": "Paris"}
+
+    other_scope, _ = cache.split_payload(payload("What is the capital of France?", model="gpt-4"))
+    assert cache.lookup(other_scope, prompt) is None
+    assert cache.lookup(scope, "Explain quantum tunnelling to a child") is None
+
+
+def test_expired_nearest_does_not_hide_valid_match():
+    cache = SemanticCache(threshold=0.5, ttl=0.05)
+    scope, _ = cache.split_payload(payload("x"))
+    cache.store(scope, "how do I bake sourdough bread", {"answer": "old"})
+    time.sleep(0.06)
+    cache.store(scope, "how do I bake sourdough bread at home", {"answer": "new"})
+
+    hit = cache.lookup(scope, "how do I bake sourdough bread")
+    assert hit["response"] == {"answer": "new"}
+    assert cache.stats()["expired"] == 1
+
+
+def test_only_greedy_requests_use_it_by_default():
+    assert SemanticCache.should_cache(payload("hi", temperature=0))
+    assert not SemanticCache.should_cache(payload("hi", temperature=0.7))
+    assert not SemanticCache.should_cache({"messages": []})
+    assert SemanticCache.should_cache(payload("hi", temperature=0.7), opt_in=True)
+    assert not SemanticCache.should_cache(payload("hi", temperature=0), opt_in=False)
+
+
+def test_client_skips_semantic_cache_for_sampled_requests(make_client, mock_server):
+    client = make_client(semantic_cache=SemanticCache(threshold=0.8))
+    client.complete(payload("Tell me a joke about cats", temperature=0.7))
+    client.complete(payload("tell me a joke about cats!", temperature=0.7))
+    assert mock_server.stats()["completions"] == 2
+
+    client.complete(payload("Tell me a joke about dogs"))
+    client.complete(payload("tell me a joke about dogs!"))
+    assert mock_server.stats()["completions"] == 3
+
+    client.complete(payload("Tell me a joke about cats", temperature=0.7), cache=True)
+    client.complete(payload("tell me a joke about cats!", temperature=0.7), cache=True)
+    assert mock_server.stats()["completions"] == 4
+
+
+def test_embedder_is_deterministic_and_normalized():
+    embed = HashingEmbedder(64)
+    vector = embed("same text")
+    assert vector == embed("same text")
+    assert abs(sum(value * value for value in vector) - 1.0) < 1e-9
@@ -0,0 +1,84 @@
+"""
+🧪 Single-flight tests
+Sharing one call between concurrent callers, per-caller timeouts and copies
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from llm_client import CoalescedWaitTimeout, SingleFlight
+from mock_llm_server import parse_latency
+
+
+def slow(result, seconds=0.2, calls=None):
+    def call():
+        if calls is not None:
+            calls.append(threading.current_thread().name)
+        time.sleep(seconds)
+        return result
+    return call
+
+
+def test_concurrent_callers_share_one_call_and_get_copies():
+    flight = SingleFlight()
+    calls = []
+    call = slow({"choices": [{"text": "hi"}]}, calls=calls)
+    with ThreadPoolExecutor(4) as pool:
+        outcomes = list(pool.map(lambda _: flight.do("key", call), range(4)))
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in outcomes) == [False, True, True, True]
+    results = [result for result, _ in outcomes]
+    assert all(result == {"choices": [{"text": "hi"}]} for result in results)
+    assert len({id(result) for result in results}) == 4
+    assert flight.stats()["coalesced"] == 3
+
+
+def test_lone_caller_runs_inline_without_a_copy():
+    flight = SingleFlight()
+    result = {"choices": []}
+    calls = []
+    assert flight.do("key", slow(result, 0, calls)) == (result, False)
+    assert flight.do("key", lambda: result)[0] is result
+    assert calls == [threading.current_thread().name]
+
+
+def test_first_caller_is_bounded_by_its_own_timeout():
+    flight = SingleFlight()
+    started = time.perf_counter()
+    with pytest.raises(CoalescedWaitTimeout):
+        flight.do("key", slow("late", 0.5), timeout=0.05)
+    assert time.perf_counter() - started < 0.3
+
+    # The call kept running: a caller arriving now joins it
+    assert flight.do("key", slow("other"), timeout=2) == ("late", True)
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_errors_reach_every_caller():
+    flight = SingleFlight()
+
+    def fail():
+        time.sleep(0.1)
+        raise ValueError("upstream broke")
+
+    with ThreadPoolExecutor(3) as pool:
+        futures = [pool.submit(flight.do, "key", fail) for _ in range(3)]
+    for future in futures:
+        with pytest.raises(ValueError, match="upstream broke"):
+            future.result()
+    assert flight.stats()["upstream_calls"] == 1
+
+
+def test_client_sends_identical_concurrent_completions_once(client, mock_server):
+    mock_server.sample_latency = parse_latency("fixed:0.2")
+    messages = [{"role": "user", "content": "same question"}]
+    with ThreadPoolExecutor(5) as pool:
+        results = list(pool.map(lambda _: client.chat(messages, model="gpt-4", temperature=0), range(5)))
+    assert mock_server.counters["completions"] == 1
+    assert all(result == results[0] for result in results)
+    results[0]["choices"].clear()
+    assert results[1]["choices"]
+    assert client.single_flight.stats()["coalesced"] == 4
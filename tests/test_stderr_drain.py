@@ -0,0 +1,33 @@
+"""
+🧪 Stderr drain tests
+A chatty child process must never block on a full stderr pipe
+"""
+
+import subprocess
+import sys
+
+from mcp_transport import StderrRingLog, drain_stderr
+
+
+def test_ring_log_is_bounded():
+    log = StderrRingLog(max_lines=3, max_line_length=5)
+    for line in ["one\n", "two\n", "three\n", "fourteen\n"]:
+        log.append(line)
+    assert log.tail() == ["two", "three", "fourt…"]
+    assert log.tail(1) == ["fourt…"]
+    assert log.stats()["lines_dropped"] == 1
+    assert log.stats()["lines_truncated"] == 1
+
+
+def test_drain_keeps_a_chatty_process_running():
+    # Far more than an OS pipe buffer holds
+    script = "import sys\nfor n in range(50000): print('log line', n, file=sys.stderr)\nprint('done')"
+    process = subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE,
+                               stderr=subprocess.PIPE, text=True)
+    drain = drain_stderr(process, max_lines=100)
+    stdout = process.stdout.read()
+    process.wait(timeout=30)
+    drain.join(timeout=5)
+    assert stdout.strip() == "done"
+    assert drain.stats()["lines_total"] == 50000
+    assert drain.tail(1) == ["log line 49999"]
@@ -0,0 +1,99 @@
+"""
+🧪 Streaming tests
+SSE parsing across arbitrary chunk boundaries and streamed completions from the mock
+"""
+
+import json
+
+import pytest
+
+from llm_client import LLMError
+from llm_client.streaming import ChatStream, SSEParser
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, body):
+        self.body = body.encode("utf-8")
+        self.closed = False
+
+    def iter_content(self, chunk_size=None):
+        yield self.body
+
+    def close(self):
+        self.closed = True
+
+
+def test_sse_events_split_across_chunks():
+    body = ('data: {"a": 1}\n\n'
+            ': keep-alive\n\n'
+            'event: message\r\ndata: first line\r\ndata: second line\r\n\r\n'
+            'data: [DONE]\n\n').encode("utf-8")
+    for size in (1, 2, 3, 7, len(body)):
+        parser = SSEParser()
+        events = []
+        for start in range(0, len(body), size):
+            events += parser.feed(body[start:start + size])
+        events += parser.flush()
+        assert events == ['{"a": 1}', "first line\nsecond line", "[DONE]"]
+
+
+def test_multibyte_characters_split_across_chunks():
+    body = 'data: {"text": "héllo 👋"}\n\n'.encode("utf-8")
+    parser = SSEParser()
+    events = []
+    for byte in body:
+        events += parser.feed(bytes([byte]))
+    assert json.loads(events[0])["text"] == "héllo 👋"
+
+
+def test_unterminated_event_is_flushed():
+    parser = SSEParser()
+    assert parser.feed("data: tail") == []
+    assert parser.flush() == ["tail"]
+
+
+def test_stream_chat_yields_deltas(client):
+    stream = client.stream_generate("count for me", model="gpt-3.5-turbo", max_tokens=8,
+                                    stream_options={"include_usage": True})
+    deltas = list(stream)
+    assert len(deltas) == 8
+    assert "".join(deltas) == stream.text
+    assert stream.stats.finish_reason == "stop"
+    assert stream.stats.completion_tokens == 8
+    assert stream.stats.time_to_first_token is not None
+    assert client.metrics.summary()["gpt-3.5-turbo"]["completion_tokens"] == 8
+
+
+def test_stream_closed_early_still_records_the_call(client):
+    stream = client.stream_generate("hello", model="gpt-4", max_tokens=20)
+    next(iter(stream))
+    stream.close()
+    assert client.metrics.summary()["gpt-4"]["calls"] == 1
+
+
+def test_non_object_events_are_skipped():
+    delta = json.dumps({"choices": [{"delta": {"content": "hi"}}]})
+    stream = ChatStream(FakeResponse(f'data: [1, 2]\n\ndata: "error"\n\ndata: 7\n\ndata: {delta}\n\ndata: [DONE]\n\n'))
+    assert stream.read() == "hi"
+    assert stream.stats.chunks == 1
+    assert stream.stats.ok is True
+
+
+def test_failed_or_truncated_streams_are_not_ok():
+    finished = []
+    stream = ChatStream(FakeResponse('data: {"error": {"message": "overloaded"}}\n\n'), on_finish=finished.append)
+    with pytest.raises(LLMError):
+        stream.read()
+    truncated = ChatStream(FakeResponse('data: {"choices": []}\n\n'), on_finish=finished.append)
+    truncated.read()
+    assert [stats.ok for stats in finished] == [False, False]
+
+
+def test_stream_outcome_reaches_the_metrics(client):
+    client.stream_generate("hello", model="gpt-4", max_tokens=5).read()
+    stream = client.stream_generate("hello", model="gpt-4", max_tokens=20)
+    next(iter(stream))
+    stream.close()
+    assert client.metrics.summary()["gpt-4"]["errors"] == 1
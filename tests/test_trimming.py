@@ -0,0 +1,79 @@
+"""
+🧪 Conversation trimming tests
+Budgets, sliding windows and keeping tool calls together with their results
+"""
+
+from llm_client import ConversationTrimmer
+
+
+def unit_cost(message):
+    return 10
+
+
+def turn(role, content, **extra):
+    return dict(role=role, content=content, **extra)
+
+
+def tool_call(call_id):
+    return turn("assistant", None, tool_calls=[{"id": call_id, "type": "function",
+                                                "function": {"name": "lookup", "arguments": "{}"}}])
+
+
+def test_drop_oldest_keeps_system_and_latest():
+    messages = [turn("system", "rules")] + [turn("user" if i % 2 == 0 else "assistant", str(i)) for i in range(6)]
+    trimmer = ConversationTrimmer(max_tokens=53, estimate=unit_cost)
+    trimmed = trimmer.trim(messages)
+    assert [m["content"] for m in trimmed] == ["rules", "2", "3", "4", "5"]
+    assert trimmer.stats()["messages_dropped"] == 2
+
+
+def test_history_does_not_open_with_an_orphaned_reply():
+    messages = [turn("user", "q1"), turn("assistant", "a1"), turn("user", "q2"), turn("assistant", "a2"), turn("user", "q3")]
+    trimmed = ConversationTrimmer(max_tokens=33, estimate=unit_cost).trim(messages)
+    assert [m["content"] for m in trimmed] == ["q2", "a2", "q3"]
+
+    trimmed = ConversationTrimmer(max_tokens=43, estimate=unit_cost).trim(messages)
+    assert [m["content"] for m in trimmed] == ["q2", "a2", "q3"]
+
+
+def test_tool_results_are_dropped_with_their_call():
+    messages = [
+        turn("user", "weather?"),
+        tool_call("call_1"),
+        turn("tool", "sunny", tool_call_id="call_1"),
+        turn("tool", "warm", tool_call_id="call_1"),
+        turn("assistant", "Sunny and warm"),
+        turn("user", "thanks"),
+    ]
+    # Dropping "weather?" alone is enough for the budget, but the reply that
+    # follows would then be orphaned, and its tool results go with it
+    trimmed = ConversationTrimmer(max_tokens=53, estimate=unit_cost).trim(messages)
+    assert [m["role"] for m in trimmed] == ["assistant", "user"]
+    assert not any(m["role"] == "tool" for m in trimmed)
+
+
+def test_no_tool_message_outlives_its_call():
+    messages = [
+        turn("user", "look it up"),
+        tool_call("call_1"),
+        turn("tool", "result", tool_call_id="call_1"),
+        turn("assistant", "done"),
+        turn("user", "next"),
+    ]
+    for budget in range(13, 60):
+        trimmed = ConversationTrimmer(max_tokens=budget, estimate=unit_cost).trim(messages)
+        for index, message in enumerate(trimmed):
+            if message["role"] == "tool":
+                assert trimmed[index - 1].get("tool_calls") or trimmed[index - 1]["role"] == "tool"
+
+
+def test_latest_tool_exchange_is_kept_whole():
+    messages = [turn("user", "look it up"), tool_call("call_1"), turn("tool", "result", tool_call_id="call_1")]
+    trimmed = ConversationTrimmer(max_tokens=1, estimate=unit_cost).trim(messages)
+    assert [m["role"] for m in trimmed] == ["assistant", "tool"]
+
+
+def test_sliding_window():
+    messages = [turn("system", "rules")] + [turn("user" if i % 2 == 0 else "assistant", str(i)) for i in range(10)]
+    trimmed = ConversationTrimmer(policy="sliding_window", window=4, estimate=unit_cost).trim(messages)
+    assert [m["content"] for m in trimmed] == ["rules", "6", "7", "8", "9"]
@@ -0,0 +1,41 @@
+"""
+🧪 Warmup tests
+Parked connections are reused by the first request, and warmup never raises
+"""
+
+from llm_client import LLMClient
+from llm_client.warmup import DNSCache
+
+
+def test_first_request_reuses_a_warmed_connection(make_client, mock_server):
+    client = make_client()
+    results = client.warm_up(connections=2, wait=True)
+    (origin, result), = results.items()
+    assert origin.endswith(str(mock_server.httpd.server_address[1]))
+    assert result["connections"] == 2
+    assert "error" not in result
+
+    response = client.get("/v1/models")
+    assert response.status_code == 200
+    assert response.connect_time == 0.0
+
+
+def test_unreachable_endpoint_is_reported_not_raised():
+    client = LLMClient(base_url="http://127.0.0.1:9/v1")
+    try:
+        result = client.warm_up(connections=1, wait=True)["http://127.0.0.1:9"]
+    finally:
+        client.close()
+    assert result["connections"] == 0
+    assert "error" in result
+
+
+def test_dns_cache_only_serves_warmed_hosts():
+    cache = DNSCache(ttl=60)
+    assert cache.addresses("localhost", 80) is None
+    resolved = cache.resolve("localhost", 80)
+    assert resolved
+    assert cache.addresses("localhost", 80) == resolved
+    cache.invalidate("localhost", 80)
+    assert cache.addresses("localhost", 80) is None
+    assert cache.stats() == {"hosts": 0, "lookups": 1, "hits": 1}
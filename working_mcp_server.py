@@ -7,7 +7,7 @@ This is a simplified MCP server that works with the current MCP version
 import asyncio
 import json
 import sys
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 class SimpleMCPServer:
     """Simple MCP Server implementation"""
@@ -144,6 +144,23 @@ class SimpleMCPServer:
         else:
             return f"❌ Unknown tool: {tool_name}"
     
+    async def handle_line(self, line: str) -> Optional[str]:
+        """Handle one newline-delimited JSON-RPC message, as read from stdin
+        
+        Returns the serialized response, or None for lines that are skipped
+        (blank, malformed JSON or not a JSON object), so every transport
+        behaves like stdio.
+        """
+        try:
+            request = json.loads(line.strip())
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(request, dict):
+            return None
+        
+        response = await self.handle_request(request)
+        return json.dumps(response)
+    
     async def run(self):
         """Run the MCP server"""
         print("🚀 Starting Simple MCP Server...", file=sys.stderr)
@@ -159,15 +176,14 @@ class SimpleMCPServer:
                 if not line:
                     break
                 
-                request = json.loads(line.strip())
-                response = await self.handle_request(request)
+                response_line = await self.handle_line(line)
+                if response_line is None:
+                    continue
                 
                 # Send response to stdout
-                print(json.dumps(response))
+                print(response_line)
                 sys.stdout.flush()
                 
-            except json.JSONDecodeError:
-                continue
             except Exception as e:
                 print(f"Error: {e}", file=sys.stderr)
                 break